@@ -0,0 +1,81 @@
+"""Compare trusted vs. strictly validated layout composition.
+
+Usage::
+
+    uv run python benchmarks/bench_compose.py [--repeat N]
+
+Every registered family/variant is built with the trusted fast path and with
+``GLOVE80_STRICT_BUILD=1`` (full ``LayoutPayload`` round trip). The script
+asserts that both produce identical JSON and prints per-family timings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from glove80 import list_families
+from glove80.layouts.common import STRICT_BUILD_ENV
+from glove80.layouts.family import get_family
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@contextmanager
+def _strict(enabled: bool) -> Iterator[None]:
+    previous = os.environ.pop(STRICT_BUILD_ENV, None)
+    if enabled:
+        os.environ[STRICT_BUILD_ENV] = "1"
+    try:
+        yield
+    finally:
+        os.environ.pop(STRICT_BUILD_ENV, None)
+        if previous is not None:
+            os.environ[STRICT_BUILD_ENV] = previous
+
+
+def _time_family(name: str, *, strict: bool, repeat: int) -> float:
+    family = get_family(name)
+    variants = list(family.variants())
+    with _strict(strict):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for variant in variants:
+                family.build(variant)
+        elapsed = time.perf_counter() - start
+    return elapsed * 1000 / (repeat * len(variants))
+
+
+def _assert_identical(name: str) -> None:
+    family = get_family(name)
+    for variant in family.variants():
+        with _strict(False):
+            trusted = json.dumps(family.build(variant), ensure_ascii=False)
+        with _strict(True):
+            strict = json.dumps(family.build(variant), ensure_ascii=False)
+        if trusted != strict:
+            msg = f"Trusted build differs from validated build for {name}:{variant}"
+            raise SystemExit(msg)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'family':<20} {'strict ms':>10} {'trusted ms':>11} {'saving':>8}")
+    for name in list_families():
+        _assert_identical(name)
+        strict = _time_family(name, strict=True, repeat=args.repeat)
+        trusted = _time_family(name, strict=False, repeat=args.repeat)
+        saving = (strict - trusted) / strict * 100 if strict else 0.0
+        print(f"{name:<20} {strict:>10.2f} {trusted:>11.2f} {saving:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
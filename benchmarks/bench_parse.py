@@ -0,0 +1,72 @@
+"""Compare typed and compact parsing of every checked-in release.
+
+Usage::
+
+    uv run python benchmarks/bench_parse.py [--repeat N]
+
+For each file under ``layouts/*/releases`` the script times
+``parse_typed_sections`` (the whole payload, with layers as ``Binding``
+models), the layers alone through the ``Binding`` validator, and the layers
+through the non-pydantic ``parse_compact_layers`` decoder. It asserts that
+both layer paths describe the same bindings before printing timings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from glove80.layouts.parse import encode_binding, parse_compact_layers, parse_typed_sections
+from glove80.layouts.schema import validate_layer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+RELEASES = sorted((Path(__file__).resolve().parents[1] / "layouts").glob("*/releases/*.json"))
+
+
+def _best_ms(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _assert_same_bindings(data: dict[str, Any]) -> None:
+    typed = [[binding.model_dump() for binding in validate_layer(layer)] for layer in data["layers"]]
+    compact = [[encode_binding(binding) for binding in layer] for layer in parse_compact_layers(data)]
+    if typed != compact:
+        msg = "typed and compact layer parsing disagree"
+        raise SystemExit(msg)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'release':<40} {'sections ms':>11} {'typed ms':>9} {'compact ms':>10} {'speedup':>8}")
+    totals = [0.0, 0.0, 0.0]
+    for path in RELEASES:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        _assert_same_bindings(data)
+        timings = (
+            _best_ms(lambda: parse_typed_sections(data), args.repeat),
+            _best_ms(lambda: [validate_layer(layer) for layer in data["layers"]], args.repeat),
+            _best_ms(lambda: parse_compact_layers(data), args.repeat),
+        )
+        totals = [total + timing for total, timing in zip(totals, timings)]
+        label = f"{path.parent.parent.name}/{path.stem.split('_', 1)[-1]}"[:40]
+        print(
+            f"{label:<40} {timings[0]:>11.2f} {timings[1]:>9.2f} {timings[2]:>10.2f} {timings[1] / timings[2]:>7.1f}x"
+        )
+    print(f"{'total':<40} {totals[0]:>11.2f} {totals[1]:>9.2f} {totals[2]:>10.2f} {totals[1] / totals[2]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,12 @@
 Minimal, obvious surface for common tasks:
  - Discover families via :func:`list_families`.
  - Build a variant via :func:`build_layout`.
- - Apply a feature bundle via :func:`apply_feature`.
+ - Apply a feature bundle via :func:`apply_feature` (several at once, with a
+   conflict report, via :func:`apply_features`).
  - Grab a batteries-included example via :func:`bilateral_home_row_components`.
 """
 
-from .features import apply_feature, bilateral_home_row_components
+from .features import apply_feature, apply_features, bilateral_home_row_components
 from .layouts.family import build_layout, list_families
 
 # Ensure layout families are registered when importing the top-level package.
@@ -21,5 +22,6 @@ __all__ = [
     "build_layout",
     "list_families",
     "apply_feature",
+    "apply_features",
     "bilateral_home_row_components",
 ]
@@ -0,0 +1,21 @@
+"""Location of glove80's on-disk caches."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Final
+
+CACHE_DIR_ENV: Final = "GLOVE80_CACHE_DIR"
+
+
+def default_cache_dir() -> Path:
+    """Return ``$GLOVE80_CACHE_DIR``, else ``$XDG_CACHE_HOME/glove80`` (``~/.cache/glove80``)."""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    return (Path(xdg) if xdg else Path.home() / ".cache") / "glove80"
+
+
+__all__ = ["CACHE_DIR_ENV", "default_cache_dir"]
@@ -1,19 +1,38 @@
 from __future__ import annotations
 
+import sqlite3
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
 import textwrap
 from string import Template
 
 import typer
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 from rich.table import Table
 
-from glove80.layouts.family import REGISTRY
+from glove80.keycodes.search import complete_key_names, search_keys
+from glove80.layouts.combo_check import check_combos
+from glove80.layouts.dedup import find_duplicate_layers
+from glove80.layouts.diff import binding_text, diff_layouts
+from glove80.layouts.family import REGISTRY, list_families
 from glove80.layouts.generator import GenerationResult, available_layouts, generate_layouts
+from glove80.layouts.layer_graph import layer_graph
 from glove80.layouts.parse import parse_typed_sections
+from glove80.layouts.references import check_references
+from glove80.layouts.validation import SECTION_FIELDS, iter_layout_files, validate_files
+from glove80.layouts.validation_cache import ValidationCache
+from glove80.layouts.variant_matrix import family_matrix
 
 app = typer.Typer(help="Utilities for working with Glove80 layouts.")
+keys_app = typer.Typer(help="Look up key names from the layout editor's keycode bundle.")
+app.add_typer(keys_app, name="keys")
+layers_app = typer.Typer(help="Inspect the layers of built or exported layouts.")
+app.add_typer(layers_app, name="layers")
+combos_app = typer.Typer(help="Check the combos of built or exported layouts.")
+app.add_typer(combos_app, name="combos")
 console = Console()
 
 
@@ -198,33 +217,411 @@ def scaffold(
 __all__ = ["app"]
 
 
+def _print_section_counts(name: str, counts: dict[str, int]) -> None:
+    table = Table(title=f"Typed Parse: {name}", show_header=True, header_style="bold green")
+    table.add_column("Field", style="cyan", no_wrap=True)
+    table.add_column("Count", justify="right")
+    for field, count in counts.items():
+        table.add_row(field, str(count))
+    console.print(table)
+
+
+def _load_layout(path: Path) -> dict[str, object]:
+    """Read a layout JSON file, rejecting anything that is not a JSON object."""
+    import json
+
+    try:
+        data = json.loads(path.read_bytes())
+    except json.JSONDecodeError as exc:
+        msg = f"{path}: invalid JSON: {exc}"
+        raise typer.BadParameter(msg) from None
+    if not isinstance(data, dict):
+        msg = f"{path}: expected a JSON object at the top level, got {type(data).__name__}"
+        raise typer.BadParameter(msg)
+    return data
+
+
 @app.command("typed-parse")
 def typed_parse(
     path: Path = typer.Argument(..., exists=True, file_okay=True, dir_okay=False, help="Path to a layout JSON file."),
 ) -> None:
     """Parse a layout JSON into typed Pydantic models and report a summary."""
-    import json
-
-    data = json.loads(path.read_text(encoding="utf-8"))
+    data = _load_layout(path)
     payload, macros, hold_taps, combos, listeners = parse_typed_sections(data)
-
-    table = Table(title=f"Typed Parse: {path.name}", show_header=True, header_style="bold green")
-    table.add_column("Field", style="cyan", no_wrap=True)
-    table.add_column("Count", justify="right")
-    table.add_row("layer_names", str(len(payload.layer_names)))
-    table.add_row("macros", str(len(macros)))
-    table.add_row("holdTaps", str(len(hold_taps)))
-    table.add_row("combos", str(len(combos)))
-    table.add_row("inputListeners", str(len(listeners)))
-    console.print(table)
+    counts = (len(payload.layer_names), len(macros), len(hold_taps), len(combos), len(listeners))
+    _print_section_counts(path.name, dict(zip(SECTION_FIELDS, counts)))
 
     console.print("[green]Validation OK[/] — sections parsed into typed models.")
 
 
-# Friendly alias for typed-parse
+@contextmanager
+def _open_validation_cache() -> Iterator[ValidationCache | None]:
+    """Yield the result cache, or ``None`` (with a warning) when it cannot be opened."""
+    try:
+        cache = ValidationCache()
+    except (OSError, RuntimeError, sqlite3.Error) as exc:
+        typer.echo(f"Warning: validation cache disabled ({exc})", err=True)
+        yield None
+        return
+    with cache:
+        yield cache
+
+
 @app.command("validate")
 def validate(
-    path: Path = typer.Argument(..., exists=True, file_okay=True, dir_okay=False, help="Path to a layout JSON file."),
+    paths: list[str] = typer.Argument(..., help="Layout JSON files, directories (searched recursively), or globs."),
+    jobs: int = typer.Option(1, "--jobs", "-j", min=0, help="Worker processes to use (0 = one per CPU)."),
+    json_output: bool = typer.Option(False, "--json", help="Emit one JSON object per file (JSON Lines)."),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Validate section elements incrementally with bounded memory (for very large files).",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Ignore the on-disk result cache ($GLOVE80_CACHE_DIR, default ~/.cache/glove80).",
+    ),
+) -> None:
+    """Validate one or many layout JSON files; exits non-zero if any file fails."""
+    import json
+
+    files = iter_layout_files(paths)
+    if not files:
+        msg = f"No layout JSON files matched: {', '.join(paths)}"
+        raise typer.BadParameter(msg)
+
+    single = len(files) == 1 and not json_output
+    failed = 0
+    with ExitStack() as stack:
+        cache = None if no_cache else stack.enter_context(_open_validation_cache())
+        for result in validate_files(files, jobs=jobs, stream=stream, cache=cache):
+            if not result.ok:
+                failed += 1
+            if json_output:
+                typer.echo(json.dumps(result.to_dict()))
+            elif single and result.ok:
+                _print_section_counts(result.path.name, result.counts)
+                console.print("[green]Validation OK[/] — sections parsed into typed models.")
+            elif result.ok:
+                console.print(f"[green]✅[/] {result.path}")
+            else:
+                console.print(f"[red]❌[/] {result.path}")
+                for error in result.errors:
+                    console.print(f"   {error}", markup=False)
+                if result.error_count > len(result.errors):
+                    console.print(f"   ... {result.error_count - len(result.errors)} more error(s) not shown")
+
+    if not json_output and not single:
+        style = "red" if failed else "green"
+        console.print(f"[{style}]Validated {len(files)} file(s): {len(files) - failed} passed, {failed} failed[/]")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command("check-refs")
+def check_refs(
+    paths: list[str] = typer.Argument(..., help="Layout JSON files, directories (searched recursively), or globs."),
+    json_output: bool = typer.Option(False, "--json", help="Emit one JSON object per file (JSON Lines)."),
+    strict: bool = typer.Option(False, "--strict", help="Also fail when macros or hold-taps are defined but unused."),
+) -> None:
+    """Check that every referenced macro, hold-tap, layer, and key position exists."""
+    import json
+
+    files = iter_layout_files(paths)
+    if not files:
+        msg = f"No layout JSON files matched: {', '.join(paths)}"
+        raise typer.BadParameter(msg)
+
+    failed = 0
+    for path in files:
+        report = check_references(_load_layout(path))
+        ok = report.ok and not (strict and report.unused)
+        if not ok:
+            failed += 1
+        if json_output:
+            typer.echo(json.dumps({"path": str(path), **report.to_dict(), "ok": ok}))
+            continue
+        console.print(f"[green]✅[/] {path}" if report.ok else f"[red]❌[/] {path}")
+        for error in report.errors:
+            console.print(f"   {error}", markup=False)
+        if report.unused:
+            console.print(f"   [yellow]unused:[/] {', '.join(report.unused)}")
+
+    if failed:
+        raise typer.Exit(code=1)
+
+
+def _field_text(value: object) -> str:
+    text = value if isinstance(value, str) else repr(value)
+    if "\n" in text or len(text) > 60:
+        return f"<{len(text)} chars>"
+    return text
+
+
+@app.command("diff")
+def diff(
+    old: Path = typer.Argument(..., exists=True, dir_okay=False, help="Original layout JSON file."),
+    new: Path = typer.Argument(..., exists=True, dir_okay=False, help="Changed layout JSON file."),
+    json_output: bool = typer.Option(False, "--json", help="Emit the diff as JSON."),
+) -> None:
+    """Compare two layouts by layer, behavior and key rather than by text; exits 1 when they differ."""
+    import json
+
+    result = diff_layouts(_load_layout(old), _load_layout(new))
+    if json_output:
+        typer.echo(json.dumps(result.to_dict()))
+    elif not result.changed:
+        console.print("[green]No semantic differences.[/]")
+    else:
+        for change in result.fields:
+            console.print(
+                f"[yellow]~ {change.field}:[/] {escape(_field_text(change.old))} → {escape(_field_text(change.new))}",
+                highlight=False,
+            )
+        marks = {"added": "[green]+", "removed": "[red]-", "changed": "[yellow]~", "renamed": "[cyan]→"}
+        for section in result.sections:
+            label = f"{section.old} → {section.name}" if section.change == "renamed" else section.name
+            console.print(f"{marks[section.change]} {section.section}:[/] {label}", highlight=False)
+        layer = None
+        for key in result.keys:
+            if key.layer != layer:
+                layer = key.layer
+                console.print(f"[bold]Layer {layer}[/]")
+            key_name = key.to_dict()["key"] or "?"
+            console.print(
+                f"  {key.position:>2} {key_name:<8} {binding_text(key.old)} → {binding_text(key.new)}",
+                markup=False,
+                highlight=False,
+            )
+    if result.changed:
+        raise typer.Exit(code=1)
+
+
+@keys_app.command("search")
+def keys_search(
+    query: str = typer.Argument(..., help="Key name, alias, shortcut, symbol, or description words."),
+    os_name: str | None = typer.Option(
+        None,
+        "--os",
+        help="Hide keys marked unavailable on this OS (windows, macos, linux, android, ios).",
+    ),
+    limit: int = typer.Option(20, "--limit", "-n", min=1, help="Maximum number of results."),
+    prefix: bool = typer.Option(False, "--prefix", help="Only complete names that start with the query."),
+    json_output: bool = typer.Option(False, "--json", help="Emit the matches as a JSON array."),
+) -> None:
+    """Search keys by prefix or fuzzy match; exits non-zero when nothing matches."""
+    import json
+    from dataclasses import asdict
+
+    try:
+        if prefix:
+            matches = complete_key_names(query, os=os_name, limit=limit)
+        else:
+            matches = search_keys(query, os=os_name, limit=limit)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--os") from None
+    if json_output:
+        typer.echo(json.dumps([asdict(match) for match in matches], ensure_ascii=False))
+    elif matches:
+        table = Table(title=f"🔎 Keys matching {query!r}", show_header=True, header_style="bold cyan")
+        table.add_column("Key", style="yellow", no_wrap=True)
+        table.add_column("Aliases", style="green")
+        table.add_column("Matched", style="magenta")
+        table.add_column("Description")
+        for match in matches:
+            table.add_row(match.name, ", ".join(match.aliases), f"{match.matched} ({match.field})", match.description)
+        console.print(table)
+    else:
+        console.print(f"[yellow]No keys match {query!r}.[/]")
+    if not matches:
+        raise typer.Exit(code=1)
+
+
+@layers_app.command("dedup")
+def layers_dedup(
+    paths: list[str] = typer.Argument(
+        None, help="Layout JSON files, directories, or globs (default: build every registered variant)."
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Emit the report as JSON."),
 ) -> None:
-    """Alias for ``typed-parse`` with a more descriptive name."""
-    typed_parse(path)
+    """Report layers with identical bindings, within and across layouts."""
+    import json
+
+    if paths:
+        files = iter_layout_files(paths)
+        if not files:
+            msg = f"No layout JSON files matched: {', '.join(paths)}"
+            raise typer.BadParameter(msg)
+        layouts = {str(path): _load_layout(path) for path in files}
+    else:
+        layouts = {
+            f"{entry.name}/{variant}": entry.family.build(variant)
+            for entry in REGISTRY.families()
+            for variant in entry.family.variants()
+        }
+
+    report = find_duplicate_layers(layouts)
+    if json_output:
+        typer.echo(json.dumps(report.to_dict()))
+        return
+    console.print(
+        f"{report.total} layers in {len(layouts)} layouts, {report.unique} unique; "
+        f"{len(report.duplicates)} duplicated ({len(report.across_layouts)} across layouts, "
+        f"{len(report.within_layout)} within one)"
+    )
+    for group in report.duplicates:
+        places = ", ".join(f"{occurrence.layout}:{occurrence.name}" for occurrence in group.occurrences)
+        console.print(f"  [cyan]{group.digest[:12]}[/] {places}", highlight=False)
+
+
+@layers_app.command("matrix")
+def layers_matrix(
+    family: str = typer.Argument(..., help="Registered layout family (see `glove80 families`)."),
+    variants: list[str] = typer.Option(None, "--variant", "-v", help="Compare only these variants (repeatable)."),
+    layer: str | None = typer.Option(
+        None, "--layer", "-l", help="Print the full variant × variant matrix of one layer."
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Emit the matrices as JSON."),
+) -> None:
+    """Show which keys of each layer differ between the variants of a family."""
+    import json
+
+    if family not in list_families():
+        msg = f"Unknown family {family!r}; expected one of {', '.join(list_families())}"
+        raise typer.BadParameter(msg)
+    try:
+        matrix = family_matrix(family, variants or None)
+        selected = matrix.layer(layer) if layer else None
+    except (KeyError, ValueError) as exc:
+        raise typer.BadParameter(str(exc.args[0])) from None
+    if json_output:
+        typer.echo(json.dumps(selected.to_dict() if selected else matrix.to_dict()))
+        return
+
+    if selected is not None:
+        table = Table(title=f"🧮 {family} — {selected.layer}: differing keys", header_style="bold cyan")
+        table.add_column("Variant", style="yellow", no_wrap=True)
+        for index in range(len(selected.variants)):
+            table.add_column(str(index), justify="right")
+        for index, (variant, row) in enumerate(zip(selected.variants, selected.counts())):
+            table.add_row(f"{index} {variant}", *(str(count) if count else "[dim]·[/]" for count in row))
+        console.print(table)
+        console.print(f"Differing positions: {', '.join(map(str, selected.varying)) or 'none'}", highlight=False)
+        return
+
+    table = Table(title=f"🧮 {family}: {len(matrix.variants)} variants", header_style="bold cyan")
+    table.add_column("Layer", style="yellow", no_wrap=True)
+    table.add_column("Variants", justify="right")
+    table.add_column("Distinct", justify="right")
+    table.add_column("Keys", justify="right")
+    table.add_column("Identical groups")
+    for entry in matrix.layers:
+        groups = " | ".join(",".join(group) for group in entry.groups) if len(entry.groups) > 1 else "[dim]all[/]"
+        table.add_row(entry.layer, str(len(entry.variants)), str(len(entry.groups)), str(len(entry.varying)), groups)
+    console.print(table)
+
+
+_GRAPH_FORMATS = ("text", "json", "dot")
+
+
+@layers_app.command("graph")
+def layers_graph(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False, help="Layout JSON file."),
+    output_format: str = typer.Option("text", "--format", "-f", help="Output format: text, json, or dot."),
+) -> None:
+    """Show which layers can be reached from layer 0, and the fewest key presses to each."""
+    import json
+
+    if output_format not in _GRAPH_FORMATS:
+        msg = f"Unknown format {output_format!r}; expected one of {', '.join(_GRAPH_FORMATS)}"
+        raise typer.BadParameter(msg)
+    graph = layer_graph(_load_layout(path))
+    if output_format == "json":
+        typer.echo(json.dumps(graph.to_dict()))
+        return
+    if output_format == "dot":
+        typer.echo(graph.to_dot(title=path.stem), nl=False)
+        return
+
+    paths = graph.paths()
+    combo_only = set(graph.combo_only())
+    table = Table(title=f"🧭 Layer reachability — {path.name}", show_header=True, header_style="bold cyan")
+    table.add_column("#", justify="right")
+    table.add_column("Layer", style="yellow", no_wrap=True)
+    table.add_column("Presses", justify="right")
+    table.add_column("Shortest path")
+    for index, name in enumerate(graph.layer_names):
+        if name not in paths:
+            status = "[dim]opaque[/]" if name in graph.custom_mentions else "[red]unreachable[/]"
+            table.add_row(str(index), name, "—", status)
+            continue
+        steps = " → ".join(
+            f"{(switch.via or (switch.behavior,))[0]}@{'+'.join(map(str, switch.key_positions))} {switch.target}"
+            for switch in paths[name]
+        )
+        if name in combo_only:
+            steps += " [magenta](combo only)[/]"
+        table.add_row(str(index), name, str(len(paths[name])), steps or "[dim]base layer[/]")
+    console.print(table)
+    dead, opaque = graph.dead(), graph.opaque()
+    if dead:
+        console.print(f"[red]Unreachable:[/] {', '.join(dead)}")
+    if opaque:
+        console.print(f"[yellow]Only named in custom devicetree text:[/] {', '.join(opaque)}")
+
+
+@combos_app.command("check")
+def combos_check(
+    paths: list[str] = typer.Argument(
+        None, help="Layout JSON files, directories, or globs (default: build every registered variant)."
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Emit one JSON object per layout (JSON Lines)."),
+    strict: bool = typer.Option(False, "--strict", help="Fail on any finding, not only duplicate combos."),
+) -> None:
+    """Find duplicate, subset and overlapping combos, and combos on hold-tap or transparent keys."""
+    import json
+
+    if paths:
+        files = iter_layout_files(paths)
+        if not files:
+            msg = f"No layout JSON files matched: {', '.join(paths)}"
+            raise typer.BadParameter(msg)
+        layouts = {str(path): _load_layout(path) for path in files}
+    else:
+        layouts = {
+            f"{entry.name}/{variant}": entry.family.build(variant)
+            for entry in REGISTRY.families()
+            for variant in entry.family.variants()
+        }
+
+    failed = 0
+    for label, payload in layouts.items():
+        report = check_combos(payload)
+        ok = report.ok and not (strict and report.findings)
+        if not ok:
+            failed += 1
+        if json_output:
+            typer.echo(json.dumps({"path": label, **report.to_dict(), "ok": ok}))
+            continue
+        icon = "[green]✅[/]" if ok else "[red]❌[/]"
+        console.print(f"{icon} {label}: {report.count} combos, {report.findings} findings", highlight=False)
+        for conflict in report.conflicts:
+            style = "red" if conflict.kind == "duplicate" else "yellow"
+            console.print(
+                f"   [{style}]{conflict.kind}:[/] {conflict.names[0]} / {conflict.names[1]} "
+                f"share keys {list(conflict.positions)} on layers {list(conflict.layers)}",
+                highlight=False,
+            )
+        for overlap in report.hold_taps:
+            note = " [red](timeout ≥ tapping term)[/]" if overlap.swallows_tapping_term else ""
+            console.print(
+                f"   [cyan]hold-tap:[/] {overlap.name} uses {overlap.behavior} keys {list(overlap.positions)}, "
+                f"timeout {overlap.timeout_ms}ms vs tapping term {overlap.tapping_term_ms}ms{note}",
+                highlight=False,
+            )
+        for _, name in report.transparent:
+            console.print(f"   [dim]transparent:[/] {name} keys are &trans on every active layer", highlight=False)
+
+    if failed:
+        raise typer.Exit(code=1)
@@ -38,7 +38,7 @@ class Family(LayoutFamily):
         )
         builder.add_layers(layers)
         builder.add_input_listeners(list(spec.input_listeners))
-        return builder.build()
+        return builder.build(trusted=True)
 
 
 REGISTRY.register(Family())
@@ -5,6 +5,6 @@ Implementation lives in ``.registry``.
 
 from glove80.base import LayerMap, LayerSpec, build_layer_from_spec
 
-from .registry import LAYER_SPECS, build_all_layers
+from .registry import LAYER_PROVIDERS, LAYER_SPECS, build_all_layers
 
-__all__ = ["LAYER_SPECS", "build_all_layers", "LayerMap", "LayerSpec", "build_layer_from_spec"]
+__all__ = ["LAYER_PROVIDERS", "LAYER_SPECS", "build_all_layers", "LayerMap", "LayerSpec", "build_layer_from_spec"]
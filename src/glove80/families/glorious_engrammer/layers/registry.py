@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from glove80.base import LayerMap, LayerSpec, build_layer_from_spec
+from glove80.layers.providers import LayerProvider, build_layers
 
 from .alpha_layers import ALPHA_LAYER_SPECS
 from .finger_layers import FINGER_LAYER_SPECS
 from .mouse_layers import MOUSE_LAYER_SPECS
 from .utility_layers import UTILITY_LAYER_SPECS
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
 LAYER_SPEC_GROUPS = (
     ALPHA_LAYER_SPECS,
     FINGER_LAYER_SPECS,
@@ -31,8 +37,16 @@ def _merge_specs() -> dict[str, LayerSpec]:
 LAYER_SPECS = _merge_specs()
 
 
-def build_all_layers(variant: str) -> LayerMap:  # noqa: ARG001
-    return {name: build_layer_from_spec(spec) for name, spec in LAYER_SPECS.items()}
+def _spec_provider(name: str, spec: LayerSpec) -> LayerProvider:
+    return LayerProvider.single(name, lambda _variant: build_layer_from_spec(spec))
+
+
+LAYER_PROVIDERS = tuple(_spec_provider(name, spec) for name, spec in LAYER_SPECS.items())
+
+
+def build_all_layers(variant: str, names: Sequence[str] | None = None) -> LayerMap:
+    """Build the layers called *names* (default: every spec), in that order."""
+    return build_layers(LAYER_PROVIDERS, variant, LAYER_SPECS if names is None else names)
 
 
-__all__ = ["LAYER_SPECS", "build_all_layers", "LayerMap", "LayerSpec", "build_layer_from_spec"]
+__all__ = ["LAYER_PROVIDERS", "LAYER_SPECS", "build_all_layers", "LayerMap", "LayerSpec", "build_layer_from_spec"]
@@ -74,15 +74,15 @@ class Family(LayoutFamily):
                 msg,
             ) from exc
 
-        generated_layers = build_all_layers(variant)
+        generated_layers = build_all_layers(variant, spec.layer_names)
         builder = LayoutBuilder(
             metadata_key=self.metadata_key(),
             variant=variant,
             common_fields=spec.common_fields,
             layer_names=spec.layer_names,
         )
-        builder.add_layers({name: generated_layers[name] for name in spec.layer_names})
-        layout = builder.build()
+        builder.add_layers(generated_layers)
+        layout = builder.build(trusted=True)
         return _order_layout_fields(layout)
 
 
@@ -5,6 +5,6 @@ Implementation lives in ``.registry``.
 
 from glove80.base import Layer, LayerMap
 
-from .registry import LAYER_BUILDERS, build_all_layers
+from .registry import LAYER_BUILDERS, LAYER_PROVIDERS, build_all_layers
 
-__all__ = ["Layer", "LayerMap", "build_all_layers", "LAYER_BUILDERS"]
+__all__ = ["Layer", "LayerMap", "build_all_layers", "LAYER_BUILDERS", "LAYER_PROVIDERS"]
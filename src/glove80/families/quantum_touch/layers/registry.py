@@ -1,8 +1,10 @@
 """QuantumTouch layer registry (moved from package __init__)."""
 
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 
 from glove80.base import Layer, LayerMap
+from glove80.families.quantum_touch.specs import LAYER_NAMES
+from glove80.layers.providers import LayerProvider, build_layers
 
 from .base_layer import build_base_layer
 from .finger_layers import FINGER_LAYER_BUILDERS
@@ -27,9 +29,12 @@ LAYER_BUILDERS.update(MOUSE_LAYER_BUILDERS)
 LAYER_BUILDERS.update(FINGER_LAYER_BUILDERS)
 
 
-def build_all_layers(variant: str) -> LayerMap:
-    """Return every quantum layer currently codified."""
-    return {name: builder(variant) for name, builder in LAYER_BUILDERS.items()}
+LAYER_PROVIDERS = tuple(LayerProvider.single(name, builder) for name, builder in LAYER_BUILDERS.items())
 
 
-__all__ = ["Layer", "LayerMap", "build_all_layers", "LAYER_BUILDERS"]
+def build_all_layers(variant: str, names: Sequence[str] | None = None) -> LayerMap:
+    """Return the quantum layers called *names* (default: ``LAYER_NAMES``), in that order."""
+    return build_layers(LAYER_PROVIDERS, variant, LAYER_NAMES if names is None else names)
+
+
+__all__ = ["Layer", "LayerMap", "build_all_layers", "LAYER_BUILDERS", "LAYER_PROVIDERS"]
@@ -37,7 +37,7 @@ class Family(LayoutFamily):
         listeners = list(INPUT_LISTENER_DATA["default"])  # already models
         macros = [MACRO_DEFS[name] for name in MACRO_ORDER]
         hold_taps = [HOLD_TAP_DEFS[name] for name in HOLD_TAP_ORDER]
-        generated_layers = build_all_layers(variant)
+        generated_layers = build_all_layers(variant, LAYER_NAMES)
 
         builder = LayoutBuilder(
             metadata_key=self.metadata_key(),
@@ -50,7 +50,7 @@ class Family(LayoutFamily):
         builder.add_hold_taps(hold_taps)
         builder.add_combos(combos)
         builder.add_input_listeners(listeners)
-        return builder.build()
+        return builder.build(trusted=True)
 
 
 REGISTRY.register(Family())
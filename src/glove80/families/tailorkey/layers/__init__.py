@@ -13,7 +13,7 @@ from .hrm import build_hrm_layers
 from .lower import build_lower_layer
 from .magic import build_magic_layer
 from .mouse import build_mouse_layers
-from .registry import LAYER_PROVIDERS, build_all_layers
+from .registry import LAYER_PROVIDERS, PROVIDER_CACHE, build_all_layers
 from .symbol import build_symbol_layer
 from .typing import build_typing_layer
 
@@ -33,4 +33,5 @@ __all__ = [
     "build_symbol_layer",
     "build_typing_layer",
     "LAYER_PROVIDERS",
+    "PROVIDER_CACHE",
 ]
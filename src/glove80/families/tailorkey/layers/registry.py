@@ -3,10 +3,12 @@
 Moved out of ``__init__`` to keep package init lightweight.
 """
 
-from collections.abc import Callable, Iterable
+from collections.abc import Iterable, Sequence
 
 from glove80.base import Layer, LayerMap
-from glove80.families.tailorkey.alpha_layouts import base_variant_for, variant_alias
+from glove80.families.tailorkey.alpha_layouts import base_variant_for, layout_for_variant, variant_alias
+from glove80.families.tailorkey.specs import LAYER_NAME_MAP
+from glove80.layers.providers import LayerProvider, ProviderCache, build_layers
 
 from .autoshift import build_autoshift_layer
 from .bilateral import assemble_bilateral_layers, build_bilateral_finger_layers
@@ -19,44 +21,60 @@ from .mouse import build_mouse_layers
 from .symbol import build_symbol_layer
 from .typing import build_typing_layer
 
-LayerProvider = Callable[[str], LayerMap]
+_BASE = ("base_variant",)
+_ALPHA = ("alpha_layout",)
 
 
-def _single_layer(name: str, builder: Callable[[str], Layer]) -> LayerProvider:
-    def provider(variant: str) -> LayerMap:
-        return {name: builder(variant)}
-
-    return provider
-
-
-def _cursor_provider(variant: str) -> LayerMap:
-    layers = {"Cursor": build_cursor_layer(variant)}
-    if base_variant_for(variant) == "dual":
-        mac_variant = variant_alias(variant, "mac")
-        layers["Cursor_macOS"] = build_cursor_layer(mac_variant)
-    return layers
+def _mac_cursor_provider(variant: str) -> LayerMap:
+    if base_variant_for(variant) != "dual":
+        return {}
+    return {"Cursor_macOS": build_cursor_layer(variant_alias(variant, "mac"))}
 
 
 LAYER_PROVIDERS: Iterable[LayerProvider] = [
-    build_hrm_layers,
-    _single_layer("Typing", build_typing_layer),
-    _single_layer("Autoshift", build_autoshift_layer),
-    _cursor_provider,
-    _single_layer("Symbol", build_symbol_layer),
-    _single_layer("Gaming", build_gaming_layer),
-    _single_layer("Lower", build_lower_layer),
-    build_mouse_layers,
-    _single_layer("Magic", build_magic_layer),
-    build_bilateral_finger_layers,
+    LayerProvider(frozenset({"HRM_WinLinx", "HRM_macOS"}), build_hrm_layers, ("base_variant", "alpha_layout")),
+    LayerProvider.single("Typing", build_typing_layer, _ALPHA),
+    LayerProvider.single("Autoshift", build_autoshift_layer, _ALPHA),
+    LayerProvider.single("Cursor", build_cursor_layer, _BASE),
+    LayerProvider(frozenset({"Cursor_macOS"}), _mac_cursor_provider, _BASE),
+    LayerProvider.single("Symbol", build_symbol_layer, _BASE),
+    LayerProvider.single("Gaming", build_gaming_layer, ()),
+    LayerProvider.single("Lower", build_lower_layer, _BASE),
+    LayerProvider(frozenset({"Mouse", "MouseSlow", "MouseFast", "MouseWarp"}), build_mouse_layers, _BASE),
+    LayerProvider.single("Magic", build_magic_layer, _BASE),
+    LayerProvider(
+        frozenset(
+            {
+                "LeftIndex",
+                "LeftMiddy",
+                "LeftRingy",
+                "LeftPinky",
+                "RightIndex",
+                "RightMiddy",
+                "RightRingy",
+                "RightPinky",
+            }
+        ),
+        build_bilateral_finger_layers,
+        ("base_variant", "alpha_layout"),
+    ),
 ]
 
+# Shared by every build so that variants with the same base variant or alpha
+# layout reuse each other's layers.
+PROVIDER_CACHE = ProviderCache({"base_variant": base_variant_for, "alpha_layout": layout_for_variant})
+
+
+def build_all_layers(variant: str, names: Sequence[str] | None = None) -> LayerMap:
+    """Return the layers called *names* (default: every layer the variant lists), in that order.
 
-def build_all_layers(variant: str) -> LayerMap:
-    """Return every layer needed for the given variant."""
-    layers: LayerMap = {}
-    for provider in LAYER_PROVIDERS:
-        layers.update(provider(variant))
-    return layers
+    Only the providers that declare one of those names run, and each runs
+    once per distinct value of the attributes it depends on (see
+    ``PROVIDER_CACHE``).
+    """
+    if names is None:
+        names = LAYER_NAME_MAP[variant]
+    return build_layers(LAYER_PROVIDERS, variant, names, cache=PROVIDER_CACHE)
 
 
 __all__ = [
@@ -75,4 +93,6 @@ __all__ = [
     "build_symbol_layer",
     "build_typing_layer",
     "LAYER_PROVIDERS",
+    "PROVIDER_CACHE",
+    "LayerProvider",
 ]
@@ -74,8 +74,8 @@ class Family(LayoutFamily):
     def build(self, variant: str) -> dict:
         combos = _get_variant_section(COMBO_DATA, variant, "combo definitions")
         listeners = _get_variant_section(INPUT_LISTENER_DATA, variant, "input listeners")
-        generated_layers = build_all_layers(variant)
         layer_names = _layer_names(variant)
+        generated_layers = build_all_layers(variant, layer_names)
 
         hrm_names = [name for name in layer_names if name.startswith("HRM_")]
         cursor_names = [name for name in layer_names if name.startswith("Cursor")]
@@ -90,7 +90,7 @@ class Family(LayoutFamily):
             cursor_layers_provider=_subset_layer_provider(cursor_names, generated_layers),
             home_row_provider=_home_row_provider(hrm_names, generated_layers),
         )
-        builder.add_layers({name: generated_layers[name] for name in layer_names})
+        builder.add_layers(generated_layers)
         builder.add_macros(_build_macros(variant))
         builder.add_hold_taps(_build_hold_taps(variant))
         builder.add_combos(combos)
@@ -118,7 +118,7 @@ class Family(LayoutFamily):
             if before:
                 builder.add_mouse_layers(insert_after=before)
 
-        return builder.build()
+        return builder.build(trusted=True)
 
 
 def _subset_layer_provider(names: Sequence[str], layers: Mapping[str, Any]):
@@ -3,7 +3,7 @@
 Public API: only high-level helpers; types live under ``glove80.layouts.components``.
 """
 
-from .base import apply_feature
+from .base import apply_feature, apply_features
 from .bilateral import bilateral_home_row_components
 
-__all__ = ["apply_feature", "bilateral_home_row_components"]
+__all__ = ["apply_feature", "apply_features", "bilateral_home_row_components"]
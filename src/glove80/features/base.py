@@ -2,18 +2,217 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
 
+from glove80.layouts.bindings import selected_layers
+from glove80.layouts.combo_check import iter_bits, position_mask
 from glove80.layouts.components import LayoutFeatureComponents
-from glove80.layouts.merge import merge_components
+from glove80.layouts.merge import LayoutMerger, merge_components
 
 if TYPE_CHECKING:
-    pass
+    from collections.abc import Hashable, Iterator, Sequence
+
+ConflictKind = Literal["macro", "layer", "hold_tap", "combo"]
 
 
 def apply_feature(layout: dict, components: LayoutFeatureComponents) -> None:
-    """Mutate *layout* in-place by appending the provided components."""
+    """Mutate *layout* in-place by appending the provided components.
+
+    Every call indexes the whole layout; use :func:`apply_features` to apply
+    several bundles with one index.
+    """
     merge_components(layout, components)
 
 
-__all__ = ["LayoutFeatureComponents", "apply_feature"]
+@dataclass(frozen=True)
+class FeatureConflict:
+    """One entry of a feature bundle that collides with an earlier one.
+
+    ``feature`` is the index of the bundle that brought the later entry;
+    ``previous`` is the bundle of the earlier one, or ``None`` when it was
+    already part of the layout.
+    """
+
+    kind: ConflictKind
+    name: str
+    feature: int
+    previous: int | None
+    # Combos only: the colliding earlier combo and the key positions they share.
+    other: str | None = None
+    key_positions: tuple[int, ...] = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "kind": self.kind,
+            "name": self.name,
+            "feature": self.feature,
+            "previous": self.previous,
+        }
+        if self.kind == "combo":
+            data["other"] = self.other
+            data["keyPositions"] = list(self.key_positions)
+        return data
+
+
+@dataclass(frozen=True)
+class FeatureConflictReport:
+    """Outcome of :func:`apply_features`."""
+
+    # Macros and layers replaced by a later bundle (the later one wins).
+    overridden_macros: tuple[FeatureConflict, ...] = ()
+    overridden_layers: tuple[FeatureConflict, ...] = ()
+    # Hold-taps whose name is already taken; both end up in ``holdTaps``.
+    duplicate_hold_taps: tuple[FeatureConflict, ...] = ()
+    # Combos sharing key positions with an earlier combo on a common layer.
+    overlapping_combos: tuple[FeatureConflict, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        return not (
+            self.overridden_macros or self.overridden_layers or self.duplicate_hold_taps or self.overlapping_combos
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "overridden_macros": [conflict.to_dict() for conflict in self.overridden_macros],
+            "overridden_layers": [conflict.to_dict() for conflict in self.overridden_layers],
+            "duplicate_hold_taps": [conflict.to_dict() for conflict in self.duplicate_hold_taps],
+            "overlapping_combos": [conflict.to_dict() for conflict in self.overlapping_combos],
+        }
+
+
+def _field(item: Any, key: str) -> Any:
+    return item.get(key) if isinstance(item, dict) else getattr(item, key, None)
+
+
+def _macro_names(components: LayoutFeatureComponents) -> Iterator[Any]:
+    # Same order as glove80.layouts.merge.component_macros, without dumping.
+    for macro in (*components.macros, *components.macro_overrides.values()):
+        yield _field(macro, "name")
+    yield from components.macros_by_name or ()
+
+
+class _ConflictTracker:
+    """Name and key-position indexes over the layout plus every bundle merged so far."""
+
+    def __init__(self, layout: dict[str, Any]) -> None:
+        self.macros: dict[str, int | None] = {}
+        for macro in layout.get("macros") or ():
+            name = _field(macro, "name")
+            if isinstance(name, str):
+                self.macros.setdefault(name, None)
+        self.hold_taps: dict[str, int | None] = {}
+        for hold_tap in layout.get("holdTaps") or ():
+            name = _field(hold_tap, "name")
+            if isinstance(name, str):
+                self.hold_taps.setdefault(name, None)
+        self.layers: dict[str, tuple[int, int | None]] = {}
+        for position, name in enumerate(layout.get("layer_names") or ()):
+            self.layers.setdefault(name, (position, None))
+        # Combos seen so far, by index: (name, source, key positions mask, layer keys).
+        self.combos: list[tuple[str, int | None, int, frozenset[Hashable] | None]] = []
+        # key position -> bitset of the indexes of the combos using it
+        self.combos_at: dict[int, int] = {}
+        for combo in layout.get("combos") or ():
+            self._add_combo(combo, None)
+
+        self.overridden_macros: list[FeatureConflict] = []
+        self.overridden_layers: list[FeatureConflict] = []
+        self.duplicate_hold_taps: list[FeatureConflict] = []
+        self.overlapping_combos: list[FeatureConflict] = []
+
+    def track(self, feature: int, components: LayoutFeatureComponents) -> None:
+        for name in _macro_names(components):
+            if not isinstance(name, str):
+                continue
+            if name in self.macros:
+                self.overridden_macros.append(FeatureConflict("macro", name, feature, self.macros[name]))
+            self.macros[name] = feature
+
+        for name in components.layers:
+            known = self.layers.get(name)
+            if known is None:
+                self.layers[name] = (len(self.layers), feature)
+            else:
+                self.overridden_layers.append(FeatureConflict("layer", name, feature, known[1]))
+                self.layers[name] = (known[0], feature)
+
+        for hold_tap in components.hold_taps:
+            name = _field(hold_tap, "name")
+            if not isinstance(name, str):
+                continue
+            if name in self.hold_taps:
+                self.duplicate_hold_taps.append(FeatureConflict("hold_tap", name, feature, self.hold_taps[name]))
+            else:
+                self.hold_taps[name] = feature
+
+        for combo in components.combos:
+            self._add_combo(combo, feature)
+
+    def report(self) -> FeatureConflictReport:
+        return FeatureConflictReport(
+            overridden_macros=tuple(self.overridden_macros),
+            overridden_layers=tuple(self.overridden_layers),
+            duplicate_hold_taps=tuple(self.duplicate_hold_taps),
+            overlapping_combos=tuple(self.overlapping_combos),
+        )
+
+    def _add_combo(self, combo: Any, feature: int | None) -> None:
+        positions = _field(combo, "keyPositions")
+        keys = position_mask(positions) if isinstance(positions, list) else 0
+        if not keys:
+            return
+        name = str(_field(combo, "name"))
+        layers = self._layer_keys(_field(combo, "layers"))
+        if feature is not None:
+            sharing = 0
+            for position in iter_bits(keys):
+                sharing |= self.combos_at.get(position, 0)
+            for index in iter_bits(sharing):
+                other, source, other_keys, other_layers = self.combos[index]
+                if layers is None or other_layers is None or not layers.isdisjoint(other_layers):
+                    shared = tuple(iter_bits(keys & other_keys))
+                    self.overlapping_combos.append(
+                        FeatureConflict("combo", name, feature, source, other=other, key_positions=shared)
+                    )
+        bit = 1 << len(self.combos)
+        for position in iter_bits(keys):
+            self.combos_at[position] = self.combos_at.get(position, 0) | bit
+        self.combos.append((name, feature, keys, layers))
+
+    def _layer_keys(self, layers: Any) -> frozenset[Hashable] | None:
+        """Return the combo's layers as indices (names when unknown); ``None`` means every layer."""
+        selected = selected_layers(layers)
+        if selected is None:
+            return None
+        keys: set[Hashable] = set()
+        for layer in selected:
+            if isinstance(layer, int):
+                keys.add(layer)
+                continue
+            name = layer if isinstance(layer, str) else _field(layer, "name")
+            known = self.layers.get(name)
+            keys.add(known[0] if known is not None else name)
+        return frozenset(keys)
+
+
+def apply_features(layout: dict, features: Sequence[LayoutFeatureComponents]) -> FeatureConflictReport:
+    """Merge *features* into *layout* in order and report where they collide.
+
+    The result is the same as calling :func:`apply_feature` once per bundle,
+    but the layout is indexed once and every bundle is merged in time
+    proportional to its size. Conflicts are reported, not rejected: later
+    macros and layers still override earlier ones and every hold-tap and
+    combo is still appended.
+    """
+    merger = LayoutMerger(layout)
+    tracker = _ConflictTracker(layout)
+    for index, components in enumerate(features):
+        tracker.track(index, components)
+        merger.merge(components)
+    return tracker.report()
+
+
+__all__ = ["FeatureConflict", "FeatureConflictReport", "LayoutFeatureComponents", "apply_feature", "apply_features"]
@@ -0,0 +1,338 @@
+"""Physical geometry and finger model for the 80-key Glove80 matrix.
+
+Layers, combos, and hold-taps address keys by their firmware position
+(``0``-``79``). This module precomputes everything tooling usually wants to
+know about a position — row, column, hand, finger, thumb-cluster membership,
+approximate physical coordinates, and the symbolic ``LH_C1R2``-style name used
+by Sunaku's Glorious Engrammer defines — into flat, position-indexed arrays so
+lookups never have to re-derive the matrix layout.
+
+Naming follows the ``KEY_LH_C6R1`` convention: ``C1`` is the innermost
+(index-stretch) column and ``C6`` the outer pinky column; rows run from the
+function row (``R1``) to the bottom row (``R6``). Thumb keys are ``T1``-``T6``
+(``T1``-``T3`` on the upper arc, ``T4``-``T6`` on the lower arc, counted from
+the fingers toward the center).
+
+Coordinates are expressed in key units (1u = 19.05 mm) with ``x`` growing to
+the right and ``y`` growing toward the user. They approximate the Glove80's
+column stagger and thumb arcs; they are meant for relative measurements
+(distances, heatmaps, rendering) rather than CAD work.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from math import hypot
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Final, Literal
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+Hand = Literal["left", "right"]
+Finger = Literal["pinky", "ring", "middle", "index", "thumb"]
+
+KEY_COUNT: Final = 80
+
+HANDS: Final[tuple[Hand, ...]] = ("left", "right")
+FINGERS: Final[tuple[Finger, ...]] = ("pinky", "ring", "middle", "index", "thumb")
+
+# Column -> finger for the non-thumb keys (identical on both hands).
+_COLUMN_FINGERS: Final[dict[int, Finger]] = {
+    1: "index",
+    2: "index",
+    3: "middle",
+    4: "ring",
+    5: "pinky",
+    6: "pinky",
+}
+
+# Downward offset (in key units) of each column relative to the middle finger.
+_COLUMN_STAGGER: Final[dict[int, float]] = {
+    1: 0.25,
+    2: 0.125,
+    3: 0.0,
+    4: 0.125,
+    5: 0.375,
+    6: 0.5,
+}
+
+# Left-hand thumb coordinates; the right hand mirrors them.
+_LEFT_THUMB_COORDS: Final[dict[int, tuple[float, float]]] = {
+    1: (6.25, 5.25),
+    2: (7.25, 5.5),
+    3: (8.2, 5.9),
+    4: (6.0, 6.35),
+    5: (7.0, 6.65),
+    6: (7.95, 7.05),
+}
+
+# Horizontal mirror axis between the two halves (left C6 sits at x=0).
+_MIRROR_WIDTH: Final = 17.0
+
+# Firmware row layout: each tuple lists the keys of one physical row from the
+# left edge of the board to the right edge. Finger keys are (hand, column) and
+# thumb keys are (hand, "T<n>").
+_ROW_LAYOUT: Final[tuple[tuple[tuple[str, int | str], ...], ...]] = (
+    (
+        *(("L", col) for col in range(6, 1, -1)),
+        *(("R", col) for col in range(2, 7)),
+    ),
+    (
+        *(("L", col) for col in range(6, 0, -1)),
+        *(("R", col) for col in range(1, 7)),
+    ),
+    (
+        *(("L", col) for col in range(6, 0, -1)),
+        *(("R", col) for col in range(1, 7)),
+    ),
+    (
+        *(("L", col) for col in range(6, 0, -1)),
+        *(("R", col) for col in range(1, 7)),
+    ),
+    (
+        *(("L", col) for col in range(6, 0, -1)),
+        ("L", "T1"),
+        ("L", "T2"),
+        ("L", "T3"),
+        ("R", "T3"),
+        ("R", "T2"),
+        ("R", "T1"),
+        *(("R", col) for col in range(1, 7)),
+    ),
+    (
+        *(("L", col) for col in range(6, 1, -1)),
+        ("L", "T4"),
+        ("L", "T5"),
+        ("L", "T6"),
+        ("R", "T6"),
+        ("R", "T5"),
+        ("R", "T4"),
+        *(("R", col) for col in range(2, 7)),
+    ),
+)
+
+
+@dataclass(frozen=True)
+class KeyInfo:
+    """Everything known about a single key position."""
+
+    position: int
+    name: str
+    row: int
+    column: int
+    hand: Hand
+    finger: Finger
+    thumb: bool
+    x: float
+    y: float
+
+
+def _build_tables() -> tuple[
+    tuple[str, ...],
+    array[int],
+    array[int],
+    array[int],
+    array[int],
+    array[int],
+    array[float],
+    array[float],
+]:
+    names: list[str] = []
+    rows = array("B")
+    columns = array("B")
+    hands = array("B")
+    fingers = array("B")
+    thumbs = array("B")
+    xs = array("d")
+    ys = array("d")
+
+    for row_number, row in enumerate(_ROW_LAYOUT, start=1):
+        for side, slot in row:
+            hand_index = 0 if side == "L" else 1
+            if isinstance(slot, str):
+                thumb_number = int(slot[1:])
+                name = f"{side}H_{slot}"
+                column = 0
+                finger: Finger = "thumb"
+                x, y = _LEFT_THUMB_COORDS[thumb_number]
+            else:
+                name = f"{side}H_C{slot}R{row_number}"
+                column = slot
+                finger = _COLUMN_FINGERS[slot]
+                x = float(6 - slot)
+                y = row_number - 1 + _COLUMN_STAGGER[slot]
+            if hand_index == 1:
+                x = _MIRROR_WIDTH - x
+
+            names.append(name)
+            rows.append(row_number)
+            columns.append(column)
+            hands.append(hand_index)
+            fingers.append(FINGERS.index(finger))
+            thumbs.append(1 if finger == "thumb" else 0)
+            xs.append(x)
+            ys.append(y)
+
+    if len(names) != KEY_COUNT:  # pragma: no cover - guarded by the row table above
+        msg = f"Geometry table describes {len(names)} keys, expected {KEY_COUNT}"
+        raise AssertionError(msg)
+    return tuple(names), rows, columns, hands, fingers, thumbs, xs, ys
+
+
+# Position-indexed tables: ``NAMES[40] == "RH_C1R4"``, ``ROWS[40] == 4``, …
+NAMES, ROWS, COLUMNS, HAND_INDICES, FINGER_INDICES, THUMB_FLAGS, X, Y = _build_tables()
+
+POSITIONS_BY_NAME: Final[Mapping[str, int]] = MappingProxyType({name: pos for pos, name in enumerate(NAMES)})
+
+
+def _distance_table() -> array[float]:
+    table = array("d", bytes(8 * KEY_COUNT * KEY_COUNT))
+    for a in range(KEY_COUNT):
+        ax, ay = X[a], Y[a]
+        base = a * KEY_COUNT
+        for b in range(a + 1, KEY_COUNT):
+            value = hypot(X[b] - ax, Y[b] - ay)
+            table[base + b] = value
+            table[b * KEY_COUNT + a] = value
+    return table
+
+
+# Flat ``KEY_COUNT * KEY_COUNT`` Euclidean distance table in key units.
+DISTANCES: Final = _distance_table()
+
+
+def _check_position(position: int) -> int:
+    if isinstance(position, bool) or not 0 <= position < KEY_COUNT:
+        msg = f"Key position {position!r} is outside the valid range 0-{KEY_COUNT - 1}"
+        raise IndexError(msg)
+    return position
+
+
+def is_valid_position(position: object) -> bool:
+    """Return True for integers addressing a physical Glove80 key."""
+    return isinstance(position, int) and not isinstance(position, bool) and 0 <= position < KEY_COUNT
+
+
+def position_for(name: str) -> int:
+    """Return the firmware position for a symbolic name (``KEY_`` prefix optional)."""
+    key = name[4:] if name.startswith("KEY_") else name
+    try:
+        return POSITIONS_BY_NAME[key]
+    except KeyError as exc:
+        msg = f"Unknown key name '{name}'"
+        raise KeyError(msg) from exc
+
+
+def name_for(position: int) -> str:
+    """Return the symbolic name (``LH_C1R2``) for a firmware position."""
+    return NAMES[_check_position(position)]
+
+
+def hand_for(position: int) -> Hand:
+    return HANDS[HAND_INDICES[_check_position(position)]]
+
+
+def finger_for(position: int) -> Finger:
+    return FINGERS[FINGER_INDICES[_check_position(position)]]
+
+
+def is_thumb(position: int) -> bool:
+    return bool(THUMB_FLAGS[_check_position(position)])
+
+
+@lru_cache(maxsize=KEY_COUNT)
+def key_info(position: int) -> KeyInfo:
+    """Return the full :class:`KeyInfo` record for *position*."""
+    _check_position(position)
+    return KeyInfo(
+        position=position,
+        name=NAMES[position],
+        row=ROWS[position],
+        column=COLUMNS[position],
+        hand=HANDS[HAND_INDICES[position]],
+        finger=FINGERS[FINGER_INDICES[position]],
+        thumb=bool(THUMB_FLAGS[position]),
+        x=X[position],
+        y=Y[position],
+    )
+
+
+@lru_cache(maxsize=None)
+def positions_where(
+    *,
+    hand: Hand | None = None,
+    finger: Finger | None = None,
+    row: int | None = None,
+    column: int | None = None,
+) -> tuple[int, ...]:
+    """Return the ascending positions matching every provided attribute."""
+    hand_index = HANDS.index(hand) if hand is not None else None
+    finger_index = FINGERS.index(finger) if finger is not None else None
+    return tuple(
+        pos
+        for pos in range(KEY_COUNT)
+        if (hand_index is None or HAND_INDICES[pos] == hand_index)
+        and (finger_index is None or FINGER_INDICES[pos] == finger_index)
+        and (row is None or ROWS[pos] == row)
+        and (column is None or COLUMNS[pos] == column)
+    )
+
+
+def distance(a: int, b: int) -> float:
+    """Return the Euclidean distance between two keys in key units."""
+    return DISTANCES[_check_position(a) * KEY_COUNT + _check_position(b)]
+
+
+def distance_matrix(positions: Sequence[int] | None = None) -> list[list[float]]:
+    """Return the pairwise distance matrix for *positions* (default: every key).
+
+    Rows are sliced straight out of the precomputed flat table, so the full
+    80×80 matrix costs one list copy per row rather than 6,400 ``hypot`` calls.
+    """
+    if positions is None:
+        return [DISTANCES[row * KEY_COUNT : (row + 1) * KEY_COUNT].tolist() for row in range(KEY_COUNT)]
+    selected = [_check_position(pos) for pos in positions]
+    matrix: list[list[float]] = []
+    for a in selected:
+        row = DISTANCES[a * KEY_COUNT : (a + 1) * KEY_COUNT]
+        matrix.append([row[b] for b in selected])
+    return matrix
+
+
+def names_for(positions: Iterable[int]) -> list[str]:
+    """Translate an iterable of positions into symbolic names."""
+    return [name_for(pos) for pos in positions]
+
+
+__all__ = [
+    "DISTANCES",
+    "FINGERS",
+    "FINGER_INDICES",
+    "HANDS",
+    "HAND_INDICES",
+    "KEY_COUNT",
+    "COLUMNS",
+    "NAMES",
+    "POSITIONS_BY_NAME",
+    "ROWS",
+    "THUMB_FLAGS",
+    "X",
+    "Y",
+    "Finger",
+    "Hand",
+    "KeyInfo",
+    "distance",
+    "distance_matrix",
+    "finger_for",
+    "hand_for",
+    "is_thumb",
+    "is_valid_position",
+    "key_info",
+    "name_for",
+    "names_for",
+    "position_for",
+    "positions_where",
+]
@@ -3,22 +3,65 @@
 Implementation lives in ``glove80.keycodes.core``.
 """
 
+from typing import TYPE_CHECKING, Any
+
+from . import core
+from .behaviors import BehaviorSpec, ParamSpec, behavior_catalog, behavior_spec
 from .core import (
-    KEY_NAME_VALUES,
     KeyOption,
+    KeyRecord,
     KnownKeyName,
     all_key_names,
     assert_known_key_name,
     is_known_key_name,
     key_options_by_name,
+    key_records,
+)
+from .reverse import (
+    OPERATING_SYSTEMS,
+    KeyReverseIndex,
+    KeyStroke,
+    keystroke_for,
+    keystrokes_for_text,
+    reverse_key_index,
 )
+from .search import KeyMatch, KeySearchIndex, complete_key_names, key_search_index, search_keys
+
+if TYPE_CHECKING:
+    from .core import KEY_NAME_VALUES
+
+
+def __getattr__(name: str) -> Any:
+    # Forwarded lazily: reading it loads the key index (see glove80.keycodes.core).
+    if name == "KEY_NAME_VALUES":
+        return core.KEY_NAME_VALUES
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
 
 __all__ = [
     "KEY_NAME_VALUES",
+    "OPERATING_SYSTEMS",
+    "BehaviorSpec",
+    "KeyMatch",
     "KeyOption",
+    "KeyRecord",
+    "KeyReverseIndex",
+    "KeySearchIndex",
+    "KeyStroke",
     "KnownKeyName",
+    "ParamSpec",
     "all_key_names",
     "assert_known_key_name",
+    "behavior_catalog",
+    "behavior_spec",
+    "complete_key_names",
     "is_known_key_name",
     "key_options_by_name",
+    "key_records",
+    "key_search_index",
+    "keystroke_for",
+    "keystrokes_for_text",
+    "reverse_key_index",
+    "search_keys",
 ]
@@ -0,0 +1,92 @@
+"""Indexed catalog of the ZMK behaviors known to the Glove80 layout editor.
+
+``zmk.json`` lists every built-in behavior with its parameters. Parameters are
+either a kind name (``"code"``, ``"layer"``, ``"command"``, ``"text_command"``)
+or an object describing an integer (macro timing controls). The catalog turns
+that list into a name-keyed mapping of frozen :class:`BehaviorSpec` records so
+binding validation is a dictionary lookup per node.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Literal
+
+from .core import _read_resource
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+ParamKind = Literal["code", "layer", "command", "text_command", "integer"]
+
+
+@dataclass(frozen=True)
+class ParamSpec:
+    """One positional parameter of a behavior."""
+
+    kind: ParamKind
+    minimum: int | None = None
+    maximum: int | None = None
+
+
+@dataclass(frozen=True)
+class BehaviorSpec:
+    """Arity and parameter kinds of a built-in behavior."""
+
+    code: str
+    name: str
+    params: tuple[ParamSpec, ...]
+    # Valid values for a ``command`` parameter, mapped to the number of extra
+    # integer parameters the command takes (``&mmv MOVE_X 100``).
+    commands: Mapping[str, int]
+    macro_control: bool = False
+
+    @property
+    def arity(self) -> int:
+        return len(self.params)
+
+
+_NAMED_KINDS: dict[str, ParamKind] = {
+    "code": "code",
+    "layer": "layer",
+    "command": "command",
+    "text_command": "text_command",
+}
+
+
+def _param_spec(raw: Any) -> ParamSpec:
+    if isinstance(raw, str):
+        if raw not in _NAMED_KINDS:  # pragma: no cover - guarded by zmk.json
+            msg = f"Unsupported behavior parameter kind '{raw}'"
+            raise ValueError(msg)
+        return ParamSpec(_NAMED_KINDS[raw])
+    return ParamSpec("integer", minimum=raw.get("min"), maximum=raw.get("max"))
+
+
+@lru_cache(maxsize=1)
+def behavior_catalog() -> Mapping[str, BehaviorSpec]:
+    """Return every built-in behavior keyed by its code (``&kp``, ``Custom``…)."""
+    catalog: dict[str, BehaviorSpec] = {}
+    for entry in json.loads(_read_resource("zmk.json")):
+        commands = {
+            str(command["code"]): len(command.get("additionalParams") or ()) for command in entry.get("commands") or ()
+        }
+        catalog[entry["code"]] = BehaviorSpec(
+            code=entry["code"],
+            name=entry["name"],
+            params=tuple(_param_spec(param) for param in entry.get("params") or ()),
+            commands=MappingProxyType(commands),
+            macro_control=bool(entry.get("isMacroControlBehavior")),
+        )
+    return MappingProxyType(catalog)
+
+
+def behavior_spec(code: str) -> BehaviorSpec | None:
+    """Return the catalog entry for *code*, or ``None`` for user-defined behaviors."""
+    return behavior_catalog().get(code)
+
+
+__all__ = ["BehaviorSpec", "ParamKind", "ParamSpec", "behavior_catalog", "behavior_spec"]
@@ -6,21 +6,30 @@ public API to keep package inits minimal.
 
 from __future__ import annotations
 
+import hashlib
 import json
+import marshal
+import os
+from contextlib import suppress
 from functools import lru_cache
 from importlib import resources
-from typing import TYPE_CHECKING, NewType, TypeGuard
+from typing import TYPE_CHECKING, Any, Final, NewType, TypeGuard, Union
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from glove80.cache import default_cache_dir
+
 if TYPE_CHECKING:
     from collections.abc import Iterable
+    from pathlib import Path
 
 
 class KeyOption(BaseModel):
     """Single key definition as described by the layout editor bundle."""
 
-    model_config = ConfigDict(populate_by_name=True)
+    # The schema is only needed once key_options_by_name() loads the bundle;
+    # deferring it keeps pydantic's schema build out of import time.
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
 
     names: list[str]
     description: str
@@ -49,14 +58,18 @@ def _raw_key_options() -> list[KeyOption]:
 
 
 def _iter_aliases(option: KeyOption) -> Iterable[str]:
-    for name in option.names:
+    return _iter_raw_aliases(option.names, option.shortcut, option.symbol)
+
+
+def _iter_raw_aliases(names: Iterable[str], shortcut: str | None, symbol: str | None) -> Iterable[str]:
+    for name in names:
         yield name
         if name.endswith("(code)"):
             yield name[: -len("(code)")]
-    if option.shortcut:
-        yield option.shortcut
-    if option.symbol:
-        yield option.symbol
+    if shortcut:
+        yield shortcut
+    if symbol:
+        yield symbol
 
 
 @lru_cache(maxsize=1)
@@ -69,61 +82,161 @@ def key_options_by_name() -> dict[str, KeyOption]:
     return mapping
 
 
-def _load_known_key_names() -> tuple[tuple[str, ...], frozenset[str]]:
-    alias_names: set[str] = set()
-    for option in _raw_key_options():
-        alias_names.update(_iter_aliases(option))
+# (names, description, shortcut, symbol, shifted_from, sorted os items): the
+# KeyOption fields that search and reverse lookups need, as marshal-friendly tuples.
+KeyRecord = tuple[
+    tuple[str, ...],
+    str,
+    Union[str, None],
+    Union[str, None],
+    Union[str, None],
+    tuple[tuple[str, Union[bool, None]], ...],
+]
+
+# -- precompiled index ---------------------------------------------------------
+# Key-name checks only need the set of known key names. Computing it means
+# parsing both JSON bundles, so the result is stored as a marshal blob in the
+# glove80 cache directory, named after the index version, the marshal format,
+# and the SHA-256 of the bundles: editing either JSON file (or upgrading
+# Python) simply selects a new blob, and writing it removes the blobs it
+# supersedes. Bump _INDEX_VERSION whenever the index layout changes. Nothing
+# is read or written until the first lookup; note that importing the glove80
+# package performs one, because the family modules check their key names at
+# import time.
+_INDEX_VERSION: Final = 2
+_INDEX_SOURCES: Final = ("key_options.json", "zmk.json")
 
-    zmk_names: set[str] = set()
-    zmk_data = json.loads(_read_resource("zmk.json"))
-    for behavior in zmk_data:
+
+def _index_path(sources: dict[str, bytes], cache_dir: Path) -> Path:
+    digest = hashlib.sha256()
+    for name in _INDEX_SOURCES:
+        digest.update(sources[name])
+    return cache_dir / f"keycodes-v{_INDEX_VERSION}-m{marshal.version}-{digest.hexdigest()[:16]}.marshal"
+
+
+def _build_index(sources: dict[str, bytes]) -> dict[str, Any]:
+    names: set[str] = set()
+    records: list[KeyRecord] = []
+    for obj in json.loads(sources["key_options.json"]):
+        for alias in _iter_raw_aliases(obj["names"], obj.get("shortcut"), obj.get("symbol")):
+            if alias and not alias.startswith("&"):
+                names.add(alias)
+        records.append(
+            (
+                tuple(obj["names"]),
+                obj["description"],
+                obj.get("shortcut"),
+                obj.get("symbol"),
+                obj.get("shiftedFrom"),
+                tuple(sorted((obj.get("os") or {}).items())),
+            )
+        )
+
+    for behavior in json.loads(sources["zmk.json"]):
         code = behavior.get("code")
         if code:
-            zmk_names.add(str(code))
+            names.add(str(code))
         for command in behavior.get("commands") or []:
             cmd_code = command.get("code")
             if cmd_code:
-                zmk_names.add(str(cmd_code))
+                names.add(str(cmd_code))
+    names.add("MACRO_PLACEHOLDER")
+    return {"version": _INDEX_VERSION, "key_names": tuple(sorted(names)), "records": tuple(records)}
+
+
+def _load_index(cache_dir: Path | None = None) -> dict[str, Any]:
+    """Return the precompiled key index, building and storing it on first use.
+
+    An unusable cache directory (missing home, read-only, not a directory…)
+    only means the index is built in memory every time.
+    """
+    package = resources.files(__package__)
+    sources = {name: package.joinpath(name).read_bytes() for name in _INDEX_SOURCES}
+    try:
+        path = _index_path(sources, cache_dir if cache_dir is not None else default_cache_dir())
+    except RuntimeError:  # Path.home() without a resolvable home directory
+        return _build_index(sources)
+    try:
+        index = marshal.loads(path.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        index = None
+    if isinstance(index, dict) and index.get("version") == _INDEX_VERSION:
+        return index
+
+    index = _build_index(sources)
+    # Write-then-rename so concurrent loads never read a partial blob.
+    scratch = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        scratch.write_bytes(marshal.dumps(index))
+        os.replace(scratch, path)
+    except OSError:
+        with suppress(OSError):
+            scratch.unlink(missing_ok=True)
+        return index
+    for stale in path.parent.glob("keycodes-v*.marshal"):
+        if stale != path:
+            with suppress(OSError):
+                stale.unlink()
+    return index
 
-    names: set[str] = set()
-    for alias in alias_names:
-        if alias and not alias.startswith("&"):
-            names.add(alias)
 
-    names.update(zmk_names)
-    names.add("MACRO_PLACEHOLDER")
+@lru_cache(maxsize=1)
+def _key_index() -> dict[str, Any]:
+    return _load_index()
+
+
+@lru_cache(maxsize=1)
+def _known_key_names() -> frozenset[str]:
+    return frozenset(_key_index()["key_names"])
+
 
-    sorted_names = tuple(sorted(names))
-    return sorted_names, frozenset(sorted_names)
+def key_records() -> tuple[KeyRecord, ...]:
+    """Return one plain :data:`KeyRecord` per key option, in bundle order, without pydantic."""
+    return _key_index()["records"]  # type: ignore[no-any-return]
 
 
-KEY_NAME_VALUES, _KNOWN_KEY_NAMES = _load_known_key_names()
 KnownKeyName = NewType("KnownKeyName", str)
 
 
 def is_known_key_name(name: str) -> TypeGuard[KnownKeyName]:
     """Check whether the provided token is a recognized key name."""
-    return name in _KNOWN_KEY_NAMES
+    return name in _known_key_names()
 
 
 def assert_known_key_name(name: str) -> None:
     """Fail loudly when a layer references a key the editor does not expose."""
-    if name not in _KNOWN_KEY_NAMES:
+    if name not in _known_key_names():
         msg = f"Unknown key name '{name}'. Update key metadata if this is an intentional addition."
         raise ValueError(msg)
 
 
 def all_key_names() -> Iterable[str]:
     """Expose every known name (aliases included)."""
-    return KEY_NAME_VALUES
+    return _key_index()["key_names"]  # type: ignore[no-any-return]
+
+
+if TYPE_CHECKING:
+    KEY_NAME_VALUES: tuple[str, ...]
+
+
+def __getattr__(name: str) -> Any:
+    # KEY_NAME_VALUES is resolved on first access so importing the module
+    # does not load (or write) the key index.
+    if name == "KEY_NAME_VALUES":
+        return _key_index()["key_names"]
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
 
 
 __all__ = [
     "KEY_NAME_VALUES",
     "KeyOption",
+    "KeyRecord",
     "KnownKeyName",
     "all_key_names",
     "assert_known_key_name",
     "is_known_key_name",
     "key_options_by_name",
+    "key_records",
 ]
@@ -0,0 +1,226 @@
+"""Reverse lookups over the keycode bundle: character to keystroke, shifted pairs, OS support.
+
+``key_options_by_name`` answers "what is ``N1``?". :class:`KeyReverseIndex`
+answers the opposite questions that layout analysis and text-to-keystroke
+tooling ask:
+
+* which key (and whether Shift is held) types a character, e.g. ``"!"`` is
+  ``LS(NUMBER_1)``;
+* which keys are the shifted form of another (``shiftedFrom`` in the bundle);
+* on which operating systems a key works.
+
+The index is built once from :func:`glove80.keycodes.core.key_records` (no
+JSON parsing or pydantic) and every query is a dictionary lookup. Characters
+are those of the US layout the bundle describes; anything else (``"€"``,
+``"é"``) has no entry and resolves to ``None``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Union
+
+from .core import key_records
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from .core import KeyRecord
+
+OPERATING_SYSTEMS = ("android", "ios", "linux", "macos", "windows")
+
+# Typed characters that the bundle only describes by name.
+_CONTROL_CHARACTERS = {"\n": "RETURN", "\t": "TAB"}
+# ``shiftedFrom`` values that are not aliases in the bundle (DOUBLE_QUOTES says "SOT").
+_SHIFTED_FROM_TYPOS = {"SOT": "SQT"}
+
+
+@dataclass(frozen=True)
+class KeyStroke:
+    """How to type one character: press ``key``, with Shift held when ``shifted``.
+
+    ``name`` is the key option that documents the character (``EXCLAMATION``
+    for ``"!"``); it equals ``key`` for unshifted characters.
+    """
+
+    key: str
+    shifted: bool = False
+    name: str | None = None
+
+    @property
+    def binding_value(self) -> str:
+        """The ``&kp`` parameter that types the character (``LS(NUMBER_1)``)."""
+        return f"LS({self.key})" if self.shifted else self.key
+
+    def to_binding(self) -> dict[str, object]:
+        """Return the ``&kp`` binding tree that types the character."""
+        param: dict[str, object] = {"value": self.key, "params": []}
+        if self.shifted:
+            param = {"value": "LS", "params": [param]}
+        return {"value": "&kp", "params": [param]}
+
+
+def _canonical_names(records: Sequence[KeyRecord]) -> dict[str, str]:
+    canonical: dict[str, str] = {}
+    for names, *_ in records:
+        for name in names:
+            canonical.setdefault(name, names[0])
+            if name.endswith("(code)"):
+                canonical.setdefault(name[: -len("(code)")], names[0])
+    return canonical
+
+
+class KeyReverseIndex:
+    """Character, shifted-pair, and OS-support tables over the key options of the bundle."""
+
+    def __init__(self, records: Sequence[KeyRecord]) -> None:
+        canonical = _canonical_names(records)
+        strokes: dict[str, KeyStroke] = {}
+        base_of: dict[str, str] = {}
+        shifted_of: dict[str, list[str]] = {}
+        support: dict[str, Mapping[str, Union[bool, None]]] = {}
+
+        # Unshifted keys first: their shortcut is the character they type.
+        typing_keys: set[str] = set()
+        for names, _description, shortcut, _symbol, _shifted_from, os_items in records:
+            support[names[0]] = MappingProxyType(dict(os_items))
+            if len(names[0]) == 1 and names[0].isalpha():
+                strokes[names[0].lower()] = KeyStroke(names[0], name=names[0])
+                strokes[names[0].upper()] = KeyStroke(names[0], shifted=True, name=names[0])
+                typing_keys.add(names[0])
+            elif shortcut is not None and len(shortcut) == 1:
+                strokes.setdefault(shortcut, KeyStroke(names[0], name=names[0]))
+                typing_keys.add(names[0])
+        for character, name in _CONTROL_CHARACTERS.items():
+            strokes[character] = KeyStroke(canonical[name], name=canonical[name])
+
+        # Then shifted symbols. A symbol can appear twice ("|" on BACKSLASH and
+        # on NON_US_BACKSLASH); the one shifted from a US typing key wins.
+        fallback: dict[str, KeyStroke] = {}
+        for names, _description, _shortcut, symbol, shifted_from, _os in records:
+            base = canonical.get(_SHIFTED_FROM_TYPOS.get(shifted_from, shifted_from)) if shifted_from else None
+            if base is not None:
+                base_of[names[0]] = base
+                shifted_of.setdefault(base, []).append(names[0])
+            if symbol is None or len(symbol) != 1:
+                continue
+            stroke = KeyStroke(base, shifted=True, name=names[0]) if base else KeyStroke(names[0], name=names[0])
+            if base in typing_keys:
+                strokes.setdefault(symbol, stroke)
+            else:
+                fallback.setdefault(symbol, stroke)
+        for symbol, stroke in fallback.items():
+            strokes.setdefault(symbol, stroke)
+
+        self._canonical = MappingProxyType(canonical)
+        self._strokes = MappingProxyType(strokes)
+        self._base_of = MappingProxyType(base_of)
+        self._shifted_of = MappingProxyType({base: tuple(names) for base, names in shifted_of.items()})
+        self._support = MappingProxyType(support)
+        self._unavailable = MappingProxyType(
+            {
+                system: frozenset(name for name, os in support.items() if os.get(system) is False)
+                for system in OPERATING_SYSTEMS
+            }
+        )
+        self._partial = MappingProxyType(
+            {
+                system: frozenset(name for name, os in support.items() if os.get(system) is None)
+                for system in OPERATING_SYSTEMS
+            }
+        )
+
+    def canonical_name(self, name: str) -> str | None:
+        """Return the canonical name of a key alias (``N1`` -> ``NUMBER_1``)."""
+        return self._canonical.get(name)
+
+    def keystroke(self, character: str) -> KeyStroke | None:
+        """Return how to type *character*, or ``None`` when no key produces it."""
+        return self._strokes.get(character)
+
+    def keystrokes(self, text: str) -> list[KeyStroke]:
+        """Return the keystrokes that type *text*; fails on the first untypeable character."""
+        strokes = self._strokes
+        result: list[KeyStroke] = []
+        for offset, character in enumerate(text):
+            stroke = strokes.get(character)
+            if stroke is None:
+                msg = f"No key produces {character!r} (position {offset})"
+                raise ValueError(msg)
+            result.append(stroke)
+        return result
+
+    @property
+    def characters(self) -> Mapping[str, KeyStroke]:
+        """Every typeable character mapped to its keystroke."""
+        return self._strokes
+
+    @property
+    def shifted_pairs(self) -> Mapping[str, str]:
+        """Shifted key -> the key it is the shifted form of (``EXCLAMATION`` -> ``NUMBER_1``)."""
+        return self._base_of
+
+    def unshifted(self, name: str) -> str | None:
+        """Return the key whose shifted form *name* is, or ``None``."""
+        canonical = self._canonical.get(name)
+        return self._base_of.get(canonical) if canonical is not None else None
+
+    def shifted(self, name: str) -> tuple[str, ...]:
+        """Return the keys that are the shifted form of *name*."""
+        canonical = self._canonical.get(name)
+        return self._shifted_of.get(canonical, ()) if canonical is not None else ()
+
+    def os_support(self, name: str) -> Mapping[str, Union[bool, None]]:
+        """Return the bundle's per-OS support for *name* (``True``/``False``; ``None`` is partial)."""
+        canonical = self._canonical.get(name)
+        if canonical is None:
+            msg = f"Unknown key name '{name}'"
+            raise ValueError(msg)
+        return self._support[canonical]
+
+    def unavailable_on(self, os: str) -> frozenset[str]:
+        """Return the canonical names of keys the bundle marks as not working on *os*."""
+        return self._table(self._unavailable, os)
+
+    def available_on(self, os: str, *, partial: bool = True) -> frozenset[str]:
+        """Return keys that work on *os*; ``partial=False`` also drops partial or unknown support."""
+        dropped = self._table(self._unavailable, os)
+        if not partial:
+            dropped = dropped | self._partial[os]
+        return frozenset(self._support.keys() - dropped)
+
+    @staticmethod
+    def _table(tables: Mapping[str, frozenset[str]], os: str) -> frozenset[str]:
+        table = tables.get(os)
+        if table is None:
+            msg = f"Unknown operating system '{os}'; expected one of {', '.join(OPERATING_SYSTEMS)}"
+            raise ValueError(msg)
+        return table
+
+
+@lru_cache(maxsize=1)
+def reverse_key_index() -> KeyReverseIndex:
+    """Return the shared reverse index, building it on first use."""
+    return KeyReverseIndex(key_records())
+
+
+def keystroke_for(character: str) -> KeyStroke | None:
+    """Return how to type *character* (see :meth:`KeyReverseIndex.keystroke`)."""
+    return reverse_key_index().keystroke(character)
+
+
+def keystrokes_for_text(text: str) -> list[KeyStroke]:
+    """Return the keystrokes that type *text* (see :meth:`KeyReverseIndex.keystrokes`)."""
+    return reverse_key_index().keystrokes(text)
+
+
+__all__ = [
+    "OPERATING_SYSTEMS",
+    "KeyReverseIndex",
+    "KeyStroke",
+    "keystroke_for",
+    "keystrokes_for_text",
+    "reverse_key_index",
+]
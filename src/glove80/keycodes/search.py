@@ -0,0 +1,208 @@
+"""Prefix and fuzzy search over key names, aliases, shortcuts, symbols, and descriptions.
+
+:class:`KeySearchIndex` is built once from :func:`glove80.keycodes.core.key_records`
+(no JSON parsing or pydantic). Every searchable term is lower-cased into a
+sorted array, so a prefix lookup is a binary search followed by a scan of the
+matching range, and into a trigram posting table, so fuzzy lookups only score
+terms that share at least one trigram with the query. Both return in tens of
+microseconds, which is what as-you-type completion needs.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Literal
+
+from .core import key_records
+from .reverse import OPERATING_SYSTEMS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from .core import KeyRecord
+
+MatchField = Literal["name", "alias", "shortcut", "symbol", "description"]
+
+# Ranking: exact beats prefix beats fuzzy; names beat descriptions.
+_EXACT, _PREFIX = 3.0, 2.0
+_FIELD_PENALTY: dict[str, float] = {"name": 0.0, "alias": 0.05, "shortcut": 0.1, "symbol": 0.1, "description": 0.5}
+_SEGMENT_PENALTY = 0.2
+_MIN_FUZZY_SCORE = 0.45
+_WORD = re.compile(r"[^\W_]{2,}")
+
+
+@dataclass(frozen=True)
+class KeyMatch:
+    """One search hit; ``name`` is the key's canonical name."""
+
+    name: str
+    matched: str
+    field: MatchField
+    score: float
+    description: str
+    aliases: tuple[str, ...]
+
+
+def _trigrams(term: str) -> frozenset[str]:
+    padded = f"  {term} "
+    return frozenset(padded[index : index + 3] for index in range(len(padded) - 2))
+
+
+def _iter_terms(record: KeyRecord) -> Iterable[tuple[str, str, MatchField, float]]:
+    """Yield ``(searchable text, displayed term, field, penalty)`` for one key."""
+    names, description, shortcut, symbol, _shifted_from, _os = record
+    for index, name in enumerate(names):
+        field: MatchField = "name" if index == 0 else "alias"
+        base = name[: -len("(code)")] if name.endswith("(code)") else name
+        yield base, name, field, _FIELD_PENALTY[field]
+        # Later segments too, so "vol" finds C_VOLUME_UP.
+        for offset, char in enumerate(base):
+            if char == "_" and offset + 1 < len(base):
+                yield base[offset + 1 :], name, field, _FIELD_PENALTY[field] + _SEGMENT_PENALTY
+    if shortcut:
+        yield shortcut, shortcut, "shortcut", _FIELD_PENALTY["shortcut"]
+    if symbol:
+        yield symbol, symbol, "symbol", _FIELD_PENALTY["symbol"]
+    for word in _WORD.findall(description):
+        yield word, word, "description", _FIELD_PENALTY["description"]
+
+
+class KeySearchIndex:
+    """Search structure over the key options of the layout editor bundle."""
+
+    def __init__(self, records: Sequence[KeyRecord]) -> None:
+        self._records = tuple(records)
+        self._os = [dict(record[5]) for record in self._records]
+        # term id -> (searchable text, displayed term, field, record id, penalty)
+        self._terms: list[tuple[str, str, MatchField, int, float]] = []
+        seen: set[tuple[str, int]] = set()
+        for record_id, record in enumerate(self._records):
+            for text, display, field, penalty in _iter_terms(record):
+                key = (text.lower(), record_id)
+                if key not in seen:
+                    seen.add(key)
+                    self._terms.append((key[0], display, field, record_id, penalty))
+        self._sorted = sorted((term[0], term_id) for term_id, term in enumerate(self._terms))
+        self._sorted_keys = [text for text, _ in self._sorted]
+        self._grams = [_trigrams(term[0]) for term in self._terms]
+        self._postings: dict[str, list[int]] = {}
+        for term_id, grams in enumerate(self._grams):
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(term_id)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def complete(self, prefix: str, *, os: str | None = None, limit: int = 20) -> list[KeyMatch]:
+        """Return keys with a name, alias, shortcut, or symbol starting with *prefix*."""
+        _check_os(os)
+        lowered = _normalize(prefix)
+        if not lowered:
+            return []
+        return self._rank(self._prefix_hits(lowered, names_only=True), os=os, limit=limit)
+
+    def search(self, query: str, *, os: str | None = None, limit: int = 20, fuzzy: bool = True) -> list[KeyMatch]:
+        """Return the best matches for *query*: exact, then prefix, then fuzzy hits.
+
+        ``os`` (``"macos"``, ``"windows"``…) drops keys the bundle marks as
+        unavailable on that system; keys with unknown or partial support stay.
+        Any other name raises ``ValueError``.
+        """
+        _check_os(os)
+        lowered = _normalize(query)
+        if not lowered:
+            return []
+        hits = self._prefix_hits(lowered, names_only=False)
+        if fuzzy:
+            hits.update((term_id, score) for term_id, score in self._fuzzy_hits(lowered).items() if term_id not in hits)
+        return self._rank(hits, os=os, limit=limit)
+
+    def _prefix_hits(self, lowered: str, *, names_only: bool) -> dict[int, float]:
+        hits: dict[int, float] = {}
+        keys = self._sorted_keys
+        for position in range(bisect_left(keys, lowered), len(keys)):
+            if not keys[position].startswith(lowered):
+                break
+            term_id = self._sorted[position][1]
+            if names_only and self._terms[term_id][2] == "description":
+                continue
+            text = keys[position]
+            # Shorter completions first: "A" before "AGAIN" for query "a".
+            hits[term_id] = _EXACT if text == lowered else _PREFIX - len(text) / 1000
+        return hits
+
+    def _fuzzy_hits(self, lowered: str) -> dict[int, float]:
+        query_grams = _trigrams(lowered)
+        shared: dict[int, int] = {}
+        for gram in query_grams:
+            for term_id in self._postings.get(gram, ()):
+                shared[term_id] = shared.get(term_id, 0) + 1
+        hits: dict[int, float] = {}
+        for term_id, count in shared.items():
+            # Dice coefficient over trigram sets.
+            score = 2 * count / (len(query_grams) + len(self._grams[term_id]))
+            if score >= _MIN_FUZZY_SCORE:
+                hits[term_id] = score
+        return hits
+
+    def _rank(self, hits: dict[int, float], *, os: str | None, limit: int) -> list[KeyMatch]:
+        best: dict[int, tuple[float, int]] = {}
+        terms, availability = self._terms, self._os
+        for term_id, score in hits.items():
+            term = terms[term_id]
+            record_id = term[3]
+            if os is not None and availability[record_id].get(os) is False:
+                continue
+            score -= term[4]
+            current = best.get(record_id)
+            if current is None or score > current[0]:
+                best[record_id] = (score, term_id)
+        records = self._records
+        ranked = heapq.nsmallest(limit, best.items(), key=lambda item: (-item[1][0], records[item[0]][0][0]))
+        return [self._match(record_id, term_id, score) for record_id, (score, term_id) in ranked]
+
+    def _match(self, record_id: int, term_id: int, score: float) -> KeyMatch:
+        names, description, *_ = self._records[record_id]
+        _, display, field, _, _ = self._terms[term_id]
+        return KeyMatch(
+            name=names[0],
+            matched=display,
+            field=field,
+            score=round(score, 3),
+            description=description,
+            aliases=names[1:],
+        )
+
+
+def _check_os(os: str | None) -> None:
+    if os is not None and os not in OPERATING_SYSTEMS:
+        msg = f"Unknown operating system '{os}'; expected one of {', '.join(OPERATING_SYSTEMS)}"
+        raise ValueError(msg)
+
+
+def _normalize(query: str) -> str:
+    # Key names spell words with underscores: "volume up" -> "volume_up".
+    return "_".join(query.lower().split())
+
+
+@lru_cache(maxsize=1)
+def key_search_index() -> KeySearchIndex:
+    """Return the shared search index, building it on first use."""
+    return KeySearchIndex(key_records())
+
+
+def search_keys(query: str, *, os: str | None = None, limit: int = 20, fuzzy: bool = True) -> list[KeyMatch]:
+    """Search key names, aliases, shortcuts, symbols, and descriptions (see :meth:`KeySearchIndex.search`)."""
+    return key_search_index().search(query, os=os, limit=limit, fuzzy=fuzzy)
+
+
+def complete_key_names(prefix: str, *, os: str | None = None, limit: int = 20) -> list[KeyMatch]:
+    """Complete a key name from its first characters (see :meth:`KeySearchIndex.complete`)."""
+    return key_search_index().complete(prefix, os=os, limit=limit)
+
+
+__all__ = ["KeyMatch", "KeySearchIndex", "complete_key_names", "key_search_index", "search_keys"]
@@ -0,0 +1,144 @@
+"""Demand-driven layer providers shared by the layout families.
+
+A :class:`LayerProvider` pairs a layer builder with the names of the layers it
+can produce. :func:`build_layers` runs only the providers that declare at
+least one requested name, so a variant never pays for layers (bilateral
+finger layers, the extra dual-OS cursor layer…) that it does not list.
+
+Providers also declare the variant attributes their output depends on
+(``depends_on``). A :class:`ProviderCache` keys each provider's output by
+those attributes, so when a family builds all of its variants a layer that
+only depends on, say, the base variant is constructed once per base variant
+instead of once per variant.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterable, Mapping
+
+    from ..base import Layer, LayerMap
+
+
+@dataclass(frozen=True)
+class LayerProvider:
+    """A layer builder and the layer names it may return.
+
+    A provider can return a subset of ``names`` for a given variant (the HRM
+    provider returns ``HRM_WinLinx`` only for Windows variants), never a name
+    it does not declare. ``depends_on`` names the variant attributes the
+    output is a function of; ``"variant"`` (the default) is the variant name
+    itself and ``()`` means the output is the same for every variant.
+    """
+
+    names: frozenset[str]
+    build: Callable[[str], LayerMap]
+    depends_on: tuple[str, ...] = ("variant",)
+
+    def __call__(self, variant: str) -> LayerMap:
+        return self.build(variant)
+
+    @classmethod
+    def single(
+        cls,
+        name: str,
+        builder: Callable[[str], Layer],
+        depends_on: tuple[str, ...] = ("variant",),
+    ) -> LayerProvider:
+        """Wrap a builder that returns exactly one layer."""
+
+        def build(variant: str) -> LayerMap:
+            return {name: builder(variant)}
+
+        return cls(frozenset((name,)), build, depends_on)
+
+
+class ProviderCache:
+    """Memoize provider output by the variant attributes each provider declares.
+
+    *attributes* maps attribute names (``"base_variant"``, ``"alpha_layout"``…)
+    to functions of the variant name. Stored layers never leave the cache:
+    every call returns fresh copies, so callers may edit what they get.
+    """
+
+    def __init__(self, attributes: Mapping[str, Callable[[str], Hashable]]) -> None:
+        self._attributes = dict(attributes)
+        self._attributes.setdefault("variant", lambda variant: variant)
+        self._entries: dict[tuple[LayerProvider, tuple[Hashable, ...]], LayerMap] = {}
+        self.builds = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __call__(self, provider: LayerProvider, variant: str) -> LayerMap:
+        key = (provider, self._key(provider, variant))
+        layers = self._entries.get(key)
+        if layers is None:
+            layers = self._entries[key] = provider(variant)
+            self.builds += 1
+        else:
+            self.hits += 1
+        return {name: _copy_tree(layer) for name, layer in layers.items()}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.builds = self.hits = 0
+
+    def _key(self, provider: LayerProvider, variant: str) -> tuple[Hashable, ...]:
+        try:
+            return tuple(self._attributes[attribute](variant) for attribute in provider.depends_on)
+        except KeyError as exc:
+            msg = f"Unknown variant attribute {exc.args[0]!r}; expected one of {sorted(self._attributes)}"
+            raise ValueError(msg) from None
+
+
+def _copy_tree(obj: Any) -> Any:
+    # Layers are JSON-shaped (lists, dicts, immutable leaves); this is several
+    # times faster than copy.deepcopy, which would cost as much as a rebuild.
+    if isinstance(obj, list):
+        return [_copy_tree(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: _copy_tree(value) for key, value in obj.items()}
+    return obj
+
+
+def build_layers(
+    providers: Iterable[LayerProvider],
+    variant: str,
+    names: Iterable[str],
+    *,
+    cache: ProviderCache | None = None,
+) -> LayerMap:
+    """Return the layers called *names* for *variant*, in the order requested.
+
+    Only providers declaring a requested name run. Raises ``ValueError`` when
+    no provider declares a requested name, when a provider returns a layer it
+    did not declare, or when the providers that ran did not produce a
+    requested layer for this variant. With a *cache*, providers whose
+    declared attributes match an earlier call are not run again.
+    """
+    wanted = list(dict.fromkeys(names))
+    pending = set(wanted)
+    produced: LayerMap = {}
+    for provider in providers:
+        if provider.names.isdisjoint(pending):
+            continue
+        layers = provider(variant) if cache is None else cache(provider, variant)
+        undeclared = layers.keys() - provider.names
+        if undeclared:
+            msg = f"Layer provider returned undeclared layers {sorted(undeclared)} for variant '{variant}'"
+            raise ValueError(msg)
+        produced.update(layers)
+        pending -= provider.names
+    missing = [name for name in wanted if name not in produced]
+    if missing:
+        msg = f"No layer provider produces {missing} for variant '{variant}'"
+        raise ValueError(msg)
+    return {name: produced[name] for name in wanted}
+
+
+__all__ = ["LayerProvider", "ProviderCache", "build_layers"]
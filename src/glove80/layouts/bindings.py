@@ -0,0 +1,308 @@
+"""Deep validation of binding trees (``{"value": ..., "params": [...]}``).
+
+:class:`BindingChecker` is built once per payload. Built-in behaviors are
+checked immediately against :func:`glove80.keycodes.behaviors.behavior_catalog`
+(arity, key codes, commands, integer ranges) and key names against the known
+key set from :mod:`glove80.keycodes.core`, so every node costs a couple of
+dictionary lookups. References to the layout's own macros and hold-taps, and
+layer indices, are aggregated per name/index and resolved in :meth:`finish`,
+because layouts may list ``layers`` before ``macros`` and the streaming
+validator only sees each element once.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any
+
+from glove80.keycodes.behaviors import behavior_catalog
+from glove80.keycodes.core import is_known_key_name
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from glove80.keycodes.behaviors import BehaviorSpec, ParamSpec
+
+    from .schema import SemanticError
+
+Location = tuple[str | int, ...]
+
+MACRO_PLACEHOLDER = "MACRO_PLACEHOLDER"
+# ``Combo.layers``/``ListenerNode.layers`` entry meaning "every layer".
+ALL_LAYERS = -1
+# Top-level fields holding raw devicetree text.
+CUSTOM_TEXT_FIELDS = ("custom_defined_behaviors", "custom_devicetree")
+# Identifiers, and ``&name`` behavior references, inside devicetree text.
+IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+RAW_REFERENCE = re.compile(r"&[A-Za-z_]\w*")
+# Fields of :class:`glove80.layouts.schema.Binding`.
+_BINDING_FIELDS = frozenset(("value", "params"))
+
+
+class BindingChecker:
+    """Validate every binding tree of one layout.
+
+    Feed it the layout's behaviors with :meth:`define_macro`,
+    :meth:`define_hold_tap` and :meth:`define_custom` (in any order relative to
+    the bindings), check bindings with :meth:`check_binding` and
+    :meth:`check_behavior_name`, then call :meth:`finish` with the layer count.
+    """
+
+    def __init__(self) -> None:
+        self._catalog = behavior_catalog()
+        self._macro_arity: dict[str, int] = {}
+        self._hold_tap_bindings: dict[str, tuple[str, ...]] = {}
+        self._custom_identifiers: set[str] = set()
+        # (behavior, arity) -> [first location, uses]; arity None = name only.
+        self._user_calls: dict[tuple[str, int | None], list[Any]] = {}
+        # layer index -> [first location, uses]
+        self._layer_refs: dict[int, list[Any]] = {}
+
+    # -- layout definitions -------------------------------------------------
+    def define_macro(self, name: str, params: Sequence[str]) -> None:
+        self._macro_arity[name] = len(params)
+
+    def define_hold_tap(self, name: str, bindings: Sequence[str]) -> None:
+        self._hold_tap_bindings[name] = tuple(bindings)
+
+    def define_custom(self, text: str) -> None:
+        """Register identifiers from ``custom_defined_behaviors``/``custom_devicetree``."""
+        self._custom_identifiers.update(IDENTIFIER.findall(text))
+
+    # -- checks ----------------------------------------------------------------
+    def check_binding(self, binding: Any, location: Location) -> list[SemanticError]:
+        """Check one top-level binding tree; deferred problems surface in :meth:`finish`."""
+        if self._is_plain_valid(binding):
+            return []
+        errors: list[SemanticError] = []
+        params = self._shape(binding, location, errors)
+        if params is None:
+            return errors
+        value = binding["value"]
+        if not isinstance(value, str):
+            errors.append(((*location, "value"), f"behavior must be a string, got {value!r}"))
+            return errors
+        if any(char.isspace() for char in value):
+            # Raw devicetree text (``&mo LAYER_Lower``) is passed through verbatim.
+            return errors
+        spec = self._catalog.get(value)
+        if spec is not None:
+            self._check_builtin(spec, params, location, errors)
+        elif value.startswith("&"):
+            self._note_user_call(value, len(params), location)
+            for index, param in enumerate(params):
+                self._check_user_param(param, (*location, "params", index), errors)
+        else:
+            errors.append(((*location, "value"), f"unknown behavior '{value}'"))
+        return errors
+
+    def check_behavior_name(self, name: str, location: Location) -> list[SemanticError]:
+        """Check a bare behavior reference such as a hold-tap's ``bindings`` entry."""
+        if name not in self._catalog:
+            self._note_user_call(name, None, location)
+        return []
+
+    def finish(self, layer_count: int) -> list[SemanticError]:
+        """Resolve user-behavior references and layer indices."""
+        errors: list[SemanticError] = []
+        for (name, arity), (location, uses) in self._user_calls.items():
+            message = self._resolve_user_call(name, arity)
+            if message is not None:
+                errors.append((location, message + uses_suffix(uses)))
+        for index, (location, uses) in self._layer_refs.items():
+            if index >= layer_count:
+                errors.append(
+                    (location, f"layer index {index} is out of range ({layer_count} layers){uses_suffix(uses)}")
+                )
+        return errors
+
+    # -- helpers ---------------------------------------------------------------
+    def _is_plain_valid(self, binding: Any) -> bool:
+        """Allocation-free accept for the common shapes (``&trans``, ``&kp A``)."""
+        if type(binding) is not dict or len(binding) != 2:
+            return False
+        value = binding.get("value")
+        if type(value) is not str:
+            # Lists/dicts are unhashable; the slow path reports them by location.
+            return False
+        spec = self._catalog.get(value)
+        params = binding.get("params")
+        if spec is None or type(params) is not list or len(params) != spec.arity:
+            return False
+        for param, param_spec in zip(params, spec.params):
+            if param_spec.kind != "code" or type(param) is not dict or len(param) != 2 or param.get("params") != []:
+                return False
+            value = param.get("value")
+            if type(value) is not str or not is_known_key_name(value):
+                return False
+        return True
+
+    @staticmethod
+    def _shape(binding: Any, location: Location, errors: list[SemanticError]) -> list[Any] | None:
+        if not isinstance(binding, dict) or "value" not in binding:
+            errors.append((location, "binding must be an object with 'value' and 'params'"))
+            return None
+        for key in sorted(binding.keys() - _BINDING_FIELDS, key=str):
+            errors.append(((*location, key), "unexpected binding field"))
+        value = binding["value"]
+        if isinstance(value, bool) or not isinstance(value, (str, int)):
+            errors.append(((*location, "value"), f"binding value must be a string or integer, got {value!r}"))
+            return None
+        params = binding.get("params", [])
+        if not isinstance(params, list):
+            errors.append(((*location, "params"), "params must be a list"))
+            return None
+        return params
+
+    def _check_builtin(
+        self,
+        spec: BehaviorSpec,
+        params: list[Any],
+        location: Location,
+        errors: list[SemanticError],
+    ) -> None:
+        if len(params) != spec.arity:
+            errors.append(((*location, "params"), f"{spec.code} expects {spec.arity} parameter(s), got {len(params)}"))
+        for index, (param, param_spec) in enumerate(zip(params, spec.params)):
+            self._check_param(spec, param, param_spec, (*location, "params", index), errors)
+
+    def _check_param(
+        self,
+        spec: BehaviorSpec,
+        param: Any,
+        param_spec: ParamSpec,
+        location: Location,
+        errors: list[SemanticError],
+    ) -> None:
+        nested = self._shape(param, location, errors)
+        if nested is None:
+            return
+        value = param["value"]
+        kind = param_spec.kind
+        if value == MACRO_PLACEHOLDER and kind in ("layer", "command"):
+            # Filled in at runtime by &macro_param_* inside macros.
+            return
+        if kind == "code":
+            self._check_key_code(param, location, errors)
+        elif kind == "layer":
+            layer = _layer_index(value)
+            if layer is None:
+                errors.append(((*location, "value"), f"layer parameter must be a layer index, got {value!r}"))
+            else:
+                self._note_layer(layer, location)
+        elif kind == "command":
+            extra = spec.commands.get(value) if isinstance(value, str) else None
+            if extra is None:
+                errors.append(((*location, "value"), f"unknown {spec.code} command {value!r}"))
+            elif len(nested) > extra:
+                errors.append(((*location, "params"), f"{value} takes {extra} additional parameter(s)"))
+        elif kind == "text_command":
+            if not isinstance(value, str):
+                errors.append(((*location, "value"), f"custom behavior text must be a string, got {value!r}"))
+        elif kind == "integer":
+            if isinstance(value, bool) or not isinstance(value, int):
+                errors.append(((*location, "value"), f"{spec.code} expects an integer, got {value!r}"))
+            elif (param_spec.minimum is not None and value < param_spec.minimum) or (
+                param_spec.maximum is not None and value > param_spec.maximum
+            ):
+                errors.append(((*location, "value"), f"{value} is outside {_range(param_spec)}"))
+
+    def _check_key_code(self, param: dict[str, Any], location: Location, errors: list[SemanticError]) -> None:
+        value = param["value"]
+        if isinstance(value, int) and not isinstance(value, bool):
+            return
+        if not isinstance(value, str) or not is_known_key_name(value):
+            errors.append(((*location, "value"), f"unknown key code {value!r}"))
+        # Modifier functions wrap their key: LC(LS(A)) -> LC[LS[A]].
+        for index, inner in enumerate(param.get("params") or ()):
+            inner_location = (*location, "params", index)
+            if self._shape(inner, inner_location, errors) is not None:
+                self._check_key_code(inner, inner_location, errors)
+
+    def _check_user_param(self, param: Any, location: Location, errors: list[SemanticError]) -> None:
+        # Macro/hold-tap parameters are untyped: a layer index or a key code.
+        if self._shape(param, location, errors) is None:
+            return
+        if _layer_index(param["value"]) is None:
+            self._check_key_code(param, location, errors)
+
+    def _note_user_call(self, name: str, arity: int | None, location: Location) -> None:
+        entry = self._user_calls.get((name, arity))
+        if entry is None:
+            self._user_calls[(name, arity)] = [location, 1]
+        else:
+            entry[1] += 1
+
+    def _note_layer(self, index: int, location: Location) -> None:
+        entry = self._layer_refs.get(index)
+        if entry is None:
+            self._layer_refs[index] = [location, 1]
+        else:
+            entry[1] += 1
+
+    def _arity_of(self, name: str) -> int | None:
+        spec = self._catalog.get(name)
+        if spec is not None:
+            return spec.arity
+        return self._macro_arity.get(name)
+
+    def _resolve_user_call(self, name: str, arity: int | None) -> str | None:
+        if name in self._macro_arity:
+            expected = self._macro_arity[name]
+            if arity is not None and arity != expected:
+                return f"macro {name} expects {expected} parameter(s), got {arity}"
+            return None
+        if name in self._hold_tap_bindings:
+            # One parameter per parameterized binding, or ZMK's full two cells.
+            needed = sum(1 for inner in self._hold_tap_bindings[name] if (self._arity_of(inner) or 0) > 0)
+            if arity is not None and arity not in (needed, 2):
+                return f"hold-tap {name} expects {needed} parameter(s), got {arity}"
+            return None
+        if name.lstrip("&") in self._custom_identifiers:
+            return None
+        return f"unknown behavior '{name}' (not built in, not a macro or hold-tap of this layout)"
+
+
+def _layer_index(value: Any) -> int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value if value >= 0 else None
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def _range(spec: ParamSpec) -> str:
+    low = "-inf" if spec.minimum is None else str(spec.minimum)
+    high = "inf" if spec.maximum is None else str(spec.maximum)
+    return f"[{low}, {high}]"
+
+
+def selected_layers(layers: Any) -> list[Any] | None:
+    """Return a combo's ``layers`` list, or ``None`` when the combo is active on every layer.
+
+    ZMK treats a missing or empty list that way, and so does an entry of
+    :data:`ALL_LAYERS`.
+    """
+    if not isinstance(layers, list) or not layers or ALL_LAYERS in layers:
+        return None
+    return layers
+
+
+def uses_suffix(count: int) -> str:
+    """Return the `` (N uses)`` note for an error aggregated over *count* sites."""
+    return f" ({count} uses)" if count > 1 else ""
+
+
+__all__ = [
+    "ALL_LAYERS",
+    "CUSTOM_TEXT_FIELDS",
+    "IDENTIFIER",
+    "MACRO_PLACEHOLDER",
+    "RAW_REFERENCE",
+    "BindingChecker",
+    "Location",
+    "selected_layers",
+    "uses_suffix",
+]
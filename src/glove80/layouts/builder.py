@@ -2,40 +2,150 @@
 
 from __future__ import annotations
 
+import copy
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Literal, cast
 
 from .common import compose_layout
-from .merge import merge_components
+from .dependencies import behavior_graph
+from .merge import component_macros
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable, Mapping, Sequence
+    from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 
     from glove80.base import LayerMap
     from glove80.layouts.components import LayoutFeatureComponents
+    from glove80.layouts.dedup import LayerStore
+    from glove80.layouts.dependencies import BehaviorGraph
     from glove80.layouts.schema import Combo, HoldTap, InputListener, Macro
 
 
-def _unique_sequence(values: Iterable[str]) -> list[str]:
-    seen: set[str] = set()
-    ordered: list[str] = []
-    for value in values:
-        if value in seen:
-            continue
-        seen.add(value)
-        ordered.append(value)
-    return ordered
+class _LayerOrder:
+    """Ordered set of layer names backed by a doubly linked list keyed by name.
+
+    Membership, anchor lookup, insertion, and removal are O(1); only
+    :meth:`names` walks the whole order.
+    """
+
+    __slots__ = ("_head", "_next", "_prev", "_tail")
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self._next: dict[str, str | None] = {}
+        self._prev: dict[str, str | None] = {}
+        self._head: str | None = None
+        self._tail: str | None = None
+        for name in names:
+            if name not in self._next:
+                self._link(name, self._tail, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._next
+
+    def __len__(self) -> int:
+        return len(self._next)
+
+    def __iter__(self) -> Iterator[str]:
+        node, following = self._head, self._next
+        while node is not None:
+            yield node
+            node = following[node]
+
+    def names(self) -> list[str]:
+        return list(self)
+
+    def copy(self) -> _LayerOrder:
+        clone = _LayerOrder()
+        clone._next, clone._prev = dict(self._next), dict(self._prev)
+        clone._head, clone._tail = self._head, self._tail
+        return clone
+
+    def append(self, name: str) -> None:
+        """Add *name* at the end unless it is already ordered."""
+        if name not in self._next:
+            self._link(name, self._tail, None)
+
+    def insert(self, names: Sequence[str], *, after: str | None = None, before: str | None = None) -> None:
+        """Move *names* (in order, first occurrence wins) next to an anchor layer."""
+        anchor = after if after is not None else before
+        if anchor is None or anchor not in self._next or anchor in names:
+            msg = f"Layer '{anchor}' is not present in the order"
+            raise ValueError(msg)
+        for name in names:
+            if name in self._next:
+                self._unlink(name)
+        previous: str | None
+        following: str | None
+        if after is not None:
+            previous, following = after, self._next[after]
+        else:
+            previous, following = self._prev[anchor], anchor
+        for name in names:
+            if name not in self._next:
+                self._link(name, previous, following)
+                previous = name
+
+    def _link(self, name: str, previous: str | None, following: str | None) -> None:
+        self._prev[name], self._next[name] = previous, following
+        if previous is None:
+            self._head = name
+        else:
+            self._next[previous] = name
+        if following is None:
+            self._tail = name
+        else:
+            self._prev[following] = name
+
+    def _unlink(self, name: str) -> None:
+        previous, following = self._prev.pop(name), self._next.pop(name)
+        if previous is None:
+            self._head = following
+        else:
+            self._next[previous] = following
+        if following is None:
+            self._tail = previous
+        else:
+            self._prev[following] = previous
+
+
+_SECTION_FIELDS = ("layer_names", "layers", "macros", "hold_taps", "combos", "input_listeners")
 
 
 @dataclass
 class _Sections:
-    layer_names: list[str] = field(default_factory=list)
+    layer_names: _LayerOrder = field(default_factory=_LayerOrder)
     layers: LayerMap = field(default_factory=dict)
     macros: OrderedDict[str, "Macro"] = field(default_factory=OrderedDict)
     hold_taps: list["HoldTap"] = field(default_factory=list)
     combos: list["Combo"] = field(default_factory=list)
     input_listeners: list["InputListener"] = field(default_factory=list)
+    # Sections still shared with a fork; copied on their first write.
+    shared: set[str] = field(default_factory=set)
+
+    def fork(self) -> _Sections:
+        self.shared = set(_SECTION_FIELDS)
+        return _Sections(
+            layer_names=self.layer_names,
+            layers=self.layers,
+            macros=self.macros,
+            hold_taps=self.hold_taps,
+            combos=self.combos,
+            input_listeners=self.input_listeners,
+            shared=set(_SECTION_FIELDS),
+        )
+
+    def writable(self, name: str) -> Any:
+        """Return section *name* for mutation, copying it first if a fork shares it."""
+        value = getattr(self, name)
+        if name in self.shared:
+            self.shared.discard(name)
+            value = value.copy()
+            setattr(self, name, value)
+        return value
+
+    def replace(self, name: str, value: Any) -> None:
+        self.shared.discard(name)
+        setattr(self, name, value)
 
 
 class LayoutBuilder:
@@ -51,20 +161,42 @@ class LayoutBuilder:
         mouse_layers_provider: Callable[[str], LayerMap] | None = None,
         cursor_layers_provider: Callable[[str], LayerMap] | None = None,
         home_row_provider: Callable[[str], LayoutFeatureComponents] | None = None,
+        layer_store: LayerStore | None = None,
     ) -> None:
         self.metadata_key = metadata_key
         self.variant = variant
         self._common_fields: Mapping[str, Any] = dict(common_fields)
-        self._sections = _Sections(layer_names=_unique_sequence(layer_names or ()))
+        self._sections = _Sections(layer_names=_LayerOrder(layer_names or ()))
         self._mouse_layers_provider = mouse_layers_provider
         self._cursor_layers_provider = cursor_layers_provider
         self._home_row_provider = home_row_provider
+        # Builders sharing a store keep one list per unique layer (see glove80.layouts.dedup).
+        self._layer_store = layer_store
+
+    def fork(self, *, variant: str | None = None, metadata_key: str | None = None) -> LayoutBuilder:
+        """Return an independent builder with the same sections, in O(1).
+
+        Sections are shared copy-on-write: whichever builder writes to a
+        section first copies that section only. Layer lists are never mutated
+        by the builder, so they stay shared between the two, and ``build()``
+        hands out copies of them: editing one builder's payload leaves the
+        other's builds alone (see ``compose_layout`` for the bindings inside).
+        ``variant`` and ``metadata_key`` let a derived variant reuse a
+        sibling's base.
+        """
+        clone = copy.copy(self)
+        clone._sections = self._sections.fork()
+        if variant is not None:
+            clone.variant = variant
+        if metadata_key is not None:
+            clone.metadata_key = metadata_key
+        return clone
 
     # ------------------------------------------------------------------
     # Base section wiring
     # ------------------------------------------------------------------
     def set_layer_order(self, layer_names: Sequence[str]) -> LayoutBuilder:
-        self._sections.layer_names = _unique_sequence(layer_names)
+        self._sections.replace("layer_names", _LayerOrder(layer_names))
         return self
 
     def add_layers(
@@ -84,18 +216,20 @@ class LayoutBuilder:
             raise ValueError(msg)
 
         order = list(explicit_order or layers.keys())
+        missing = [name for name in order if name not in layers]
+        if missing:
+            msg = f"Layer '{missing[0]}' missing from provided mapping"
+            raise KeyError(msg)
+        sections = self._sections.writable("layers")
         for name in order:
-            if name not in layers:
-                msg = f"Layer '{name}' missing from provided mapping"
-                raise KeyError(msg)
-            self._sections.layers[name] = layers[name]
+            sections[name] = self._intern(layers[name])
         self._insert_layer_names(order, after=insert_after, before=insert_before)
         return self
 
     def update_layer(self, name: str, layer_data: Any) -> LayoutBuilder:
         if name not in self._sections.layer_names:
-            self._sections.layer_names.append(name)
-        self._sections.layers[name] = layer_data
+            self._sections.writable("layer_names").append(name)
+        self._sections.writable("layers")[name] = self._intern(layer_data)
         return self
 
     def add_macros(
@@ -107,7 +241,7 @@ class LayoutBuilder:
         if not macros:
             return self
 
-        existing = self._sections.macros
+        existing = self._sections.writable("macros")
         if prepend:
             # Build a new ordered dict that places the incoming macros up front.
             updated = OrderedDict()
@@ -117,7 +251,7 @@ class LayoutBuilder:
             for name, macro in existing.items():
                 if name not in updated:
                     updated[name] = macro
-            self._sections.macros = updated
+            self._sections.replace("macros", updated)
             return self
 
         for macro in macros:
@@ -126,15 +260,15 @@ class LayoutBuilder:
         return self
 
     def add_hold_taps(self, hold_taps: Sequence["HoldTap"]) -> LayoutBuilder:
-        self._sections.hold_taps.extend(hold_taps)
+        self._sections.writable("hold_taps").extend(hold_taps)
         return self
 
     def add_combos(self, combos: Sequence["Combo"]) -> LayoutBuilder:
-        self._sections.combos.extend(combos)
+        self._sections.writable("combos").extend(combos)
         return self
 
     def add_input_listeners(self, listeners: Sequence["InputListener"]) -> LayoutBuilder:
-        self._sections.input_listeners.extend(listeners)
+        self._sections.writable("input_listeners").extend(listeners)
         return self
 
     # ------------------------------------------------------------------
@@ -204,17 +338,34 @@ class LayoutBuilder:
             self._merge_feature_components(components, insert_after=anchor)
         return self
 
+    def behavior_graph(self) -> BehaviorGraph:
+        """Return the macro/hold-tap dependency graph of the sections added so far."""
+        sections = self._sections
+        names = sections.layer_names.names()
+        return behavior_graph(
+            {
+                "custom_defined_behaviors": self._common_fields.get("custom_defined_behaviors"),
+                "custom_devicetree": self._common_fields.get("custom_devicetree"),
+                "layers": [sections.layers.get(name) for name in names],
+                "macros": list(sections.macros.values()),
+                "holdTaps": sections.hold_taps,
+                "combos": sections.combos,
+                "inputListeners": sections.input_listeners,
+            }
+        )
+
     # ------------------------------------------------------------------
     # Finalization
     # ------------------------------------------------------------------
-    def build(self) -> dict[str, Any]:
+    def build(self, *, trusted: bool = False, prune_unused: bool = False) -> dict[str, Any]:
+        """Compose the payload (see ``compose_layout`` for ``trusted`` and ``prune_unused``)."""
         missing = [name for name in self._sections.layer_names if name not in self._sections.layers]
         if missing:
             raise KeyError("Cannot build layout; missing layer data for: " + ", ".join(missing))
 
         return compose_layout(
             self._common_fields,
-            layer_names=self._sections.layer_names,
+            layer_names=self._sections.layer_names.names(),
             generated_layers=self._sections.layers,
             metadata_key=self.metadata_key,
             variant=self.variant,
@@ -222,11 +373,16 @@ class LayoutBuilder:
             hold_taps=self._sections.hold_taps,
             combos=self._sections.combos,
             input_listeners=self._sections.input_listeners,
+            trusted=trusted,
+            prune_unused=prune_unused,
         )
 
     # ------------------------------------------------------------------
     # Internals
     # ------------------------------------------------------------------
+    def _intern(self, layer: Any) -> Any:
+        return layer if self._layer_store is None else self._layer_store.intern(layer)
+
     def _insert_layer_names(
         self,
         names: Sequence[str],
@@ -240,41 +396,12 @@ class LayoutBuilder:
             msg = "Specify only one of 'after' or 'before'"
             raise ValueError(msg)
 
-        names = _unique_sequence(names)
-        current = self._sections.layer_names
-
+        order = self._sections.writable("layer_names")
         if after is None and before is None:
             for name in names:
-                if name not in current:
-                    current.append(name)
-            return
-
-        filtered = [name for name in current if name not in names]
-
-        if before is not None:
-            try:
-                anchor_index = filtered.index(before)
-            except ValueError:
-                msg = f"Layer '{before}' is not present in the order"
-                raise ValueError(msg) from None
-            updated = (
-                filtered[:anchor_index] + [name for name in names if name not in filtered] + filtered[anchor_index:]
-            )
-            self._sections.layer_names = updated
+                order.append(name)
             return
-
-        if after is not None:
-            try:
-                anchor_index = filtered.index(after)
-            except ValueError:
-                msg = f"Layer '{after}' is not present in the order"
-                raise ValueError(msg) from None
-            updated = (
-                filtered[: anchor_index + 1]
-                + [name for name in names if name not in filtered]
-                + filtered[anchor_index + 1 :]
-            )
-            self._sections.layer_names = updated
+        order.insert(names, after=after, before=before)
 
     def _merge_feature_components(
         self,
@@ -283,28 +410,18 @@ class LayoutBuilder:
         insert_after: str | None = None,
         insert_before: str | None = None,
     ) -> None:
-        # Delegate merge of non-layer sections to the shared helper to
-        # maintain a single behavior surface with runtime feature application.
-        shadow_layout: dict[str, Any] = {
-            "macros": list(self._sections.macros.values()),
-            "holdTaps": list(self._sections.hold_taps),
-            "combos": list(self._sections.combos),
-            "inputListeners": list(self._sections.input_listeners),
-        }
-        merge_components(shadow_layout, components)
-
-        # Reconcile back into builder sections, preserving order.
-        updated_macros: "OrderedDict[str, Any]" = OrderedDict()
-        for macro in shadow_layout["macros"]:
-            name = _macro_name(macro)
-            updated_macros[name] = macro
-        self._sections.macros = updated_macros
-        self._sections.hold_taps = list(shadow_layout["holdTaps"])
-        self._sections.combos = list(shadow_layout["combos"])
-        self._sections.input_listeners = list(shadow_layout["inputListeners"])
+        # The macros OrderedDict is the builder's persistent name index: the
+        # shared component_macros() decides merge order and overrides, and
+        # assigning an existing name keeps its position. Other sections append.
+        macros = self._sections.writable("macros")
+        for name, macro in component_macros(components):
+            macros[name] = macro
+        self._sections.writable("hold_taps").extend(components.hold_taps)
+        self._sections.writable("combos").extend(components.combos)
+        self._sections.writable("input_listeners").extend(components.input_listeners)
 
         # Layers participate in ordered insertion; use builder's add_layers to
-        # honor anchors while still reusing the shared merge for other pieces.
+        # honor anchors.
         if components.layers:
             self.add_layers(
                 components.layers,
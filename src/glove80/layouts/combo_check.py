@@ -0,0 +1,299 @@
+"""Combo conflict checks over bitset indexes.
+
+Every combo's ``keyPositions`` becomes an 80-bit position mask and its
+``layers`` a layer mask (``-1`` or an empty list meaning every layer). Two
+further indexes map each key position and each layer to the bitset of combos
+that use it, so the combos sharing a key with combo *i* on a common layer are
+one OR/AND over at most 80 + ``len(layers)`` integers instead of a scan over
+every other combo. :func:`check_combos` reports:
+
+* duplicates — combos with the same keys, active on a common layer;
+* subsets — one combo's keys are a strict subset of another's on a common
+  layer, so the smaller chord has to wait for the larger one to time out;
+* overlaps — combos sharing some keys on a common layer;
+* combos on keys bound to a hold-tap, with the combo timeout and tapping term,
+  since the hold-tap only starts deciding once the combo has given up;
+* combos whose keys are ``&trans`` on every layer the combo is active on.
+
+Apart from big-integer ORs over the combo bitsets, work is linear in the
+layout size plus the number of pairs reported.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+from glove80.geometry import KEY_COUNT, is_valid_position
+
+from .bindings import selected_layers
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
+
+ConflictKind = Literal["duplicate", "subset", "overlap"]
+
+# ZMK's defaults for combos without ``timeout-ms`` and hold-taps without
+# ``tapping-term-ms``.
+DEFAULT_COMBO_TIMEOUT_MS = 50
+DEFAULT_TAPPING_TERM_MS = 200
+# Built-in hold-taps; layout-defined ones come from the ``holdTaps`` section.
+_BUILTIN_HOLD_TAPS = ("&mt", "&lt")
+
+
+def position_mask(positions: Iterable[Any]) -> int:
+    """Return the bitset of the valid Glove80 key positions in *positions*."""
+    mask = 0
+    for position in positions:
+        if is_valid_position(position):
+            mask |= 1 << position
+    return mask
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the indexes of the set bits of *mask*, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _layer_mask(layers: Any, layer_count: int) -> int:
+    selected = selected_layers(layers)
+    if selected is None:
+        return (1 << layer_count) - 1
+    mask = 0
+    for layer in selected:
+        if isinstance(layer, int) and not isinstance(layer, bool) and 0 <= layer < layer_count:
+            mask |= 1 << layer
+    return mask
+
+
+@dataclass(frozen=True)
+class ComboConflict:
+    """Two combos sharing keys on at least one common layer.
+
+    For ``subset`` conflicts ``first`` is the combo with fewer keys; otherwise
+    it is the one defined first.
+    """
+
+    kind: ConflictKind
+    first: int
+    second: int
+    names: tuple[str, str]
+    positions: tuple[int, ...]
+    layers: tuple[int, ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "combos": [self.first, self.second],
+            "names": list(self.names),
+            "positions": list(self.positions),
+            "layers": list(self.layers),
+        }
+
+
+@dataclass(frozen=True)
+class HoldTapOverlap:
+    """A combo using keys that a hold-tap is bound to."""
+
+    combo: int
+    name: str
+    behavior: str
+    positions: tuple[int, ...]
+    layers: tuple[int, ...]
+    timeout_ms: int
+    tapping_term_ms: int
+
+    @property
+    def swallows_tapping_term(self) -> bool:
+        """The combo timeout is at least the tapping term: a hold can fire before the combo gives up."""
+        return self.timeout_ms >= self.tapping_term_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "combo": self.combo,
+            "name": self.name,
+            "behavior": self.behavior,
+            "positions": list(self.positions),
+            "layers": list(self.layers),
+            "timeoutMs": self.timeout_ms,
+            "tappingTermMs": self.tapping_term_ms,
+            "swallowsTappingTerm": self.swallows_tapping_term,
+        }
+
+
+@dataclass(frozen=True)
+class ComboReport:
+    """Outcome of :func:`check_combos`."""
+
+    count: int
+    conflicts: tuple[ComboConflict, ...]
+    hold_taps: tuple[HoldTapOverlap, ...]
+    # (index, name) of combos whose keys are transparent on all their layers.
+    transparent: tuple[tuple[int, str], ...]
+
+    def of_kind(self, kind: ConflictKind) -> tuple[ComboConflict, ...]:
+        return tuple(conflict for conflict in self.conflicts if conflict.kind == kind)
+
+    @property
+    def duplicates(self) -> tuple[ComboConflict, ...]:
+        return self.of_kind("duplicate")
+
+    @property
+    def findings(self) -> int:
+        return len(self.conflicts) + len(self.hold_taps) + len(self.transparent)
+
+    @property
+    def ok(self) -> bool:
+        """No two combos are bound to the same chord on the same layer."""
+        return not self.duplicates
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "count": self.count,
+            "conflicts": [conflict.to_dict() for conflict in self.conflicts],
+            "holdTaps": [overlap.to_dict() for overlap in self.hold_taps],
+            "transparent": [{"combo": index, "name": name} for index, name in self.transparent],
+        }
+
+
+class _LayerIndex:
+    """Per-layer masks of transparent keys and hold-tap keys."""
+
+    def __init__(self, layers: Sequence[Any], hold_taps: Mapping[str, int]) -> None:
+        self.transparent: list[int] = []
+        self.hold_tap: list[int] = []
+        # layer -> position -> hold-tap behavior
+        self.hold_tap_at: list[dict[int, str]] = []
+        for layer in layers:
+            transparent = held = 0
+            behaviors: dict[int, str] = {}
+            for position, binding in enumerate(layer if isinstance(layer, list) else ()):
+                value = binding.get("value") if isinstance(binding, dict) else None
+                if not isinstance(value, str):
+                    continue
+                if value == "&trans":
+                    transparent |= 1 << position
+                elif value in hold_taps:
+                    held |= 1 << position
+                    behaviors[position] = value
+            self.transparent.append(transparent)
+            self.hold_tap.append(held)
+            self.hold_tap_at.append(behaviors)
+
+
+def _tapping_terms(data: Mapping[str, Any]) -> dict[str, int]:
+    terms = dict.fromkeys(_BUILTIN_HOLD_TAPS, DEFAULT_TAPPING_TERM_MS)
+    for hold_tap in data.get("holdTaps") or ():
+        if isinstance(hold_tap, dict) and isinstance(hold_tap.get("name"), str):
+            term = hold_tap.get("tappingTermMs")
+            terms[hold_tap["name"]] = term if isinstance(term, int) else DEFAULT_TAPPING_TERM_MS
+    return terms
+
+
+def _conflict_kind(a: int, b: int) -> ConflictKind:
+    if a == b:
+        return "duplicate"
+    shared = a & b
+    return "subset" if shared in (a, b) else "overlap"
+
+
+def check_combos(data: Mapping[str, Any]) -> ComboReport:
+    """Report combo conflicts in a layout payload; see the module docstring."""
+    combos = [combo for combo in data.get("combos") or () if isinstance(combo, dict)]
+    layers = data.get("layers")
+    if not isinstance(layers, list):
+        layers = []
+    layer_count = len(layers)
+    names = [str(combo.get("name", index)) for index, combo in enumerate(combos)]
+    positions = [position_mask(combo.get("keyPositions") or ()) for combo in combos]
+    active = [_layer_mask(combo.get("layers"), layer_count) for combo in combos]
+
+    # key position / layer -> bitset of the combos using it
+    by_position = [0] * KEY_COUNT
+    by_layer = [0] * layer_count
+    for index, (keys, layer_bits) in enumerate(zip(positions, active)):
+        bit = 1 << index
+        for position in iter_bits(keys):
+            by_position[position] |= bit
+        for layer in iter_bits(layer_bits):
+            by_layer[layer] |= bit
+
+    conflicts: list[ComboConflict] = []
+    for index, (keys, layer_bits) in enumerate(zip(positions, active)):
+        sharing_keys = 0
+        for position in iter_bits(keys):
+            sharing_keys |= by_position[position]
+        sharing_layers = 0
+        for layer in iter_bits(layer_bits):
+            sharing_layers |= by_layer[layer]
+        # Only pairs (index, other) with other > index, each reported once.
+        for other in iter_bits((sharing_keys & sharing_layers) >> (index + 1) << (index + 1)):
+            kind = _conflict_kind(keys, positions[other])
+            first, second = index, other
+            if kind == "subset" and keys & positions[other] != keys:
+                first, second = other, index
+            conflicts.append(
+                ComboConflict(
+                    kind=kind,
+                    first=first,
+                    second=second,
+                    names=(names[first], names[second]),
+                    positions=tuple(iter_bits(keys & positions[other])),
+                    layers=tuple(iter_bits(layer_bits & active[other])),
+                )
+            )
+
+    terms = _tapping_terms(data)
+    index_by_layer = _LayerIndex(layers, terms)
+    hold_taps: list[HoldTapOverlap] = []
+    transparent: list[tuple[int, str]] = []
+    for index, (combo, keys, layer_bits) in enumerate(zip(combos, positions, active)):
+        timeout = combo.get("timeoutMs")
+        timeout_ms = timeout if isinstance(timeout, int) else DEFAULT_COMBO_TIMEOUT_MS
+        # hold-tap behavior -> [positions mask, layers mask]
+        held: dict[str, list[int]] = {}
+        opaque_somewhere = False
+        for layer in iter_bits(layer_bits):
+            if keys & ~index_by_layer.transparent[layer]:
+                opaque_somewhere = True
+            for position in iter_bits(keys & index_by_layer.hold_tap[layer]):
+                entry = held.setdefault(index_by_layer.hold_tap_at[layer][position], [0, 0])
+                entry[0] |= 1 << position
+                entry[1] |= 1 << layer
+        if layer_bits and keys and not opaque_somewhere:
+            transparent.append((index, names[index]))
+        hold_taps.extend(
+            HoldTapOverlap(
+                combo=index,
+                name=names[index],
+                behavior=behavior,
+                positions=tuple(iter_bits(held_keys)),
+                layers=tuple(iter_bits(held_layers)),
+                timeout_ms=timeout_ms,
+                tapping_term_ms=terms[behavior],
+            )
+            for behavior, (held_keys, held_layers) in held.items()
+        )
+
+    return ComboReport(
+        count=len(combos),
+        conflicts=tuple(conflicts),
+        hold_taps=tuple(hold_taps),
+        transparent=tuple(transparent),
+    )
+
+
+__all__ = [
+    "DEFAULT_COMBO_TIMEOUT_MS",
+    "DEFAULT_TAPPING_TERM_MS",
+    "ComboConflict",
+    "ComboReport",
+    "HoldTapOverlap",
+    "check_combos",
+    "iter_bits",
+    "position_mask",
+]
@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
+import os
 from copy import deepcopy
 from typing import TYPE_CHECKING, Any
 
+from pydantic import BaseModel
+
 from glove80.base import Layer, LayerMap, resolve_layer_refs
-from glove80.layouts.schema import CommonFields as CommonFieldsModel, LayoutPayload as LayoutPayloadModel
+from glove80.layouts.dependencies import prune_unused as prune_unused_behaviors
+from glove80.layouts.schema import (
+    Combo as ComboModel,
+    CommonFields as CommonFieldsModel,
+    HoldTap as HoldTapModel,
+    InputListener as InputListenerModel,
+    LayoutPayload as LayoutPayloadModel,
+    Macro as MacroModel,
+)
 from glove80.metadata import get_variant_metadata
 
 if TYPE_CHECKING:
@@ -16,6 +27,17 @@ if TYPE_CHECKING:
 META_FIELDS = ("title", "uuid", "parent_uuid", "date", "notes", "tags")
 DEFAULT_REF_FIELDS = ("macros", "holdTaps", "combos", "inputListeners")
 ALLOW_SERIALIZED_LAYERREF = True
+# Setting this environment variable forces trusted builds back through full
+# payload validation (CI does this so the fast path can never drift).
+STRICT_BUILD_ENV = "GLOVE80_STRICT_BUILD"
+
+_SECTION_MODELS: dict[str, type[BaseModel]] = {
+    "macros": MacroModel,
+    "holdTaps": HoldTapModel,
+    "combos": ComboModel,
+    "inputListeners": InputListenerModel,
+}
+_PAYLOAD_FIELDS = tuple(LayoutPayloadModel.model_fields)
 
 BASE_COMMON_FIELDS = {
     "keyboard": "glove80",
@@ -62,8 +84,42 @@ def compose_layout(
     combos: Sequence["Combo"] | None = None,
     input_listeners: Sequence["InputListener"] | None = None,
     ref_fields: Iterable[str] | None = None,
+    trusted: bool = False,
+    prune_unused: bool = False,
 ) -> dict[str, Any]:
-    """Compose a full layout payload given common metadata and generated layers."""
+    """Compose a full layout payload given common metadata and generated layers.
+
+    ``trusted=True`` is meant for in-tree families whose sections are already
+    validated pydantic models: each section item is serialized exactly once
+    and the whole-payload ``LayoutPayload`` round trip is skipped. The result
+    is identical to the validated path, except that its binding dicts are
+    shared with the caller's layers and must be treated as read-only (layer
+    lists themselves are fresh). Set ``GLOVE80_STRICT_BUILD=1`` to force full
+    validation anyway.
+
+    ``prune_unused=True`` drops macros and hold-taps that no layer, combo,
+    input listener or custom devicetree text can reach, directly or through
+    other behaviors (see :func:`glove80.layouts.dependencies.prune_unused`).
+    """
+    if trusted and not strict_build_requested():
+        payload = _compose_trusted(
+            common_fields,
+            layer_names=layer_names,
+            generated_layers=generated_layers,
+            metadata_key=metadata_key,
+            variant=variant,
+            sections={
+                "macros": macros,
+                "holdTaps": hold_taps,
+                "combos": combos,
+                "inputListeners": input_listeners,
+            },
+            ref_fields=tuple(ref_fields or DEFAULT_REF_FIELDS),
+        )
+        if prune_unused:
+            prune_unused_behaviors(payload)
+        return payload
+
     layout = build_layout_payload(
         common_fields,
         layer_names=layer_names,
@@ -83,9 +139,83 @@ def compose_layout(
     _attach_variant_metadata(layout, variant=variant, layout_key=metadata_key)
     # Validate final payload and normalize away None values.
     validated = LayoutPayloadModel(**layout).model_dump(by_alias=True, exclude_none=True)
+    if prune_unused:
+        prune_unused_behaviors(validated)
     return validated
 
 
+def strict_build_requested() -> bool:
+    """Return True when ``GLOVE80_STRICT_BUILD`` asks for full payload validation."""
+    return os.environ.get(STRICT_BUILD_ENV, "").strip().lower() not in {"", "0", "false", "no"}
+
+
+def _compose_trusted(
+    common_fields: Mapping[str, Any],
+    *,
+    layer_names: Sequence[str],
+    generated_layers: LayerMap,
+    metadata_key: str,
+    variant: str,
+    sections: Mapping[str, Sequence[Any] | None],
+    ref_fields: Sequence[str],
+) -> dict[str, Any]:
+    """Assemble the payload without the validate-then-dump round trip.
+
+    Mirrors what ``LayoutPayload(**layout).model_dump(by_alias=True,
+    exclude_none=True)`` would produce: fields in model order and ``None``
+    values dropped. Section containers are freshly dumped and each layer list
+    is copied, so editing the payload's layers never reaches the builder (or
+    the builders sharing its layers through a fork or a layer store). The
+    80×N binding dicts inside are shared rather than copied again: replace
+    bindings in the returned layers instead of mutating them in place.
+    """
+    layer_indices = {name: idx for idx, name in enumerate(layer_names)}
+    layout: dict[str, Any] = CommonFieldsModel(**dict(common_fields)).model_dump(by_alias=True)
+    layout["layer_names"] = list(layer_names)
+    for field, model in _SECTION_MODELS.items():
+        resolver = layer_indices if field in ref_fields else None
+        layout[field] = [_serialize_section_item(item, model, resolver) for item in sections.get(field) or ()]
+    layout["layers"] = [list(layer) for layer in _assemble_layers(layer_names, generated_layers, variant=variant)]
+    meta = get_variant_metadata(variant, layout=metadata_key)
+    for field in META_FIELDS:
+        value = meta.get(field)
+        layout[field] = list(value) if isinstance(value, list) else value
+
+    return {field: layout[field] for field in _PAYLOAD_FIELDS if layout.get(field) is not None}
+
+
+def _serialize_section_item(
+    item: Any,
+    model: type[BaseModel],
+    layer_indices: dict[str, int] | None,
+) -> dict[str, Any]:
+    if isinstance(item, model):
+        datum = item.model_dump(by_alias=True, exclude_none=True)
+        return datum if layer_indices is None else _resolve_dumped_refs(datum, layer_indices)
+    # Raw dicts (or foreign models) still need one validation pass so aliases,
+    # field order, and None-stripping match the validated path.
+    if hasattr(item, "model_dump"):
+        item = item.model_dump(by_alias=True, exclude_none=True)
+    if layer_indices is not None:
+        item = _resolve_refs(item, layer_indices)
+    return model.model_validate(item).model_dump(by_alias=True, exclude_none=True)
+
+
+def _resolve_dumped_refs(obj: Any, layer_indices: dict[str, int]) -> Any:
+    """Resolve serialized ``{"name": str}`` LayerRefs in freshly dumped data, in place."""
+    if isinstance(obj, dict):
+        if ALLOW_SERIALIZED_LAYERREF and len(obj) == 1 and isinstance(obj.get("name"), str):
+            return layer_indices[obj["name"]]
+        for key, value in obj.items():
+            if isinstance(value, (dict, list)):
+                obj[key] = _resolve_dumped_refs(value, layer_indices)
+    elif isinstance(obj, list):
+        for index, value in enumerate(obj):
+            if isinstance(value, (dict, list)):
+                obj[index] = _resolve_dumped_refs(value, layer_indices)
+    return obj
+
+
 def build_common_fields(
     *,
     creator: str,
@@ -143,22 +273,22 @@ def _resolve_referenced_fields(
     to map such dicts (and any surviving LayerRef instances) to integer indices.
     """
     layer_indices = {name: idx for idx, name in enumerate(layer_names)}
+    for field in fields:
+        layout[field] = _resolve_refs(layout[field], layer_indices)
 
-    def _resolve(obj: Any) -> Any:
-        # First, resolve any real LayerRef instances
-        obj = resolve_layer_refs(obj, layer_indices)
-        # Fallback: resolve serialized LayerRef dicts of shape {"name": str}
-        if isinstance(obj, dict):
-            if ALLOW_SERIALIZED_LAYERREF and set(obj.keys()) == {"name"} and isinstance(obj.get("name"), str):
-                name = obj["name"]
-                return layer_indices[name]
-            return {k: _resolve(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [_resolve(v) for v in obj]
-        return obj
 
-    for field in fields:
-        layout[field] = _resolve(layout[field])
+def _resolve_refs(obj: Any, layer_indices: dict[str, int]) -> Any:
+    # First, resolve any real LayerRef instances
+    obj = resolve_layer_refs(obj, layer_indices)
+    # Fallback: resolve serialized LayerRef dicts of shape {"name": str}
+    if isinstance(obj, dict):
+        if ALLOW_SERIALIZED_LAYERREF and set(obj.keys()) == {"name"} and isinstance(obj.get("name"), str):
+            name = obj["name"]
+            return layer_indices[name]
+        return {k: _resolve_refs(v, layer_indices) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_resolve_refs(v, layer_indices) for v in obj]
+    return obj
 
 
 def _assemble_layers(layer_names: Sequence[str], generated_layers: LayerMap, *, variant: str) -> list[Layer]:
@@ -0,0 +1,185 @@
+"""Content-hash index over layers: duplicate reports and shared storage.
+
+Many layers are identical across variants (a family's mouse layers, the
+TailorKey Typing/Autoshift layers of the Windows and Linux variants) and
+sometimes within one layout. :func:`layer_digest` fingerprints a layer by the
+BLAKE2b hash of its compact JSON, which makes three things cheap:
+
+* :func:`find_duplicate_layers` groups identical layers within and across any
+  set of layouts;
+* :class:`LayerStore` interns layers so builders that share a store keep one
+  list per unique layer, however many variants use it;
+* :func:`pack_layouts`/:func:`unpack_layouts` serialize several layouts with
+  each unique layer stored once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from glove80.base import Layer, LayerMap
+
+_DIGEST_SIZE = 16
+
+
+def layer_digest(layer: Layer) -> str:
+    """Return a stable hex fingerprint of *layer*'s bindings."""
+    encoded = json.dumps(layer, separators=(",", ":"), ensure_ascii=False).encode()
+    return hashlib.blake2b(encoded, digest_size=_DIGEST_SIZE).hexdigest()
+
+
+class LayerStore:
+    """Intern table mapping layer content to one shared layer list.
+
+    Interned layers are shared by every builder (and payload) that uses the
+    store, so they must be treated as read-only; ``copy.deepcopy`` a payload
+    before editing its layers in place.
+    """
+
+    def __init__(self) -> None:
+        self._layers: dict[str, Layer] = {}
+        self.requests = 0
+
+    def __len__(self) -> int:
+        return len(self._layers)
+
+    def __contains__(self, digest: object) -> bool:
+        return digest in self._layers
+
+    def intern(self, layer: Layer) -> Layer:
+        """Return the stored layer equal to *layer*, storing *layer* if it is new."""
+        self.requests += 1
+        return self._layers.setdefault(layer_digest(layer), layer)
+
+    def intern_all(self, layers: LayerMap) -> LayerMap:
+        return {name: self.intern(layer) for name, layer in layers.items()}
+
+    @property
+    def hits(self) -> int:
+        """Number of :meth:`intern` calls answered by an already stored layer."""
+        return self.requests - len(self._layers)
+
+
+@dataclass(frozen=True)
+class LayerOccurrence:
+    """One layer of one layout."""
+
+    layout: str
+    index: int
+    name: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"layout": self.layout, "index": self.index, "name": self.name}
+
+
+@dataclass(frozen=True)
+class DuplicateLayers:
+    """Layers with identical bindings, in the order they were indexed."""
+
+    digest: str
+    occurrences: tuple[LayerOccurrence, ...]
+
+    @property
+    def across_layouts(self) -> bool:
+        return len({occurrence.layout for occurrence in self.occurrences}) > 1
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "digest": self.digest,
+            "across_layouts": self.across_layouts,
+            "occurrences": [occurrence.to_dict() for occurrence in self.occurrences],
+        }
+
+
+@dataclass(frozen=True)
+class LayerDedupReport:
+    """Outcome of :func:`find_duplicate_layers`."""
+
+    total: int
+    unique: int
+    duplicates: tuple[DuplicateLayers, ...]
+
+    @property
+    def within_layout(self) -> tuple[DuplicateLayers, ...]:
+        """Groups with at least two copies inside a single layout."""
+        return tuple(group for group in self.duplicates if _repeats_within(group))
+
+    @property
+    def across_layouts(self) -> tuple[DuplicateLayers, ...]:
+        return tuple(group for group in self.duplicates if group.across_layouts)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total": self.total,
+            "unique": self.unique,
+            "duplicates": [group.to_dict() for group in self.duplicates],
+        }
+
+
+def _repeats_within(group: DuplicateLayers) -> bool:
+    layouts = [occurrence.layout for occurrence in group.occurrences]
+    return len(set(layouts)) < len(layouts)
+
+
+def find_duplicate_layers(layouts: Mapping[str, Mapping[str, Any]]) -> LayerDedupReport:
+    """Group identical layers across *layouts* (label -> payload) by content hash."""
+    groups: dict[str, list[LayerOccurrence]] = {}
+    total = 0
+    for label, payload in layouts.items():
+        names = payload.get("layer_names") or ()
+        for index, layer in enumerate(payload.get("layers") or ()):
+            total += 1
+            name = names[index] if index < len(names) else str(index)
+            groups.setdefault(layer_digest(layer), []).append(LayerOccurrence(label, index, name))
+    duplicates = tuple(
+        DuplicateLayers(digest, tuple(occurrences)) for digest, occurrences in groups.items() if len(occurrences) > 1
+    )
+    return LayerDedupReport(total=total, unique=len(groups), duplicates=duplicates)
+
+
+def pack_layouts(layouts: Mapping[str, Mapping[str, Any]]) -> dict[str, Any]:
+    """Return ``{"layers": {digest: layer}, "layouts": {label: payload}}`` with layers stored once.
+
+    Each packed payload lists layer digests in place of its layers.
+    """
+    shared: dict[str, Layer] = {}
+    packed: dict[str, dict[str, Any]] = {}
+    for label, payload in layouts.items():
+        digests = []
+        for layer in payload.get("layers") or ():
+            digest = layer_digest(layer)
+            shared.setdefault(digest, layer)
+            digests.append(digest)
+        packed[label] = {**payload, "layers": digests}
+    return {"layers": shared, "layouts": packed}
+
+
+def unpack_layouts(bundle: Mapping[str, Any]) -> dict[str, dict[str, Any]]:
+    """Invert :func:`pack_layouts`; unpacked layouts share their layer lists."""
+    shared = bundle["layers"]
+    try:
+        return {
+            label: {**payload, "layers": [shared[digest] for digest in payload["layers"]]}
+            for label, payload in bundle["layouts"].items()
+        }
+    except KeyError as exc:
+        msg = f"Packed layouts reference unknown layer {exc.args[0]}"
+        raise ValueError(msg) from None
+
+
+__all__ = [
+    "DuplicateLayers",
+    "LayerDedupReport",
+    "LayerOccurrence",
+    "LayerStore",
+    "find_duplicate_layers",
+    "layer_digest",
+    "pack_layouts",
+    "unpack_layouts",
+]
@@ -0,0 +1,249 @@
+"""Dependency graph of the macros and hold-taps a layout defines.
+
+:func:`behavior_graph` walks a layout payload once and records, for every
+user-defined behavior, which other user-defined behaviors it references (a
+macro that taps a hold-tap, a hold-tap whose tap is a macro…), plus the
+*roots*: behaviors referenced from layers, combos, input listeners or the
+custom devicetree text, with the JSON Pointer of every such site. Forward and
+reverse adjacency are both stored, so "what does ``&AS_v1_TKZ`` pull in?",
+"who uses ``&HRM_left_index_v1_TKZ``?" and cycle detection are graph walks
+over dicts, not payload scans. Anything outside the transitive closure of the
+roots can never fire, which is what :func:`prune_unused` removes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+from .bindings import CUSTOM_TEXT_FIELDS, RAW_REFERENCE
+from .validation import json_pointer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+BehaviorKind = Literal["macro", "holdTap"]
+
+_SECTIONS: tuple[tuple[str, BehaviorKind], ...] = (("macros", "macro"), ("holdTaps", "holdTap"))
+
+
+def _iter_references(obj: Any) -> Iterator[str]:
+    """Yield every ``&name`` token in a binding tree, string, or nested container."""
+    if isinstance(obj, str):
+        if obj.startswith("&") and not any(char.isspace() for char in obj):
+            yield obj
+        else:
+            yield from RAW_REFERENCE.findall(obj)
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            if isinstance(value, (str, dict, list)):
+                yield from _iter_references(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            yield from _iter_references(value)
+
+
+def _as_dict(item: Any) -> Any:
+    # Builder sections still hold pydantic models.
+    if hasattr(item, "model_dump"):
+        return item.model_dump(by_alias=True, exclude_none=True)
+    return item
+
+
+def _items(data: Mapping[str, Any], key: str) -> list[tuple[int, dict[str, Any]]]:
+    section = data.get(key)
+    if not isinstance(section, list):
+        return []
+    items = ((index, _as_dict(item)) for index, item in enumerate(section))
+    return [(index, item) for index, item in items if isinstance(item, dict)]
+
+
+def _name_of(item: Any) -> Any:
+    return item.get("name") if isinstance(item, dict) else None
+
+
+@dataclass(frozen=True)
+class BehaviorGraph:
+    """Macros and hold-taps of one layout and the references between them."""
+
+    # behavior name -> section that defines it, in definition order
+    defined: Mapping[str, BehaviorKind]
+    # behavior name -> user-defined behaviors its bindings reference
+    edges: Mapping[str, frozenset[str]]
+    # behavior name -> user-defined behaviors whose bindings reference it
+    users: Mapping[str, frozenset[str]]
+    # behavior name -> JSON Pointers of the layer keys, combos, listeners and
+    # custom text fields that reference it
+    sites: Mapping[str, tuple[str, ...]]
+
+    @property
+    def roots(self) -> frozenset[str]:
+        """Behaviors referenced from layers, combos, listeners or custom text."""
+        return frozenset(self.sites)
+
+    def dependencies(self, name: str) -> frozenset[str]:
+        """Return the behaviors *name* references directly."""
+        return self.edges.get(name, frozenset())
+
+    def dependents(self, name: str) -> frozenset[str]:
+        """Return the behaviors that reference *name* directly."""
+        return self.users.get(name, frozenset())
+
+    def closure(self, names: Iterable[str]) -> frozenset[str]:
+        """Return *names* plus every user-defined behavior they reach, transitively."""
+        return self._walk(names, self.edges)
+
+    def reverse_closure(self, names: Iterable[str]) -> frozenset[str]:
+        """Return *names* plus every user-defined behavior that reaches one of them."""
+        return self._walk(names, self.users)
+
+    def reachable(self) -> frozenset[str]:
+        """Return every behavior that some key, combo or listener can trigger."""
+        return self.closure(self.sites)
+
+    def unused(self) -> tuple[str, ...]:
+        """Return the behaviors nothing can trigger, in definition order."""
+        reachable = self.reachable()
+        return tuple(name for name in self.defined if name not in reachable)
+
+    def cycles(self) -> tuple[tuple[str, ...], ...]:
+        """Return each group of behaviors that reference each other in a loop.
+
+        Groups are the strongly connected components with more than one member
+        (or a behavior that references itself), listed in definition order.
+        """
+        order = {name: position for position, name in enumerate(self.defined)}
+        groups = [
+            tuple(sorted(component, key=order.__getitem__))
+            for component in _strongly_connected(self.defined, self.edges)
+            if len(component) > 1 or component[0] in self.edges.get(component[0], ())
+        ]
+        return tuple(sorted(groups, key=lambda group: order[group[0]]))
+
+    def _walk(self, names: Iterable[str], adjacency: Mapping[str, frozenset[str]]) -> frozenset[str]:
+        seen = {name for name in names if name in self.defined}
+        stack = list(seen)
+        while stack:
+            for target in adjacency.get(stack.pop(), ()):
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return frozenset(seen)
+
+
+def _strongly_connected(nodes: Iterable[str], edges: Mapping[str, frozenset[str]]) -> list[list[str]]:
+    """Tarjan's algorithm, iterative so deep macro chains cannot hit the recursion limit."""
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    components: list[list[str]] = []
+    for start in nodes:
+        if start in index:
+            continue
+        index[start] = low[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        work: list[tuple[str, Iterator[str]]] = [(start, iter(edges.get(start, ())))]
+        while work:
+            node, targets = work[-1]
+            for target in targets:
+                if target not in index:
+                    index[target] = low[target] = len(index)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(edges.get(target, ()))))
+                    break
+                if target in on_stack:
+                    low[node] = min(low[node], index[target])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component: list[str] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def behavior_graph(data: Mapping[str, Any]) -> BehaviorGraph:
+    """Index the user-defined behaviors of a layout payload and their references.
+
+    Section items may be dicts or pydantic models, so builder sections can be
+    indexed without composing a payload first.
+    """
+    sections = {key: _items(data, key) for key in ("macros", "holdTaps", "combos", "inputListeners")}
+    defined: dict[str, BehaviorKind] = {}
+    for key, kind in _SECTIONS:
+        for _index, item in sections[key]:
+            name = item.get("name")
+            if isinstance(name, str):
+                defined.setdefault(name, kind)
+
+    edges: dict[str, frozenset[str]] = {}
+    users: dict[str, set[str]] = {}
+    for key, _kind in _SECTIONS:
+        for _index, item in sections[key]:
+            name = item.get("name")
+            if not isinstance(name, str):
+                continue
+            targets = {target for target in _iter_references(item.get("bindings")) if target in defined}
+            edges[name] = edges.get(name, frozenset()) | targets
+            for target in targets:
+                users.setdefault(target, set()).add(name)
+
+    sites: dict[str, list[str]] = {}
+
+    def add_sites(obj: Any, location: tuple[str | int, ...]) -> None:
+        for name in _iter_references(obj):
+            if name in defined:
+                pointer = json_pointer(location)
+                found = sites.setdefault(name, [])
+                if not found or found[-1] != pointer:
+                    found.append(pointer)
+
+    for key in CUSTOM_TEXT_FIELDS:
+        add_sites(data.get(key), (key,))
+    layers = data.get("layers")
+    for layer_index, layer in enumerate(layers if isinstance(layers, list) else ()):
+        for position, binding in enumerate(layer if isinstance(layer, list) else ()):
+            add_sites(binding, ("layers", layer_index, position))
+    for index, combo in sections["combos"]:
+        add_sites(combo.get("binding"), ("combos", index, "binding"))
+    for index, listener in sections["inputListeners"]:
+        add_sites(listener, ("inputListeners", index))
+
+    return BehaviorGraph(
+        defined=defined,
+        edges=edges,
+        users={name: frozenset(found) for name, found in users.items()},
+        sites={name: tuple(found) for name, found in sites.items()},
+    )
+
+
+def prune_unused(data: dict[str, Any]) -> tuple[str, ...]:
+    """Drop macros and hold-taps that nothing can trigger from *data*, in place.
+
+    Returns the removed names. A behavior survives when it is reachable from a
+    layer, combo, input listener, or the custom devicetree text, directly or
+    through other macros and hold-taps.
+    """
+    unused = behavior_graph(data).unused()
+    if not unused:
+        return ()
+    dropped = frozenset(unused)
+    for key, _kind in _SECTIONS:
+        section = data.get(key)
+        if isinstance(section, list):
+            data[key] = [item for item in section if _name_of(_as_dict(item)) not in dropped]
+    return unused
+
+
+__all__ = ["BehaviorGraph", "BehaviorKind", "behavior_graph", "prune_unused"]
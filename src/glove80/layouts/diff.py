@@ -0,0 +1,331 @@
+"""Semantic diff of two layout payloads.
+
+Pretty-printed layouts are tens of kilobytes, and one inserted layer shifts
+every index after it, so a text diff of two exports is unreadable.
+:func:`diff_layouts` compares what the layouts mean instead:
+
+* layers are matched by name and compared key by key; a removed and an added
+  layer with identical bindings are reported as a rename, and bindings that
+  pointed at the old name are not;
+* macros, hold-taps and combos are matched by name, input listeners by code;
+* layer indices (``&mo 3``, ``Combo.layers``…) are resolved to layer names
+  first, so inserting a layer does not show up as a change to every binding
+  that refers to a later one;
+* the remaining top-level fields (title, notes, devicetree text…) are
+  compared as values.
+
+Layers present in both layouts are compared whole first and only differing
+ones are walked key by key; added and removed layers are fingerprinted with
+:func:`glove80.layouts.dedup.layer_digest` to pair up renames. A diff of two
+full-size layouts takes a few milliseconds.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Literal
+
+from glove80.geometry import is_valid_position, name_for
+from glove80.keycodes.behaviors import behavior_catalog
+
+from .bindings import ALL_LAYERS
+from .dedup import layer_digest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+ChangeKind = Literal["added", "removed", "changed", "renamed"]
+
+# Named sections and the field each item is matched by.
+_SECTION_KEYS = {"macros": "name", "holdTaps": "name", "combos": "name", "inputListeners": "code"}
+# Fields compared structurally rather than as plain values.
+_STRUCTURAL_FIELDS = frozenset(("layer_names", "layers", *_SECTION_KEYS))
+
+
+@dataclass(frozen=True)
+class KeyChange:
+    """One key of one layer whose binding differs."""
+
+    layer: str
+    position: int
+    old: Any
+    new: Any
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "layer": self.layer,
+            "position": self.position,
+            "key": name_for(self.position) if is_valid_position(self.position) else None,
+            "old": self.old,
+            "new": self.new,
+        }
+
+
+@dataclass(frozen=True)
+class SectionChange:
+    """A layer, macro, hold-tap, combo or input listener that was added, removed or changed.
+
+    ``old``/``new`` hold the item with layer indices resolved to names (for
+    layers, ``None``: their key changes are listed separately). For renamed
+    layers ``name`` is the new name and ``old`` the previous one.
+    """
+
+    section: str
+    name: str
+    change: ChangeKind
+    old: Any = None
+    new: Any = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"section": self.section, "name": self.name, "change": self.change, "old": self.old, "new": self.new}
+
+
+@dataclass(frozen=True)
+class FieldChange:
+    """A top-level field whose value differs."""
+
+    field: str
+    old: Any
+    new: Any
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"field": self.field, "old": self.old, "new": self.new}
+
+
+@dataclass(frozen=True)
+class LayoutDiff:
+    """Outcome of :func:`diff_layouts`."""
+
+    keys: tuple[KeyChange, ...]
+    sections: tuple[SectionChange, ...]
+    fields: tuple[FieldChange, ...]
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.keys or self.sections or self.fields)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "changed": self.changed,
+            "keys": [change.to_dict() for change in self.keys],
+            "sections": [change.to_dict() for change in self.sections],
+            "fields": [change.to_dict() for change in self.fields],
+        }
+
+
+def binding_text(binding: Any) -> str:
+    """Render a binding tree the way the layout editor shows it: ``&kp LS(A)``."""
+    if not isinstance(binding, dict):
+        return "" if binding is None else str(binding)
+    params = binding.get("params") or ()
+    head = str(binding.get("value"))
+    if not params:
+        return head
+    return " ".join((head, *(_param_text(param) for param in params)))
+
+
+def _param_text(param: Any) -> str:
+    if not isinstance(param, dict):
+        return str(param)
+    nested = param.get("params") or ()
+    if not nested:
+        return str(param.get("value"))
+    return f"{param.get('value')}({','.join(_param_text(item) for item in nested)})"
+
+
+class _LayerResolver:
+    """Rewrite layer indices in one layout's binding trees as layer names."""
+
+    def __init__(self, data: Mapping[str, Any], renames: Mapping[str, str] | None = None) -> None:
+        renames = renames or {}
+        self.layer_names = tuple(renames.get(str(name), str(name)) for name in data.get("layer_names") or ())
+        builtin = _layer_param_indices()
+        self._layer_params = dict(builtin)
+        # A hold-tap passes its first parameter to the hold binding and its
+        # second to the tap binding (``&thumb 2 SPACE`` with ``&mo, &kp``).
+        for hold_tap in data.get("holdTaps") or ():
+            if isinstance(hold_tap, dict) and isinstance(hold_tap.get("name"), str):
+                bindings = hold_tap.get("bindings")
+                if not isinstance(bindings, list):
+                    continue
+                indices = tuple(
+                    index for index, name in enumerate(bindings) if isinstance(name, str) and 0 in builtin.get(name, ())
+                )
+                if indices:
+                    self._layer_params[hold_tap["name"]] = indices
+
+    def layer(self, value: Any) -> Any:
+        if isinstance(value, str) and value.isdigit():
+            value = int(value)
+        if isinstance(value, int) and not isinstance(value, bool) and 0 <= value < len(self.layer_names):
+            return self.layer_names[value]
+        return value
+
+    def layers(self, values: Any) -> Any:
+        if not isinstance(values, list):
+            return values
+        return ["*" if value == ALL_LAYERS else self.layer(value) for value in values]
+
+    def binding(self, binding: Any) -> Any:
+        if not isinstance(binding, dict):
+            return binding
+        params = binding.get("params")
+        if not isinstance(params, list) or not params:
+            return binding
+        value = binding.get("value")
+        layer_indices = self._layer_params.get(value, ()) if isinstance(value, str) else ()
+        resolved = []
+        for index, param in enumerate(params):
+            if index in layer_indices and isinstance(param, dict):
+                param = {**param, "value": self.layer(param.get("value"))}
+            resolved.append(self.binding(param))
+        return {**binding, "params": resolved}
+
+    def item(self, section: str, item: Any) -> Any:
+        if not isinstance(item, dict):
+            return item
+        if section == "macros":
+            return {**item, "bindings": [self.binding(binding) for binding in item.get("bindings") or ()]}
+        if section == "combos":
+            return {**item, "binding": self.binding(item.get("binding")), "layers": self.layers(item.get("layers"))}
+        if section == "inputListeners":
+            nodes = [
+                {**node, "layers": self.layers(node.get("layers"))} if isinstance(node, dict) else node
+                for node in item.get("nodes") or ()
+            ]
+            return {**item, "nodes": nodes}
+        return item
+
+
+@lru_cache(maxsize=1)
+def _layer_param_indices() -> dict[str, tuple[int, ...]]:
+    return {
+        code: tuple(index for index, param in enumerate(spec.params) if param.kind == "layer")
+        for code, spec in behavior_catalog().items()
+        if any(param.kind == "layer" for param in spec.params)
+    }
+
+
+def _layer_map(data: Mapping[str, Any]) -> dict[str, list[Any]]:
+    names = data.get("layer_names")
+    layers = data.get("layers")
+    if not isinstance(names, list) or not isinstance(layers, list):
+        return {}
+    return {str(name): layer for name, layer in zip(names, layers) if isinstance(layer, list)}
+
+
+def _diff_layer(
+    name: str, old: list[Any], new: list[Any], old_refs: _LayerResolver, new_refs: _LayerResolver
+) -> list[KeyChange]:
+    changes = []
+    for position in range(max(len(old), len(new))):
+        before = old[position] if position < len(old) else None
+        after = new[position] if position < len(new) else None
+        if before == after and old_refs.layer_names == new_refs.layer_names:
+            continue
+        before, after = old_refs.binding(before), new_refs.binding(after)
+        if before != after:
+            changes.append(KeyChange(name, position, before, after))
+    return changes
+
+
+def _match_layers(
+    old_layers: Mapping[str, list[Any]], new_layers: Mapping[str, list[Any]]
+) -> tuple[dict[str, str], list[SectionChange]]:
+    """Return renamed layers (old -> new name) and the added/removed/renamed layer changes."""
+    # digest -> removed layers with that content
+    removed: dict[str, list[str]] = {}
+    for name, layer in old_layers.items():
+        if name not in new_layers:
+            removed.setdefault(layer_digest(layer), []).append(name)
+    renames: dict[str, str] = {}
+    sections: list[SectionChange] = []
+    for name, layer in new_layers.items():
+        if name in old_layers:
+            continue
+        candidates = removed.get(layer_digest(layer))
+        if candidates:
+            previous = candidates.pop(0)
+            renames[previous] = name
+            sections.append(SectionChange("layers", name, "renamed", old=previous, new=name))
+        else:
+            sections.append(SectionChange("layers", name, "added"))
+    unmatched = {name for names in removed.values() for name in names}
+    sections.extend(SectionChange("layers", name, "removed") for name in old_layers if name in unmatched)
+    return renames, sections
+
+
+def _diff_layers(
+    old_layers: Mapping[str, list[Any]],
+    new_layers: Mapping[str, list[Any]],
+    renames: Mapping[str, str],
+    old_refs: _LayerResolver,
+    new_refs: _LayerResolver,
+) -> list[KeyChange]:
+    same_indices = old_refs.layer_names == new_refs.layer_names
+    previous_layers = {renames.get(name, name): layer for name, layer in old_layers.items()}
+    keys: list[KeyChange] = []
+    for name, layer in new_layers.items():
+        previous = previous_layers.get(name)
+        # List equality short-circuits in C on the first differing binding.
+        if previous is not None and not (same_indices and previous == layer):
+            keys.extend(_diff_layer(name, previous, layer, old_refs, new_refs))
+    return keys
+
+
+def _named_items(section: str, data: Mapping[str, Any]) -> dict[str, Any]:
+    key = _SECTION_KEYS[section]
+    items: dict[str, Any] = {}
+    for index, item in enumerate(data.get(section) or ()):
+        name = item.get(key) if isinstance(item, dict) else None
+        items.setdefault(str(name) if name is not None else f"#{index}", item)
+    return items
+
+
+def _diff_section(
+    section: str, old: Mapping[str, Any], new: Mapping[str, Any], old_refs: _LayerResolver, new_refs: _LayerResolver
+) -> Iterable[SectionChange]:
+    old_items, new_items = _named_items(section, old), _named_items(section, new)
+    for name, item in old_items.items():
+        if name not in new_items:
+            yield SectionChange(section, name, "removed", old=old_refs.item(section, item))
+    for name, item in new_items.items():
+        if name not in old_items:
+            yield SectionChange(section, name, "added", new=new_refs.item(section, item))
+            continue
+        if old_items[name] == item and old_refs.layer_names == new_refs.layer_names:
+            continue
+        before, after = old_refs.item(section, old_items[name]), new_refs.item(section, item)
+        if before != after:
+            yield SectionChange(section, name, "changed", old=before, new=after)
+
+
+def _common_order(names: Sequence[str], other: Sequence[str]) -> list[str]:
+    shared = set(other)
+    return [name for name in names if name in shared]
+
+
+def diff_layouts(old: Mapping[str, Any], new: Mapping[str, Any]) -> LayoutDiff:
+    """Compare two layout payloads by meaning; see the module docstring."""
+    old_layers, new_layers = _layer_map(old), _layer_map(new)
+    renames, sections = _match_layers(old_layers, new_layers)
+    # Old layer indices resolve to the new names of renamed layers.
+    old_refs, new_refs = _LayerResolver(old, renames), _LayerResolver(new)
+    keys = _diff_layers(old_layers, new_layers, renames, old_refs, new_refs)
+    for section in _SECTION_KEYS:
+        sections.extend(_diff_section(section, old, new, old_refs, new_refs))
+
+    fields = [
+        FieldChange(field, old.get(field), new.get(field))
+        for field in dict.fromkeys((*old, *new))
+        if field not in _STRUCTURAL_FIELDS and old.get(field) != new.get(field)
+    ]
+    if _common_order(old_refs.layer_names, new_refs.layer_names) != _common_order(
+        new_refs.layer_names, old_refs.layer_names
+    ):
+        fields.append(FieldChange("layer_names", list(old_refs.layer_names), list(new_refs.layer_names)))
+    return LayoutDiff(keys=tuple(keys), sections=tuple(sections), fields=tuple(fields))
+
+
+__all__ = ["FieldChange", "KeyChange", "LayoutDiff", "SectionChange", "binding_text", "diff_layouts"]
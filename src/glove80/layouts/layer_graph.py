@@ -0,0 +1,390 @@
+"""Which layers a layout can actually reach, and with which key presses.
+
+:func:`layer_graph` finds every layer switch in a layout payload: layer keys
+(``&mo``, ``&lt``, ``&tog``, ``&to``, ``&sl`` — any built-in behavior with a
+layer parameter), combos, hold-taps whose hold or tap binding switches
+layers, and macros that wrap a switch, including ``&macro_param_1to1``-style
+macros whose target layer is a parameter of the key that invokes them. Raw
+devicetree bindings (``&mo LAYER_Lower``) are read as well; a custom behavior
+invoked with a ``LAYER_<Name>`` argument (``&thumb LAYER_Function ESC``) is
+taken to reach that layer.
+
+The result is a directed graph over layer names rooted at layer 0, the
+default layer. :meth:`LayerGraph.paths` gives the fewest key presses (or
+chords) that reach each layer, and layers without a path are dead weight in
+the firmware's keymap. Transparent keys never add reachability (the layer
+they fall through to was itself reached first), so they are ignored.
+
+Behaviors defined in ``custom_defined_behaviors``/``custom_devicetree`` are
+not evaluated. An unreachable layer whose ``LAYER_<Name>`` define appears in
+that text is reported as *opaque* rather than dead: a custom behavior or
+devicetree combo may still switch to it.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+from glove80.keycodes.behaviors import behavior_catalog
+
+from .bindings import CUSTOM_TEXT_FIELDS, MACRO_PLACEHOLDER, selected_layers
+from .validation import json_pointer
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from .bindings import Location
+
+Trigger = Literal["key", "combo"]
+
+_RAW_INVOCATION = re.compile(r"&([A-Za-z_]\w*)([^&]*)")
+_LAYER_DEFINE = re.compile(r"\bLAYER_(\w+)")
+_MACRO_PARAM = re.compile(r"&macro_param_(\d)to(\d)")
+# Glove80 firmware behaviors that switch to a layer by its name, without a parameter.
+_NAMED_LAYER_BEHAVIORS = {"&lower": "Lower", "&magic": "Magic"}
+
+# (target layer, switching behavior, user-defined behaviors passed through)
+_Effect = tuple[str, str, tuple[str, ...]]
+
+
+@dataclass(frozen=True)
+class LayerSwitch:
+    """One binding that activates ``target`` while ``source`` is active.
+
+    ``source`` is ``None`` for combos active on every layer. ``behavior`` is
+    the built-in switch (``&mo``…) or, for raw devicetree bindings, the custom
+    behavior given the ``LAYER_<Name>`` argument; ``via`` lists the macros and
+    hold-taps in between, outermost first.
+    """
+
+    source: str | None
+    target: str
+    behavior: str
+    trigger: Trigger
+    key_positions: tuple[int, ...]
+    pointer: str
+    via: tuple[str, ...] = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "source": self.source,
+            "target": self.target,
+            "behavior": self.behavior,
+            "trigger": self.trigger,
+            "keyPositions": list(self.key_positions),
+            "pointer": self.pointer,
+            "via": list(self.via),
+        }
+
+
+@dataclass(frozen=True)
+class LayerGraph:
+    """Layer switches of one layout, rooted at its first layer."""
+
+    layer_names: tuple[str, ...]
+    switches: tuple[LayerSwitch, ...]
+    # Layers whose ``LAYER_<Name>`` define appears in the custom devicetree text.
+    custom_mentions: frozenset[str] = frozenset()
+
+    @property
+    def base(self) -> str | None:
+        return self.layer_names[0] if self.layer_names else None
+
+    def paths(self, *, combos: bool = True) -> dict[str, tuple[LayerSwitch, ...]]:
+        """Return the shortest switch sequence from the base layer to each reachable layer.
+
+        The base layer maps to ``()``. With ``combos=False`` only single keys
+        count, which is how :meth:`combo_only` finds layers a chord is needed for.
+        """
+        base = self.base
+        if base is None:
+            return {}
+        outgoing: dict[str | None, list[LayerSwitch]] = {}
+        for switch in self.switches:
+            if combos or switch.trigger == "key":
+                outgoing.setdefault(switch.source, []).append(switch)
+        everywhere = outgoing.get(None, [])
+        paths: dict[str, tuple[LayerSwitch, ...]] = {base: ()}
+        queue = deque([base])
+        while queue:
+            layer = queue.popleft()
+            for switch in (*outgoing.get(layer, ()), *everywhere):
+                if switch.target not in paths:
+                    paths[switch.target] = (*paths[layer], switch)
+                    queue.append(switch.target)
+        return paths
+
+    def reachable(self, *, combos: bool = True) -> frozenset[str]:
+        return frozenset(self.paths(combos=combos))
+
+    def unreachable(self) -> tuple[str, ...]:
+        """Return the layers no key or combo can reach, in layer order (opaque ones included)."""
+        reachable = self.reachable()
+        return tuple(name for name in self.layer_names if name not in reachable)
+
+    def dead(self) -> tuple[str, ...]:
+        """Return the unreachable layers the custom devicetree text does not mention either."""
+        return tuple(name for name in self.unreachable() if name not in self.custom_mentions)
+
+    def opaque(self) -> tuple[str, ...]:
+        """Return the unreachable layers that custom devicetree behaviors may still switch to."""
+        return tuple(name for name in self.unreachable() if name in self.custom_mentions)
+
+    def combo_only(self) -> tuple[str, ...]:
+        """Return the layers that need a combo somewhere on every path to them."""
+        with_combos = self.reachable()
+        keys_only = self.reachable(combos=False)
+        return tuple(name for name in self.layer_names if name in with_combos and name not in keys_only)
+
+    def to_dict(self) -> dict[str, Any]:
+        paths = self.paths()
+        return {
+            "base": self.base,
+            "layers": [
+                {
+                    "index": index,
+                    "name": name,
+                    "reachable": name in paths,
+                    "presses": len(paths[name]) if name in paths else None,
+                    "path": [switch.to_dict() for switch in paths.get(name, ())],
+                }
+                for index, name in enumerate(self.layer_names)
+            ],
+            "unreachable": list(self.unreachable()),
+            "dead": list(self.dead()),
+            "opaque": list(self.opaque()),
+            "combo_only": list(self.combo_only()),
+            "switches": [switch.to_dict() for switch in self.switches],
+        }
+
+    def to_dot(self, *, title: str = "layers") -> str:
+        """Render the graph in Graphviz DOT; parallel switches are merged into one edge."""
+        reachable = self.reachable()
+        opaque = set(self.opaque())
+        lines = [f"digraph {_dot_id(title)} {{", "  rankdir=LR;", "  node [shape=box];"]
+        for index, name in enumerate(self.layer_names):
+            style = ""
+            if index == 0:
+                style = ", style=bold"
+            elif name in opaque:
+                style = ", style=dashed"
+            elif name not in reachable:
+                style = ", color=red, fontcolor=red"
+            lines.append(f"  {_dot_id(name)} [label={_dot_id(f'{index}: {name}')}{style}];")
+        if any(switch.source is None for switch in self.switches):
+            lines.append('  "*" [label="any layer", shape=plaintext];')
+
+        merged: dict[tuple[str, str, Trigger], list[str]] = {}
+        for switch in self.switches:
+            key = (switch.source or "*", switch.target, switch.trigger)
+            behaviors = merged.setdefault(key, [])
+            if switch.behavior not in behaviors:
+                behaviors.append(switch.behavior)
+        for (source, target, trigger), behaviors in merged.items():
+            style = ", style=dashed" if trigger == "combo" else ""
+            label = " ".join(behaviors) + (" (combo)" if trigger == "combo" else "")
+            lines.append(f"  {_dot_id(source)} -> {_dot_id(target)} [label={_dot_id(label)}{style}];")
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+
+def _dot_id(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class _SwitchFinder:
+    """Resolve which layers a binding switches to, through macros and hold-taps."""
+
+    def __init__(self, data: Mapping[str, Any], layer_names: Sequence[str]) -> None:
+        catalog = behavior_catalog()
+        # built-in behavior -> indices of its layer parameters
+        self.layer_params = {
+            code: tuple(index for index, param in enumerate(spec.params) if param.kind == "layer")
+            for code, spec in catalog.items()
+            if any(param.kind == "layer" for param in spec.params)
+        }
+        self.layer_names = tuple(layer_names)
+        self.positions = {name: index for index, name in enumerate(layer_names)}
+        self.macros: dict[str, list[Any]] = {}
+        for macro in data.get("macros") or ():
+            if isinstance(macro, dict) and isinstance(macro.get("name"), str):
+                self.macros.setdefault(macro["name"], list(macro.get("bindings") or ()))
+        self.hold_taps: dict[str, list[Any]] = {}
+        for hold_tap in data.get("holdTaps") or ():
+            if isinstance(hold_tap, dict) and isinstance(hold_tap.get("name"), str):
+                self.hold_taps.setdefault(hold_tap["name"], list(hold_tap.get("bindings") or ()))
+        self._invoked: dict[tuple[str, tuple[Any, ...]], list[_Effect]] = {}
+        self._active: set[str] = set()
+
+    def layer(self, value: Any) -> str | None:
+        """Return the layer a parameter value names: an index, a name, or ``LAYER_<Name>``."""
+        if isinstance(value, str):
+            if value.isdigit():
+                value = int(value)
+            else:
+                name = value[len("LAYER_") :] if value.startswith("LAYER_") else value
+                return name if name in self.positions else None
+        if isinstance(value, int) and not isinstance(value, bool) and 0 <= value < len(self.layer_names):
+            return self.layer_names[value]
+        return None
+
+    def handles(self, behavior: str) -> bool:
+        """Return whether *behavior* is a layer switch or a macro/hold-tap this layout defines."""
+        return (
+            behavior in self.layer_params
+            or behavior in _NAMED_LAYER_BEHAVIORS
+            or behavior in self.macros
+            or behavior in self.hold_taps
+        )
+
+    def binding(self, binding: Any) -> list[_Effect]:
+        """Return the layer switches one binding tree performs."""
+        if not isinstance(binding, dict):
+            return []
+        value = binding.get("value")
+        params = _params(binding)
+        if isinstance(value, str) and any(char.isspace() for char in value):
+            return self.raw(value)
+        if isinstance(value, str) and self.handles(value):
+            return self.invoke(
+                value, tuple(param.get("value") if isinstance(param, dict) else param for param in params)
+            )
+        # Wrappers such as ``{"value": "Custom", "params": [{"value": "&mo LAYER_Lower"}]}``.
+        return [effect for param in params for effect in self.binding(param)]
+
+    def raw(self, text: str) -> list[_Effect]:
+        effects: list[_Effect] = []
+        for name, arguments in _RAW_INVOCATION.findall(text):
+            behavior = "&" + name
+            args = tuple(arguments.split())
+            if self.handles(behavior):
+                effects.extend(self.invoke(behavior, args))
+                continue
+            for layer_name in _LAYER_DEFINE.findall(arguments):
+                if layer_name in self.positions:
+                    effects.append((layer_name, behavior, ()))
+        return effects
+
+    def invoke(self, behavior: str, args: tuple[Any, ...]) -> list[_Effect]:
+        """Return the switches performed by calling *behavior* with *args*."""
+        named = _NAMED_LAYER_BEHAVIORS.get(behavior)
+        if named is not None:
+            return [(named, behavior, ())] if named in self.positions else []
+        indices = self.layer_params.get(behavior)
+        if indices is not None:
+            targets = (self.layer(args[index]) for index in indices if index < len(args))
+            return [(target, behavior, ()) for target in targets if target is not None]
+        if behavior not in self.macros and behavior not in self.hold_taps:
+            return []
+        try:
+            key = (behavior, args)
+            cached = self._invoked.get(key)
+        except TypeError:  # unhashable parameter values
+            key, cached = None, None
+        if cached is not None:
+            return cached
+        if behavior in self._active:
+            return []
+        self._active.add(behavior)
+        try:
+            if behavior in self.hold_taps:
+                inner = self._hold_tap(behavior, args)
+            else:
+                inner = self._macro(behavior, args)
+        finally:
+            self._active.discard(behavior)
+        effects = [(target, switch, (behavior, *via)) for target, switch, via in inner]
+        if key is not None:
+            self._invoked[key] = effects
+        return effects
+
+    def _hold_tap(self, name: str, args: tuple[Any, ...]) -> list[_Effect]:
+        # Hold binding gets the first parameter, tap binding the second.
+        effects: list[_Effect] = []
+        for index, behavior in enumerate(self.hold_taps[name]):
+            if isinstance(behavior, str):
+                effects.extend(self.invoke(behavior, args[index : index + 1]))
+        return effects
+
+    def _macro(self, name: str, args: tuple[Any, ...]) -> list[_Effect]:
+        effects: list[_Effect] = []
+        # Parameter slot of the next binding -> macro argument it receives.
+        pending: dict[int, int] = {}
+        for step in self.macros[name]:
+            value = step.get("value") if isinstance(step, dict) else None
+            if not isinstance(value, str):
+                continue
+            control = _MACRO_PARAM.fullmatch(value)
+            if control:
+                pending[int(control[2]) - 1] = int(control[1]) - 1
+                continue
+            values = []
+            for slot, param in enumerate(_params(step)):
+                param_value = param.get("value") if isinstance(param, dict) else param
+                if param_value == MACRO_PLACEHOLDER and slot in pending and pending[slot] < len(args):
+                    param_value = args[pending[slot]]
+                values.append(param_value)
+            if self.handles(value):
+                effects.extend(self.invoke(value, tuple(values)))
+            elif any(char.isspace() for char in value):
+                effects.extend(self.raw(value))
+            if not value.startswith("&macro_"):
+                pending = {}
+        return effects
+
+
+def _params(binding: Mapping[str, Any]) -> list[Any]:
+    params = binding.get("params")
+    return params if isinstance(params, list) else []
+
+
+def _combo_sources(combo: Mapping[str, Any], finder: _SwitchFinder) -> list[str | None]:
+    layers = selected_layers(combo.get("layers"))
+    if layers is None:
+        return [None]
+    sources = [finder.layer(layer) for layer in layers]
+    return list(dict.fromkeys(source for source in sources if source is not None))
+
+
+def layer_graph(data: Mapping[str, Any]) -> LayerGraph:
+    """Find every layer switch of a layout payload (see the module docstring)."""
+    layer_names = [name for name in data.get("layer_names") or () if isinstance(name, str)]
+    finder = _SwitchFinder(data, layer_names)
+    switches: list[LayerSwitch] = []
+
+    def add(effects: list[_Effect], source: str | None, trigger: Trigger, keys: tuple[int, ...], at: Location) -> None:
+        for target, behavior, via in effects:
+            switches.append(LayerSwitch(source, target, behavior, trigger, keys, json_pointer(at), via))
+
+    layers = data.get("layers")
+    for layer_index, layer in enumerate(layers if isinstance(layers, list) else ()):
+        if layer_index >= len(layer_names) or not isinstance(layer, list):
+            continue
+        for position, binding in enumerate(layer):
+            effects = finder.binding(binding)
+            if effects:
+                add(effects, layer_names[layer_index], "key", (position,), ("layers", layer_index, position))
+
+    for combo_index, combo in enumerate(data.get("combos") or ()):
+        if not isinstance(combo, dict):
+            continue
+        effects = finder.binding(combo.get("binding"))
+        if not effects:
+            continue
+        positions = combo.get("keyPositions")
+        keys = tuple(key for key in positions if isinstance(key, int)) if isinstance(positions, list) else ()
+        for source in _combo_sources(combo, finder):
+            add(effects, source, "combo", keys, ("combos", combo_index, "binding"))
+
+    mentions: set[str] = set()
+    for key in CUSTOM_TEXT_FIELDS:
+        text = data.get(key)
+        if isinstance(text, str):
+            mentions.update(name for name in _LAYER_DEFINE.findall(text) if name in finder.positions)
+    return LayerGraph(layer_names=tuple(layer_names), switches=tuple(switches), custom_mentions=frozenset(mentions))
+
+
+__all__ = ["LayerGraph", "LayerSwitch", "Trigger", "layer_graph"]
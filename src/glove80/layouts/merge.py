@@ -1,7 +1,10 @@
-"""Shared logic for merging feature components into a layout dict.
+"""Merge feature components into a layout dict.
 
-This centralizes the behavior used by both the builder and the runtime
-``features.apply_feature`` helper so they cannot drift.
+:class:`LayoutMerger` and :func:`merge_components` serve the runtime
+``features.apply_feature``/``apply_features`` helpers, which work on payload
+dicts. ``LayoutBuilder`` keeps its sections in its own structures and does not
+go through them; the two paths share only :func:`component_macros`, which
+fixes the order in which feature macros are applied and override each other.
 """
 
 from __future__ import annotations
@@ -11,7 +14,7 @@ from typing import TYPE_CHECKING, Any, cast
 from .components import LayoutFeatureComponents
 
 if TYPE_CHECKING:
-    from collections.abc import MutableSequence
+    from collections.abc import Iterator, MutableSequence
 
 
 def _ensure_section(layout: dict[str, Any], key: str) -> MutableSequence[Any]:
@@ -31,64 +34,117 @@ def _to_dict(obj: Any) -> Any:
     return obj
 
 
-def merge_components(layout: dict[str, Any], components: LayoutFeatureComponents) -> None:
-    """Mutate ``layout`` in-place by appending/overriding ``components``.
+def _name_of(item: Any) -> Any:
+    if isinstance(item, dict):
+        return item.get("name")
+    return getattr(item, "name", None)
 
-    The function expects standard Glove80 layout sections. If the ``layers``
-    fields (``layer_names`` and ``layers``) are present, they will be updated;
-    otherwise, layer merging is skipped.
-    """
 
-    # ------------------------- macros (ordered by name) -------------------------
-    existing_macros = [_to_dict(macro) for macro in list(_ensure_section(layout, "macros"))]
-    macros_by_name = {
-        macro.get("name"): macro for macro in existing_macros if isinstance(macro, dict) and "name" in macro
-    }
-    macro_order = [macro.get("name") for macro in existing_macros if isinstance(macro, dict) and "name" in macro]
+def component_macros(components: LayoutFeatureComponents) -> Iterator[tuple[str, Any]]:
+    """Yield ``(name, macro dict)`` for every macro of *components*, in merge order.
 
-    def _set_macro(macro_obj: Any) -> None:
-        macro_dict = _to_dict(macro_obj)
+    Later entries override earlier ones with the same name: ``macros``, then
+    ``macro_overrides``, then ``macros_by_name``.
+    """
+    for macro in (*components.macros, *components.macro_overrides.values()):
+        macro_dict = _to_dict(macro)
         name = macro_dict.get("name")
         if not isinstance(name, str):
             msg = "Feature macros must include a 'name'"
             raise KeyError(msg)
-        macros_by_name[name] = macro_dict
-        if name not in macro_order:
-            macro_order.append(name)
-
-    for macro in components.macros:
-        _set_macro(macro)
-    for macro in components.macro_overrides.values():
-        _set_macro(macro)
-    if components.macros_by_name:
-        for name, macro in components.macros_by_name.items():
-            # Ensure name coherence even if caller omitted 'name' inside dict
-            macro_dict = _to_dict(macro)
-            if isinstance(macro_dict, dict):
-                macro_dict.setdefault("name", name)
-            macros_by_name[name] = macro_dict  # override wins
-            if name not in macro_order:
-                macro_order.append(name)
-
-    layout["macros"] = [macros_by_name[name] for name in macro_order]
+        yield name, macro_dict
+    for name, macro in (components.macros_by_name or {}).items():
+        macro_dict = _to_dict(macro)
+        # Ensure name coherence even if caller omitted 'name' inside dict
+        if isinstance(macro_dict, dict):
+            macro_dict.setdefault("name", name)
+        yield name, macro_dict
+
+
+class LayoutMerger:
+    """Merge feature components into one layout dict, keeping name indexes between merges.
+
+    Creating the merger normalizes the layout the way a one-shot merge always
+    has: existing macros are converted to dicts in a fresh ``macros`` list
+    (unnamed ones are dropped, a repeated name keeps its first position) and
+    ``layers`` is replaced by a fresh list, so lists the caller still holds
+    are left alone. The macro and layer name -> position indexes are built at
+    the same time, so every further :meth:`merge` costs O(size of the
+    feature) instead of O(size of the layout). The indexes assume the merger
+    is the only writer of ``macros``, ``layer_names`` and ``layers`` while it
+    is in use.
+    """
 
-    # ---------------- holdTaps / combos / inputListeners ----------------
-    _ensure_section(layout, "holdTaps").extend(_to_dict(x) for x in components.hold_taps)
-    _ensure_section(layout, "combos").extend(_to_dict(x) for x in components.combos)
-    _ensure_section(layout, "inputListeners").extend(_to_dict(x) for x in components.input_listeners)
+    def __init__(self, layout: dict[str, Any]) -> None:
+        self.layout = layout
+        self._macro_positions: dict[str, int] = {}
+        macros: list[Any] = []
+        for macro in _ensure_section(layout, "macros"):
+            macro_dict = _to_dict(macro)
+            name = macro_dict.get("name") if isinstance(macro_dict, dict) else None
+            if not isinstance(name, str):
+                continue
+            position = self._macro_positions.setdefault(name, len(macros))
+            if position == len(macros):
+                macros.append(macro_dict)
+            else:
+                macros[position] = macro_dict
+        layout["macros"] = macros
+
+        self._layer_positions: dict[str, int] = {}
+        if "layer_names" in layout and "layers" in layout:
+            layout["layers"] = list(layout["layers"])
+            for position, name in enumerate(layout["layer_names"]):
+                self._layer_positions.setdefault(name, position)
+
+    def merge(self, components: LayoutFeatureComponents) -> None:
+        """Append or override ``components`` in the layout, in place."""
+        macros = _ensure_section(self.layout, "macros")
+        hold_taps = _ensure_section(self.layout, "holdTaps")
+        combos = _ensure_section(self.layout, "combos")
+        listeners = _ensure_section(self.layout, "inputListeners")
+
+        # ------------------------- macros (ordered by name) -------------------------
+        positions = self._macro_positions
+        for name, macro in component_macros(components):
+            position = positions.get(name)
+            if position is None:
+                positions[name] = len(macros)
+                macros.append(macro)
+            else:
+                macros[position] = macro
+
+        # ---------------- holdTaps / combos / inputListeners ----------------
+        hold_taps.extend(_to_dict(x) for x in components.hold_taps)
+        combos.extend(_to_dict(x) for x in components.combos)
+        listeners.extend(_to_dict(x) for x in components.input_listeners)
+
+        # --------------------------------- layers ----------------------------------
+        if components.layers and "layer_names" in self.layout and "layers" in self.layout:
+            layer_names = cast("MutableSequence[str]", self.layout["layer_names"])
+            layers = cast("MutableSequence[Any]", self.layout["layers"])
+            positions = self._layer_positions
+            for name, layer in components.layers.items():
+                position = positions.get(name)
+                if position is None:
+                    positions[name] = len(layer_names)
+                    layer_names.append(name)
+                    layers.append(_to_dict(layer))
+                else:
+                    layers[position] = _to_dict(layer)
 
-    # --------------------------------- layers ----------------------------------
-    if "layer_names" in layout and "layers" in layout:
-        layer_names = cast("MutableSequence[str]", layout["layer_names"])
-        ordered_layers = cast("MutableSequence[Any]", layout["layers"])
-        layers_by_name: dict[str, Any] = dict(zip(layer_names, ordered_layers, strict=False))
 
-        for name, layer in components.layers.items():
-            if name not in layers_by_name:
-                layer_names.append(name)
-            layers_by_name[name] = _to_dict(layer)
+def merge_components(layout: dict[str, Any], components: LayoutFeatureComponents) -> None:
+    """Mutate ``layout`` in-place by appending/overriding ``components``.
 
-        layout["layers"] = [layers_by_name[name] for name in layer_names]
+    The function expects standard Glove80 layout sections. If the ``layers``
+    fields (``layer_names`` and ``layers``) are present, they will be updated;
+    otherwise, layer merging is skipped. Each call indexes the whole layout
+    once; to merge several features, keep one :class:`LayoutMerger` for the
+    layout (as :func:`glove80.features.apply_features` does) so only the first
+    pays for it.
+    """
+    LayoutMerger(layout).merge(components)
 
 
-__all__ = ["merge_components"]
+__all__ = ["LayoutMerger", "component_macros", "merge_components"]
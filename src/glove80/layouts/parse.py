@@ -2,18 +2,25 @@
 
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Mapping, Union
+
+from glove80.geometry import KEY_COUNT
 
 from .schema import Combo, HoldTap, InputListener, LayoutPayload, Macro
 
+# ``(value, params)``: ``&kp LC(A)`` decodes to ``("&kp", (("LC", (("A", ()),)),))``.
+CompactBinding = tuple[Union[str, int], tuple["CompactBinding", ...]]
+CompactLayer = tuple[CompactBinding, ...]
+
 
 def parse_typed_sections(
     json_data: Mapping[str, Any],
 ) -> tuple[LayoutPayload, list[Macro], list[HoldTap], list[Combo], list[InputListener]]:
     """Parse an existing layout JSON into typed models.
 
-    Returns a tuple of the full, validated :class:`LayoutPayload` and the
-    section lists as strongly-typed Pydantic models.
+    Returns a tuple of the full, validated :class:`LayoutPayload` (layers as
+    :class:`~glove80.layouts.schema.Binding` models) and the section lists as
+    strongly-typed Pydantic models.
     """
     payload = LayoutPayload.model_validate(dict(json_data))
     macros: list[Macro] = [m if isinstance(m, Macro) else Macro.model_validate(m) for m in payload.macros]
@@ -26,4 +33,67 @@ def parse_typed_sections(
     return (payload, macros, hold_taps, combos, listeners)
 
 
-__all__ = ["parse_typed_sections"]
+def decode_binding(binding: Any) -> CompactBinding:
+    """Decode one binding dict into nested ``(value, params)`` tuples.
+
+    Accepts exactly what :class:`~glove80.layouts.schema.Binding` accepts and
+    raises ``ValueError`` otherwise, without going through pydantic.
+    """
+    if type(binding) is not dict:
+        msg = f"binding must be an object, got {type(binding).__name__}"
+        raise ValueError(msg)
+    value = binding.get("value")
+    if type(value) is not str and type(value) is not int:
+        msg = f"binding value must be a string or integer, got {value!r}"
+        raise ValueError(msg)
+    has_params = "params" in binding
+    if len(binding) != has_params + 1:
+        msg = f"unexpected binding fields: {sorted(binding.keys() - {'value', 'params'})}"
+        raise ValueError(msg)
+    params = binding["params"] if has_params else []
+    if type(params) is not list:
+        msg = "binding params must be a list"
+        raise ValueError(msg)
+    if not params:
+        return (value, ())
+    return (value, tuple([decode_binding(param) for param in params]))
+
+
+def encode_binding(binding: CompactBinding) -> dict[str, Any]:
+    """Turn a :func:`decode_binding` tuple back into its JSON dict."""
+    value, params = binding
+    return {"value": value, "params": [encode_binding(param) for param in params]}
+
+
+def parse_compact_layers(json_data: Mapping[str, Any]) -> tuple[CompactLayer, ...]:
+    """Decode ``layers`` into tuples for read-only workloads, skipping pydantic.
+
+    Checks the same layer invariants as :class:`LayoutPayload` (one layer per
+    name, 80 bindings each, well-formed bindings) and returns immutable,
+    hashable tuples that are cheap to compare, hash, and cache.
+    """
+    layers = json_data.get("layers")
+    names = json_data.get("layer_names")
+    if not isinstance(layers, list) or not isinstance(names, list):
+        msg = "layout needs 'layers' and 'layer_names' lists"
+        raise ValueError(msg)
+    if len(layers) != len(names):
+        msg = "layers length must match layer_names length"
+        raise ValueError(msg)
+    decoded: list[CompactLayer] = []
+    for layer in layers:
+        if type(layer) is not list or len(layer) != KEY_COUNT:
+            msg = f"each layer must have exactly {KEY_COUNT} key entries"
+            raise ValueError(msg)
+        decoded.append(tuple([decode_binding(binding) for binding in layer]))
+    return tuple(decoded)
+
+
+__all__ = [
+    "CompactBinding",
+    "CompactLayer",
+    "decode_binding",
+    "encode_binding",
+    "parse_compact_layers",
+    "parse_typed_sections",
+]
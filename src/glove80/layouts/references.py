@@ -0,0 +1,233 @@
+"""Cross-reference integrity checks for a layout payload.
+
+:func:`check_references` walks a layout once, indexing the macros and hold-taps
+it defines and every place they (and layer indices) are referenced, then
+reports the references that firmware builds would trip over:
+
+* behaviors named in a binding, a hold-tap's ``bindings`` or raw devicetree
+  text (``&my_macro 1``) that are neither built in nor defined by the layout;
+* ``Combo.layers``, ``ListenerNode.layers`` (where ``-1`` means every layer)
+  and layer parameters of built-in behaviors (``&mo 7``) that point past the
+  last layer;
+* ``holdTriggerKeyPositions`` that are not keys of the Glove80, are listed
+  twice, or include a key the hold-tap itself is bound to.
+
+Macros and hold-taps that nothing references are listed separately; they are
+harmless but usually leftovers. Every index is a dict or set, so the whole
+check is linear in the size of the payload. The payload is expected to have
+passed ``glove80 validate``; malformed sections are skipped, not reported.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from glove80.geometry import is_valid_position, name_for
+from glove80.keycodes.behaviors import behavior_catalog
+
+from .bindings import ALL_LAYERS, CUSTOM_TEXT_FIELDS, IDENTIFIER, RAW_REFERENCE, uses_suffix
+from .validation import LayoutError, json_pointer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from glove80.keycodes.behaviors import BehaviorSpec
+
+    from .bindings import Location
+
+
+@dataclass(frozen=True)
+class ReferenceReport:
+    """Outcome of :func:`check_references`."""
+
+    errors: tuple[LayoutError, ...]
+    # Macros and hold-taps that no binding, hold-tap or devicetree text uses.
+    unused: tuple[str, ...]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "errors": [error.to_dict() for error in self.errors],
+            "unused": list(self.unused),
+        }
+
+
+class _ReferenceIndex:
+    def __init__(self) -> None:
+        self._catalog = behavior_catalog()
+        # behavior name -> location of its definition
+        self.defined: dict[str, Location] = {}
+        self.custom_identifiers: set[str] = set()
+        # behavior name -> [first location, uses]
+        self.uses: dict[str, list[Any]] = {}
+        # layer index -> [first location, uses]
+        self.layer_refs: dict[int, list[Any]] = {}
+        # behavior name -> key positions it is bound to on any layer
+        self.bound_at: dict[str, set[int]] = {}
+        self.errors: list[LayoutError] = []
+
+    def add_error(self, location: Location, message: str) -> None:
+        self.errors.append(LayoutError(json_pointer(location), message))
+
+    def define(self, name: Any, location: Location) -> None:
+        if not isinstance(name, str):
+            return
+        if name in self.defined:
+            first = json_pointer(self.defined[name])
+            self.add_error(location, f"behavior {name} is already defined at {first}")
+            return
+        self.defined[name] = location
+
+    def use(self, name: str, location: Location) -> None:
+        if name in self._catalog:
+            return
+        entry = self.uses.get(name)
+        if entry is None:
+            self.uses[name] = [location, 1]
+        else:
+            entry[1] += 1
+
+    def use_layer(self, index: Any, location: Location, *, wildcard: bool = False) -> None:
+        if isinstance(index, bool) or (wildcard and index == ALL_LAYERS):
+            return
+        if isinstance(index, str) and index.isdigit():
+            index = int(index)
+        if not isinstance(index, int):
+            return
+        entry = self.layer_refs.get(index)
+        if entry is None:
+            self.layer_refs[index] = [location, 1]
+        else:
+            entry[1] += 1
+
+    def walk(self, binding: Any, location: Location) -> None:
+        """Record every behavior and layer referenced by one binding tree."""
+        if not isinstance(binding, dict):
+            return
+        value = binding.get("value")
+        params = binding.get("params")
+        if not isinstance(params, list):
+            params = []
+        if isinstance(value, str):
+            if any(char.isspace() for char in value):
+                for name in RAW_REFERENCE.findall(value):
+                    self.use(name, location)
+            elif value.startswith("&"):
+                spec = self._catalog.get(value)
+                if spec is None:
+                    self.use(value, location)
+                else:
+                    self._walk_layer_params(spec, params, location)
+        for index, param in enumerate(params):
+            self.walk(param, (*location, "params", index))
+
+    def _walk_layer_params(self, spec: BehaviorSpec, params: list[Any], location: Location) -> None:
+        for index, (param, param_spec) in enumerate(zip(params, spec.params)):
+            if param_spec.kind == "layer" and isinstance(param, dict):
+                self.use_layer(param.get("value"), (*location, "params", index))
+
+
+def _items(data: Mapping[str, Any], key: str) -> Iterable[tuple[int, dict[str, Any]]]:
+    section = data.get(key)
+    if not isinstance(section, list):
+        return ()
+    return ((index, item) for index, item in enumerate(section) if isinstance(item, dict))
+
+
+def _index_payload(data: Mapping[str, Any]) -> _ReferenceIndex:
+    index = _ReferenceIndex()
+    for key in CUSTOM_TEXT_FIELDS:
+        text = data.get(key)
+        if isinstance(text, str) and text:
+            index.custom_identifiers.update(IDENTIFIER.findall(text))
+            for name in RAW_REFERENCE.findall(text):
+                index.use(name, (key,))
+
+    layers = data.get("layers")
+    for layer_index, layer in enumerate(layers if isinstance(layers, list) else ()):
+        if not isinstance(layer, list):
+            continue
+        for position, binding in enumerate(layer):
+            index.walk(binding, ("layers", layer_index, position))
+            value = binding.get("value") if isinstance(binding, dict) else None
+            if isinstance(value, str) and value.startswith("&"):
+                index.bound_at.setdefault(value, set()).add(position)
+
+    for item_index, macro in _items(data, "macros"):
+        index.define(macro.get("name"), ("macros", item_index, "name"))
+        for position, binding in enumerate(macro.get("bindings") or ()):
+            index.walk(binding, ("macros", item_index, "bindings", position))
+
+    for item_index, hold_tap in _items(data, "holdTaps"):
+        index.define(hold_tap.get("name"), ("holdTaps", item_index, "name"))
+        for position, name in enumerate(hold_tap.get("bindings") or ()):
+            if isinstance(name, str):
+                index.use(name, ("holdTaps", item_index, "bindings", position))
+
+    for item_index, combo in _items(data, "combos"):
+        index.walk(combo.get("binding"), ("combos", item_index, "binding"))
+        for position, layer in enumerate(combo.get("layers") or ()):
+            index.use_layer(layer, ("combos", item_index, "layers", position), wildcard=True)
+
+    for item_index, listener in _items(data, "inputListeners"):
+        for node_index, node in enumerate(listener.get("nodes") or ()):
+            if not isinstance(node, dict):
+                continue
+            for position, layer in enumerate(node.get("layers") or ()):
+                location = ("inputListeners", item_index, "nodes", node_index, "layers", position)
+                index.use_layer(layer, location, wildcard=True)
+    return index
+
+
+def _check_hold_trigger_positions(data: Mapping[str, Any], index: _ReferenceIndex) -> None:
+    for item_index, hold_tap in _items(data, "holdTaps"):
+        positions = hold_tap.get("holdTriggerKeyPositions")
+        if not isinstance(positions, list):
+            continue
+        location = ("holdTaps", item_index, "holdTriggerKeyPositions")
+        bound_at = index.bound_at.get(hold_tap.get("name"), set())  # type: ignore[arg-type]
+        seen: set[int] = set()
+        for position_index, position in enumerate(positions):
+            if not is_valid_position(position):
+                index.add_error((*location, position_index), f"{position!r} is not a Glove80 key position")
+            elif position in seen:
+                index.add_error((*location, position_index), f"key position {position} is listed more than once")
+            else:
+                seen.add(position)
+                if position in bound_at:
+                    index.add_error(
+                        (*location, position_index),
+                        f"hold-tap {hold_tap.get('name')} is itself bound to key {position} ({name_for(position)})",
+                    )
+
+
+def check_references(data: Mapping[str, Any]) -> ReferenceReport:
+    """Check that every behavior and layer a layout references exists.
+
+    Dangling behaviors and layer indices are reported once, at their first
+    use, with the number of further uses; see the module docstring for the
+    full list of checks.
+    """
+    index = _index_payload(data)
+
+    for name, (location, uses) in index.uses.items():
+        if name not in index.defined and name.lstrip("&") not in index.custom_identifiers:
+            index.add_error(location, f"behavior {name} is not built in or defined by this layout{uses_suffix(uses)}")
+
+    layer_names = data.get("layer_names")
+    layer_count = len(layer_names) if isinstance(layer_names, list) else 0
+    for layer, (location, uses) in index.layer_refs.items():
+        if not 0 <= layer < layer_count:
+            index.add_error(location, f"layer index {layer} is out of range ({layer_count} layers){uses_suffix(uses)}")
+
+    _check_hold_trigger_positions(data, index)
+    unused = tuple(name for name in index.defined if name not in index.uses)
+    return ReferenceReport(errors=tuple(index.errors), unused=unused)
+
+
+__all__ = ["ALL_LAYERS", "ReferenceReport", "check_references"]
@@ -9,9 +9,40 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional, Union, Literal
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, AliasChoices
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator, AliasChoices
 
 from glove80.base import LayerRef
+from glove80.geometry import KEY_COUNT, is_valid_position
+
+# (location, message) pairs reported by the ``semantic_errors`` methods; the
+# location is relative to the model and uses the JSON field names.
+SemanticError = tuple[tuple[Union[str, int], ...], str]
+
+
+class Binding(BaseModel):
+    """One key binding: a behavior or key ``value`` and its nested ``params``.
+
+    ``&kp LC(A)`` is ``Binding(value="&kp", params=[Binding(value="LC",
+    params=[Binding(value="A")])])``. Strict, so JSON booleans are not read as
+    integer parameters.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True, strict=True)
+
+    value: Union[str, int]
+    params: List["Binding"] = Field(default_factory=list)
+
+
+Binding.model_rebuild()
+
+# Built once at import; validating a whole layer through one adapter keeps the
+# per-binding cost inside pydantic-core.
+_LAYER_ADAPTER: TypeAdapter[List[Binding]] = TypeAdapter(List[Binding])
+
+
+def validate_layer(value: Any) -> List[Binding]:
+    """Validate one layer (a list of binding dicts) into :class:`Binding` models."""
+    return _LAYER_ADAPTER.validate_python(value)
 
 
 class Macro(BaseModel):
@@ -84,18 +115,25 @@ class HoldTap(BaseModel):
     @classmethod
     def model_validate(cls, obj: Any, *args: Any, **kwargs: Any) -> "HoldTap":
         inst = super().model_validate(obj, *args, **kwargs)
-        d = inst.model_dump()
-        for k in ("tappingTermMs", "quickTapMs", "requirePriorIdleMs"):
-            if d.get(k) is not None and d[k] < 0:
-                raise ValueError(f"{k} must be non-negative")
-        if d.get("holdTriggerKeyPositions"):
-            for pos in d["holdTriggerKeyPositions"]:
-                if not (0 <= pos <= 79):
-                    raise ValueError("holdTriggerKeyPositions must be within 0..79")
+        errors = inst.semantic_errors()
+        if errors:
+            raise ValueError(errors[0][1])
         return inst
 
+    def semantic_errors(self) -> List[SemanticError]:
+        """Return every check beyond the field types, rather than just the first."""
+        errors: List[SemanticError] = []
+        for k in ("tappingTermMs", "quickTapMs", "requirePriorIdleMs"):
+            value = getattr(self, k)
+            if value is not None and value < 0:
+                errors.append(((k,), f"{k} must be non-negative"))
+        for index, pos in enumerate(self.holdTriggerKeyPositions or ()):
+            if not is_valid_position(pos):
+                errors.append((("holdTriggerKeyPositions", index), "holdTriggerKeyPositions must be within 0..79"))
+        return errors
 
-__all__ = ["Macro", "HoldTap"]
+
+__all__ = ["Binding", "Macro", "HoldTap", "SemanticError", "validate_layer"]
 
 
 class Combo(BaseModel):
@@ -125,7 +163,7 @@ class Combo(BaseModel):
     @classmethod
     def _validate_key_positions(cls, v: List[int]) -> List[int]:
         for pos in v:
-            if not (0 <= pos <= 79):
+            if not is_valid_position(pos):
                 raise ValueError("keyPositions must be within 0..79")
         if not v:
             raise ValueError("keyPositions cannot be empty")
@@ -160,10 +198,16 @@ class ListenerNode(BaseModel):
     @classmethod
     def model_validate(cls, obj: Any, *args: Any, **kwargs: Any) -> "ListenerNode":
         inst = super().model_validate(obj, *args, **kwargs)
-        if not inst.layers:
-            raise ValueError("listener node layers cannot be empty")
+        errors = inst.semantic_errors()
+        if errors:
+            raise ValueError(errors[0][1])
         return inst
 
+    def semantic_errors(self) -> List[SemanticError]:
+        if not self.layers:
+            return [(("layers",), "listener node layers cannot be empty")]
+        return []
+
 
 class InputListener(BaseModel):
     model_config = ConfigDict(extra="forbid", frozen=True)
@@ -172,6 +216,13 @@ class InputListener(BaseModel):
     inputProcessors: List[InputProcessor] = Field(default_factory=list)
     nodes: List[ListenerNode]
 
+    def semantic_errors(self) -> List[SemanticError]:
+        return [
+            (("nodes", index, *loc), message)
+            for index, node in enumerate(self.nodes)
+            for loc, message in node.semantic_errors()
+        ]
+
 
 __all__ += ["InputProcessor", "ListenerNode", "InputListener"]
 
@@ -225,7 +276,7 @@ class LayoutPayload(BaseModel):
     holdTaps: List[HoldTap]
     combos: List[Combo]
     inputListeners: List[InputListener]
-    layers: List[List[Dict[str, Any]]]
+    layers: List[List[Binding]]
 
     # Attached metadata (optional)
     title: Optional[str] = None
@@ -238,14 +289,23 @@ class LayoutPayload(BaseModel):
     @classmethod
     def model_validate(cls, obj: Any, *args: Any, **kwargs: Any) -> "LayoutPayload":
         inst = super().model_validate(obj, *args, **kwargs)
-        # Length checks
-        if len(inst.layer_names) != len(inst.layers):
-            raise ValueError("layers length must match layer_names length")
-        # Verify each layer has 80 entries
-        for layer in inst.layers:
-            if len(layer) != 80:
-                raise ValueError("each layer must have exactly 80 key entries")
+        errors = inst.semantic_errors()
+        if errors:
+            raise ValueError(errors[0][1])
         return inst
 
+    def semantic_errors(self) -> List[SemanticError]:
+        """Length checks plus the checks of nested hold-taps and listeners."""
+        errors: List[SemanticError] = []
+        if len(self.layer_names) != len(self.layers):
+            errors.append((("layers",), "layers length must match layer_names length"))
+        for index, layer in enumerate(self.layers):
+            if len(layer) != KEY_COUNT:
+                errors.append((("layers", index), "each layer must have exactly 80 key entries"))
+        for field_name in ("holdTaps", "inputListeners"):
+            for index, item in enumerate(getattr(self, field_name)):
+                errors.extend(((field_name, index, *loc), message) for loc, message in item.semantic_errors())
+        return errors
+
 
 __all__.append("LayoutPayload")
@@ -0,0 +1,166 @@
+"""Incremental reader for the top level of a layout JSON document.
+
+Layouts are a single JSON object whose bulky members are arrays (``layers``,
+``macros``, ``combos``…). :func:`iter_top_level` walks that object with a
+fixed-size read buffer and yields array members one element at a time, so a
+stress layout with hundreds of layers or tens of thousands of combos never has
+to be materialized as a whole. Everything else is decoded with the stdlib
+``json`` scanner; no third-party streaming parser is required.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterator
+    from typing import TextIO
+
+DEFAULT_CHUNK_SIZE: Final = 1 << 16
+STREAMED_SECTIONS: Final = ("layer_names", "macros", "holdTaps", "combos", "inputListeners", "layers")
+
+_WHITESPACE: Final = frozenset(" \t\n\r")
+_DECODER: Final = json.JSONDecoder()
+# Longest token the scanner can reject part-way through (``Infinity``); an
+# error closer than this to the window edge may just be a cut-off value.
+_PARTIAL_TOKEN: Final = len("Infinity")
+
+
+class StreamingJSONError(ValueError):
+    """Raised when the document is not well-formed JSON (``offset`` is a character index)."""
+
+    def __init__(self, message: str, offset: int) -> None:
+        super().__init__(f"{message} at char {offset}")
+        self.offset = offset
+
+
+class _Buffer:
+    """Sliding text window over a file-like object."""
+
+    def __init__(self, fp: TextIO, chunk_size: int) -> None:
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.base = 0  # absolute offset of text[0]
+        self.eof = False
+
+    @property
+    def offset(self) -> int:
+        return self.base + self.pos
+
+    def fill(self, minimum: int = 0) -> bool:
+        """Append at least one more chunk; return False once the file is exhausted."""
+        if self.eof:
+            return False
+        if self.pos > self._chunk_size:
+            # Drop consumed text so the window never grows past what the
+            # current value needs.
+            self.base += self.pos
+            self.text = self.text[self.pos :]
+            self.pos = 0
+        chunk = self._fp.read(max(self._chunk_size, minimum))
+        if not chunk:
+            self.eof = True
+            return False
+        self.text += chunk
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ("" at EOF)."""
+        while True:
+            text, pos = self.text, self.pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            found = self.peek() or "end of input"
+            msg = f"Expected '{char}' but found {found!r}"
+            raise StreamingJSONError(msg, self.offset)
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Decode one complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as exc:
+                # Only an error at the window edge (or an open string) can be
+                # a value cut off by the window: grow it and retry. Reads
+                # double in size so long values cost O(n log n). Anything
+                # else is malformed no matter what follows.
+                truncated = exc.msg.startswith("Unterminated string") or len(self.text) - exc.pos <= _PARTIAL_TOKEN
+                if truncated and self.fill(len(self.text) - self.pos):
+                    continue
+                raise StreamingJSONError(exc.msg, self.base + exc.pos) from None
+            if end == len(self.text) and self.fill():
+                # A number such as ``12`` may continue in the next chunk.
+                continue
+            self.pos = end
+            return value
+
+
+def iter_top_level(
+    fp: TextIO,
+    *,
+    streamed: Collection[str] = STREAMED_SECTIONS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[str, int | None, Any]]:
+    """Yield ``(key, index, value)`` events for the top-level JSON object in *fp*.
+
+    Members not listed in *streamed* are decoded whole and yielded as
+    ``(key, None, value)``. Streamed members holding an array are announced as
+    ``(key, None, [])`` followed by one ``(key, index, item)`` event per
+    element; streamed members holding anything else are yielded whole.
+    """
+    buffer = _Buffer(fp, chunk_size)
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        buffer.pos += 1
+    else:
+        while True:
+            if buffer.peek() != '"':
+                msg = "Expected a member name"
+                raise StreamingJSONError(msg, buffer.offset)
+            key = buffer.decode()
+            buffer.expect(":")
+            if key in streamed and buffer.peek() == "[":
+                yield key, None, []
+                yield from _iter_array(buffer, key)
+            else:
+                yield key, None, buffer.decode()
+            if buffer.peek() == ",":
+                buffer.pos += 1
+                continue
+            buffer.expect("}")
+            break
+    if buffer.peek():
+        msg = "Extra data after the top-level object"
+        raise StreamingJSONError(msg, buffer.offset)
+
+
+def _iter_array(buffer: _Buffer, key: str) -> Iterator[tuple[str, int | None, Any]]:
+    buffer.expect("[")
+    if buffer.peek() == "]":
+        buffer.pos += 1
+        return
+    index = 0
+    while True:
+        yield key, index, buffer.decode()
+        index += 1
+        if buffer.peek() == ",":
+            buffer.pos += 1
+            continue
+        buffer.expect("]")
+        return
+
+
+__all__ = ["DEFAULT_CHUNK_SIZE", "STREAMED_SECTIONS", "StreamingJSONError", "iter_top_level"]
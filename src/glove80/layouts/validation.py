@@ -0,0 +1,372 @@
+"""Bulk validation of layout JSON files."""
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from collections.abc import Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from pydantic import TypeAdapter, ValidationError
+
+from glove80.geometry import KEY_COUNT
+
+from .bindings import CUSTOM_TEXT_FIELDS, BindingChecker
+from .schema import Combo, HoldTap, InputListener, LayoutPayload, Macro
+from .streaming import DEFAULT_CHUNK_SIZE, StreamingJSONError, iter_top_level
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+
+    from .schema import SemanticError
+    from .validation_cache import ValidationCache
+
+SECTION_FIELDS = ("layer_names", "macros", "holdTaps", "combos", "inputListeners")
+_STREAMED_COUNTS = (*SECTION_FIELDS, "layers")
+
+
+@dataclass(frozen=True)
+class LayoutError:
+    """One validation failure located by an RFC 6901 JSON Pointer.
+
+    ``pointer`` is ``""`` for the document itself and e.g.
+    ``/layers/3/41/params/0`` for nested values; ``code`` is the pydantic error
+    type (``missing``, ``int_type``…), ``value_error`` for semantic checks, or
+    ``json_invalid``/``io_error`` when the file could not be read at all.
+    """
+
+    pointer: str
+    message: str
+    code: str = "value_error"
+
+    def __str__(self) -> str:
+        return f"{self.pointer}: {self.message}" if self.pointer else self.message
+
+    def to_dict(self) -> dict[str, str]:
+        return {"pointer": self.pointer, "message": self.message, "code": self.code}
+
+
+@dataclass(frozen=True)
+class FileValidationResult:
+    """Outcome of validating a single layout file."""
+
+    path: Path
+    ok: bool
+    errors: tuple[LayoutError, ...] = ()
+    counts: dict[str, int] = field(default_factory=dict)
+    # Total number of errors found; ``errors`` may hold fewer (see ``max_errors``).
+    error_count: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "ok": self.ok,
+            "errors": [error.to_dict() for error in self.errors],
+            "error_count": self.error_count,
+            "counts": dict(self.counts),
+        }
+
+
+def iter_layout_files(targets: Iterable[str | Path]) -> list[Path]:
+    """Expand files, directories (recursively), and glob patterns into JSON paths.
+
+    Order follows *targets*; directory and glob matches are sorted. Paths that
+    appear more than once are only returned the first time.
+    """
+    seen: set[Path] = set()
+    files: list[Path] = []
+
+    def _add(path: Path) -> None:
+        if path not in seen:
+            seen.add(path)
+            files.append(path)
+
+    for target in targets:
+        path = Path(target)
+        if path.is_dir():
+            for match in sorted(path.rglob("*.json")):
+                _add(match)
+        elif path.exists():
+            _add(path)
+        else:
+            for pattern_match in sorted(glob.glob(str(target), recursive=True)):
+                if Path(pattern_match).is_file():
+                    _add(Path(pattern_match))
+    return files
+
+
+def json_pointer(parts: Iterable[str | int]) -> str:
+    """Render location *parts* as an RFC 6901 JSON Pointer."""
+    return "".join("/" + str(part).replace("~", "~0").replace("/", "~1") for part in parts)
+
+
+_LAYER_ADAPTER: TypeAdapter[List[Dict[str, Any]]] = TypeAdapter(List[Dict[str, Any]])
+
+
+def _validate_layer(value: Any) -> List[Dict[str, Any]]:
+    layer = _LAYER_ADAPTER.validate_python(value)
+    if len(layer) != KEY_COUNT:
+        msg = f"each layer must have exactly {KEY_COUNT} key entries"
+        raise ValueError(msg)
+    return layer
+
+
+# Core-schema validators: unlike the ``model_validate`` overrides they don't
+# stop at the first semantic error, which ``_LayoutChecker`` collects itself.
+_ELEMENT_VALIDATORS: dict[str, Callable[[Any], Any]] = {
+    "layer_names": TypeAdapter(str).validate_python,
+    "layers": _validate_layer,
+    "macros": TypeAdapter(Macro).validate_python,
+    "holdTaps": TypeAdapter(HoldTap).validate_python,
+    "combos": TypeAdapter(Combo).validate_python,
+    "inputListeners": TypeAdapter(InputListener).validate_python,
+}
+_HEADER_VALIDATOR = TypeAdapter(LayoutPayload).validate_python
+
+
+class _LayoutChecker:
+    """Accumulate every error of one layout, fed member by member.
+
+    Sections arrive as an empty placeholder list (``member``) followed by one
+    ``element`` call per item, which is exactly what :func:`iter_top_level`
+    yields; :func:`collect_layout_errors` replays an in-memory dict the same
+    way so both paths report identical errors.
+    """
+
+    def __init__(self, max_errors: int | None) -> None:
+        self.max_errors = max_errors
+        self.errors: list[LayoutError] = []
+        self.error_count = 0
+        self.header: dict[str, Any] = {}
+        self.counts = dict.fromkeys(_STREAMED_COUNTS, 0)
+        self.bindings = BindingChecker()
+
+    def add(self, location: Sequence[str | int], message: str, code: str = "value_error") -> None:
+        self.error_count += 1
+        if self.max_errors is None or len(self.errors) < self.max_errors:
+            self.errors.append(LayoutError(json_pointer(location), message, code))
+
+    def add_exception(self, exc: Exception, location: tuple[str | int, ...] = ()) -> None:
+        if isinstance(exc, ValidationError):
+            for error in exc.errors():
+                self.add((*location, *error["loc"]), error["msg"], error["type"])
+        elif isinstance(exc, (json.JSONDecodeError, StreamingJSONError)):
+            self.add(location, f"invalid JSON: {exc}", "json_invalid")
+        elif isinstance(exc, OSError):
+            self.add(location, str(exc), "io_error")
+        else:
+            self.add(location, str(exc))
+
+    def add_all(self, errors: Iterable[SemanticError], prefix: tuple[str | int, ...] = ()) -> None:
+        for loc, message in errors:
+            self.add((*prefix, *loc), message)
+
+    def member(self, key: str, value: Any) -> None:
+        self.header[key] = value
+        if key in CUSTOM_TEXT_FIELDS and isinstance(value, str):
+            self.bindings.define_custom(value)
+
+    def element(self, key: str, index: int, value: Any) -> None:
+        self.counts[key] += 1
+        try:
+            item = _ELEMENT_VALIDATORS[key](value)
+        except ValueError as exc:
+            self.add_exception(exc, (key, index))
+            return
+        if hasattr(item, "semantic_errors"):
+            self.add_all(item.semantic_errors(), (key, index))
+        self._check_bindings(key, index, item)
+
+    def _check_bindings(self, key: str, index: int, item: Any) -> None:
+        bindings = self.bindings
+        if key == "layers":
+            check = bindings.check_binding
+            for position, binding in enumerate(item):
+                errors = check(binding, (key, index, position))
+                if errors:
+                    self.add_all(errors)
+        elif key == "macros":
+            bindings.define_macro(item.name, item.params)
+            for position, binding in enumerate(item.bindings):
+                self.add_all(bindings.check_binding(binding, (key, index, "bindings", position)))
+        elif key == "holdTaps":
+            bindings.define_hold_tap(item.name, item.bindings)
+            for position, name in enumerate(item.bindings):
+                self.add_all(bindings.check_behavior_name(name, (key, index, "bindings", position)))
+        elif key == "combos":
+            self.add_all(bindings.check_binding(item.binding, (key, index, "binding")))
+
+    def finish(self) -> None:
+        # Streamed sections are still the empty placeholders here, so this
+        # only checks the remaining top-level fields and missing/unknown keys.
+        try:
+            _HEADER_VALIDATOR(self.header)
+        except ValueError as exc:
+            self.add_exception(exc)
+        if isinstance(self.header.get("layers"), list) and isinstance(self.header.get("layer_names"), list):
+            if self.counts["layers"] != self.counts["layer_names"]:
+                self.add(("layers",), "layers length must match layer_names length")
+        self.add_all(self.bindings.finish(self.counts["layer_names"]))
+
+    def result(self, path: Path) -> FileValidationResult:
+        if self.error_count:
+            return FileValidationResult(
+                path=path,
+                ok=False,
+                errors=tuple(self.errors),
+                error_count=self.error_count,
+            )
+        return FileValidationResult(path=path, ok=True, counts={name: self.counts[name] for name in SECTION_FIELDS})
+
+
+def _check_document(checker: _LayoutChecker, data: Any) -> None:
+    if not isinstance(data, Mapping):
+        checker.add((), "layout JSON must be an object")
+        return
+    for key, value in data.items():
+        if key in _STREAMED_COUNTS and isinstance(value, list):
+            checker.member(key, [])
+            for index, item in enumerate(value):
+                checker.element(key, index, item)
+        else:
+            checker.member(key, value)
+    checker.finish()
+
+
+def collect_layout_errors(data: Any, *, max_errors: int | None = None) -> list[LayoutError]:
+    """Validate a parsed layout and return every error instead of raising on the first.
+
+    Covers the same checks as ``LayoutPayload.model_validate`` (field types,
+    unknown keys, layer shape, hold-tap and listener rules) plus every binding
+    tree (see :class:`glove80.layouts.bindings.BindingChecker`), each located
+    by a JSON Pointer. An empty list means the layout is valid.
+    """
+    checker = _LayoutChecker(max_errors)
+    _check_document(checker, data)
+    return checker.errors
+
+
+def errors_to_json(errors: Iterable[LayoutError], *, indent: int | None = 2) -> str:
+    """Serialize *errors* as a JSON array of ``{"pointer", "message", "code"}`` objects."""
+    return json.dumps([error.to_dict() for error in errors], indent=indent)
+
+
+def validate_file(path: Path, *, stream: bool = False, max_errors: int | None = 100) -> FileValidationResult:
+    """Validate one layout file, collecting errors instead of raising.
+
+    ``stream=True`` delegates to :func:`validate_file_streaming`. At most
+    *max_errors* errors are kept (``None`` keeps all); ``error_count`` always
+    holds the total.
+    """
+    if stream:
+        return validate_file_streaming(path, max_errors=max_errors)
+    checker = _LayoutChecker(max_errors)
+    try:
+        data = json.loads(path.read_bytes())
+    except (OSError, ValueError) as exc:
+        checker.add_exception(exc)
+    else:
+        _check_document(checker, data)
+    return checker.result(path)
+
+
+def validate_file_streaming(
+    path: Path,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_errors: int | None = 100,
+) -> FileValidationResult:
+    """Validate *path* one section element at a time with bounded memory.
+
+    Layers, layer names, and every macro/hold-tap/combo/input-listener are
+    validated as they are read and then discarded, so peak memory depends on
+    the largest single element rather than the file size. Validation keeps
+    going after a bad element; at most *max_errors* errors are kept.
+    """
+    checker = _LayoutChecker(max_errors)
+    try:
+        with path.open(encoding="utf-8") as fp:
+            for key, index, value in iter_top_level(fp, chunk_size=chunk_size):
+                if index is None:
+                    checker.member(key, value)
+                else:
+                    checker.element(key, index, value)
+    except (OSError, ValueError) as exc:
+        checker.add_exception(exc)
+    else:
+        checker.finish()
+    return checker.result(path)
+
+
+def validate_files(
+    paths: Sequence[Path],
+    *,
+    jobs: int = 1,
+    stream: bool = False,
+    cache: ValidationCache | None = None,
+) -> Iterator[FileValidationResult]:
+    """Validate *paths*, yielding results in input order as soon as they are ready.
+
+    ``jobs`` > 1 fans the work out to a process pool (``0`` uses every CPU).
+    Files are handed to workers in chunks so tens of thousands of small
+    layouts don't pay one IPC round trip each. With a *cache*, files whose
+    content was validated before are answered from it and only the rest are
+    sent to the workers.
+    """
+    if cache is None:
+        yield from _validate_uncached(paths, jobs=jobs, stream=stream)
+        return
+
+    mode = "stream" if stream else "full"
+    digests: list[str | None] = []
+    hits: list[FileValidationResult | None] = []
+    for path in paths:
+        try:
+            digest: str | None = cache.digest(path)
+        except OSError:
+            digest = None
+        digests.append(digest)
+        hits.append(cache.get(path, digest, mode=mode) if digest is not None else None)
+
+    misses = [path for path, hit in zip(paths, hits) if hit is None]
+    fresh = _validate_uncached(misses, jobs=jobs, stream=stream)
+    for digest, hit in zip(digests, hits):
+        if hit is not None:
+            yield hit
+            continue
+        result = next(fresh)
+        if digest is not None:
+            cache.put(digest, result, mode=mode)
+        yield result
+
+
+def _validate_uncached(paths: Sequence[Path], *, jobs: int, stream: bool) -> Iterator[FileValidationResult]:
+    workers = (os.cpu_count() or 1) if jobs == 0 else jobs
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield validate_file(path, stream=stream)
+        return
+
+    workers = min(workers, len(paths))
+    chunksize = max(1, min(64, len(paths) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(partial(validate_file, stream=stream), paths, chunksize=chunksize)
+
+
+__all__ = [
+    "FileValidationResult",
+    "LayoutError",
+    "SECTION_FIELDS",
+    "collect_layout_errors",
+    "errors_to_json",
+    "iter_layout_files",
+    "json_pointer",
+    "validate_file",
+    "validate_file_streaming",
+    "validate_files",
+]
@@ -0,0 +1,212 @@
+"""On-disk cache of layout validation results keyed by file content.
+
+Results are stored under the SHA-256 of the file bytes plus a *namespace*
+derived from the installed glove80 version and the source of the validation
+modules, so upgrading the schema invalidates every entry automatically. A
+second table remembers ``(path, size, mtime_ns) -> digest`` so re-checking an
+unchanged file is a ``stat`` plus two indexed SQLite lookups — the file is not
+even read. Entries are evicted least-recently-used once the store grows past
+``max_entries``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+from glove80.cache import CACHE_DIR_ENV, default_cache_dir
+
+from .validation import FileValidationResult, LayoutError
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+DEFAULT_MAX_ENTRIES: Final = 100_000
+
+# Files (relative to the glove80 package) whose content determines a
+# validation outcome: the validators plus the key/behavior catalogs and
+# geometry they check bindings against.
+_VALIDATOR_SOURCES: Final = (
+    "layouts/schema.py",
+    "layouts/parse.py",
+    "layouts/streaming.py",
+    "layouts/validation.py",
+    "layouts/bindings.py",
+    "keycodes/behaviors.py",
+    "keycodes/core.py",
+    "keycodes/zmk.json",
+    "keycodes/key_options.json",
+    "geometry.py",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    digest TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (digest, namespace)
+);
+CREATE INDEX IF NOT EXISTS results_used ON results (used);
+"""
+
+
+@lru_cache(maxsize=1)
+def validator_fingerprint() -> str:
+    """Identify the validation logic: package version plus validator sources and data."""
+    try:
+        version = metadata.version("glove80")
+    except metadata.PackageNotFoundError:  # pragma: no cover - source checkout without install
+        version = "0+unknown"
+    digest = hashlib.sha256(version.encode())
+    package = Path(__file__).parent.parent
+    for name in _VALIDATOR_SOURCES:
+        digest.update((package / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of *path*'s bytes."""
+    digest = hashlib.sha256()
+    with path.open("rb") as fp:
+        for chunk in iter(lambda: fp.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """SQLite-backed store of :class:`FileValidationResult` outcomes.
+
+    Opening raises ``OSError`` or ``sqlite3.Error`` when *directory* cannot
+    hold the database; callers treat the cache as optional.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        namespace: str | None = None,
+    ) -> None:
+        self.directory = directory if directory is not None else default_cache_dir()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.namespace = namespace if namespace is not None else validator_fingerprint()
+        self._db = sqlite3.connect(self.directory / "validation.sqlite3")
+        try:
+            self._db.executescript(_SCHEMA)
+        except sqlite3.Error:
+            self._db.close()
+            raise
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> ValidationCache:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Evict surplus entries, commit, and close the database."""
+        self._evict()
+        self._db.commit()
+        self._db.close()
+
+    def digest(self, path: Path) -> str:
+        """Return the content digest of *path*, hashing only when its stat changed."""
+        stat = path.stat()
+        key = str(path.resolve())
+        row = self._db.execute("SELECT size, mtime_ns, digest FROM files WHERE path = ?", (key,)).fetchone()
+        if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return str(row[2])
+        digest = file_digest(path)
+        self._db.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+            (key, stat.st_size, stat.st_mtime_ns, digest),
+        )
+        return digest
+
+    def get(self, path: Path, digest: str, *, mode: str = "full") -> FileValidationResult | None:
+        """Return the cached result for *digest*, re-labelled with *path*."""
+        row = self._db.execute(
+            "SELECT ok, payload FROM results WHERE digest = ? AND namespace = ?",
+            (digest, self._key(mode)),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._db.execute(
+            "UPDATE results SET used = ? WHERE digest = ? AND namespace = ?",
+            (time.time(), digest, self._key(mode)),
+        )
+        payload = json.loads(row[1])
+        return FileValidationResult(
+            path=path,
+            ok=bool(row[0]),
+            errors=tuple(LayoutError(**error) for error in payload["errors"]),
+            counts=payload["counts"],
+            error_count=payload["error_count"],
+        )
+
+    def put(self, digest: str, result: FileValidationResult, *, mode: str = "full") -> None:
+        payload = json.dumps(
+            {
+                "errors": [error.to_dict() for error in result.errors],
+                "counts": result.counts,
+                "error_count": result.error_count,
+            }
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO results (digest, namespace, ok, payload, used) VALUES (?, ?, ?, ?, ?)",
+            (digest, self._key(mode), int(result.ok), payload, time.time()),
+        )
+
+    def clear(self) -> None:
+        self._db.execute("DELETE FROM results")
+        self._db.execute("DELETE FROM files")
+
+    def __len__(self) -> int:
+        return int(self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0])
+
+    def _key(self, mode: str) -> str:
+        return f"{self.namespace}:{mode}"
+
+    def _evict(self) -> None:
+        surplus = len(self) - self.max_entries
+        if surplus > 0:
+            self._db.execute(
+                "DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY used LIMIT ?)",
+                (surplus,),
+            )
+        # Stat rows only help while their result is still cached.
+        self._db.execute("DELETE FROM files WHERE digest NOT IN (SELECT digest FROM results)")
+
+
+__all__ = [
+    "CACHE_DIR_ENV",
+    "DEFAULT_MAX_ENTRIES",
+    "ValidationCache",
+    "default_cache_dir",
+    "file_digest",
+    "validator_fingerprint",
+]
@@ -0,0 +1,215 @@
+"""Cross-variant difference matrices for a layout family.
+
+A family's variants share most of their layers and differ in a handful of
+keys (Ctrl vs Cmd shortcuts, the alpha block of the Typing layer…).
+:func:`variant_matrix` builds an N×N picture of those differences:
+
+* every binding is interned once in a :class:`BindingTable` and each layer is
+  encoded as an ``array`` of binding ids, so comparing two bindings is an int
+  compare and comparing two whole layers is a ``bytes`` compare;
+* variants whose encoded layers are identical form one group, and only the
+  distinct encodings of a layer are compared position by position, giving a
+  bitset of differing key positions per pair of groups that every pair of
+  variants then shares.
+
+The result answers "which keys differ between *a* and *b* on layer *L*" and
+"which variants have identical *L* layers" for every pair at once.
+:func:`family_matrix` builds each variant of a registered family once and
+feeds them in.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from itertools import zip_longest
+from typing import TYPE_CHECKING, Any
+
+from .combo_check import iter_bits
+from .family import REGISTRY
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from glove80.base import Layer
+
+
+class BindingTable:
+    """Intern table assigning a small int id to each distinct binding tree.
+
+    Id ``0`` stands for "no binding" (a position past the end of a short
+    layer).
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {repr(None): 0}
+        self.bindings: list[Any] = [None]
+
+    def __len__(self) -> int:
+        return len(self.bindings)
+
+    def intern(self, binding: Any) -> int:
+        # repr() of a JSON-shaped tree is as canonical as json.dumps (both
+        # follow dict insertion order) and several times cheaper.
+        key = repr(binding)
+        binding_id = self._ids.get(key)
+        if binding_id is None:
+            binding_id = self._ids[key] = len(self.bindings)
+            self.bindings.append(binding)
+        return binding_id
+
+    def encode(self, layer: Layer) -> array[int]:
+        """Return *layer* as an array of binding ids."""
+        return array("I", map(self.intern, layer))
+
+
+@dataclass(frozen=True)
+class LayerMatrix:
+    """Pairwise differences of one layer across the variants that have it."""
+
+    layer: str
+    variants: tuple[str, ...]
+    # masks[i][j]: bitset of key positions where variants i and j differ.
+    masks: tuple[tuple[int, ...], ...]
+    # Variants with identical layers, in variant order.
+    groups: tuple[tuple[str, ...], ...]
+
+    @property
+    def varying(self) -> tuple[int, ...]:
+        """Key positions where at least two variants differ."""
+        union = 0
+        for row in self.masks:
+            for mask in row:
+                union |= mask
+        return tuple(iter_bits(union))
+
+    def _index(self, variant: str) -> int:
+        try:
+            return self.variants.index(variant)
+        except ValueError:
+            msg = f"Variant '{variant}' has no layer '{self.layer}'"
+            raise ValueError(msg) from None
+
+    def positions(self, a: str, b: str) -> tuple[int, ...]:
+        """Key positions whose bindings differ between variants *a* and *b*."""
+        return tuple(iter_bits(self.masks[self._index(a)][self._index(b)]))
+
+    def counts(self) -> list[list[int]]:
+        """The N×N matrix of differing key counts."""
+        return [[mask.bit_count() for mask in row] for row in self.masks]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "layer": self.layer,
+            "variants": list(self.variants),
+            "groups": [list(group) for group in self.groups],
+            "varying": list(self.varying),
+            "counts": self.counts(),
+        }
+
+
+@dataclass(frozen=True)
+class VariantMatrix:
+    """Outcome of :func:`variant_matrix`: one :class:`LayerMatrix` per layer name."""
+
+    variants: tuple[str, ...]
+    layers: tuple[LayerMatrix, ...]
+    # Distinct binding trees across all variants.
+    bindings: int
+
+    def layer(self, name: str) -> LayerMatrix:
+        for matrix in self.layers:
+            if matrix.layer == name:
+                return matrix
+        msg = f"No variant has a layer named '{name}'"
+        raise KeyError(msg)
+
+    def positions(self, layer: str, a: str, b: str) -> tuple[int, ...]:
+        """Key positions of *layer* whose bindings differ between variants *a* and *b*."""
+        return self.layer(layer).positions(a, b)
+
+    def diverging_layers(self, a: str, b: str) -> tuple[str, ...]:
+        """Layers both variants have whose bindings differ somewhere."""
+        return tuple(
+            matrix.layer
+            for matrix in self.layers
+            if a in matrix.variants and b in matrix.variants and matrix.positions(a, b)
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "variants": list(self.variants),
+            "bindings": self.bindings,
+            "layers": [matrix.to_dict() for matrix in self.layers],
+        }
+
+
+def _difference_mask(a: array[int], b: array[int]) -> int:
+    mask = 0
+    for position, (left, right) in enumerate(zip_longest(a, b, fillvalue=0)):
+        if left != right:
+            mask |= 1 << position
+    return mask
+
+
+def _layer_matrix(layer: str, variants: Sequence[str], encoded: Sequence[array[int]]) -> LayerMatrix:
+    # Variants with identical layers collapse into one group, so only distinct
+    # encodings are compared (usually a handful, however many variants exist).
+    group_of: dict[bytes, int] = {}
+    groups: list[list[str]] = []
+    distinct: list[array[int]] = []
+    membership = []
+    for variant, layer_ids in zip(variants, encoded):
+        group = group_of.setdefault(layer_ids.tobytes(), len(groups))
+        if group == len(groups):
+            groups.append([])
+            distinct.append(layer_ids)
+        groups[group].append(variant)
+        membership.append(group)
+
+    between = [[0] * len(distinct) for _ in distinct]
+    for first in range(len(distinct)):
+        for second in range(first + 1, len(distinct)):
+            between[first][second] = between[second][first] = _difference_mask(distinct[first], distinct[second])
+    return LayerMatrix(
+        layer=layer,
+        variants=tuple(variants),
+        masks=tuple(tuple(between[group][other] for other in membership) for group in membership),
+        groups=tuple(tuple(group) for group in groups),
+    )
+
+
+def variant_matrix(layouts: Mapping[str, Mapping[str, Any]]) -> VariantMatrix:
+    """Compare the layers of *layouts* (variant -> payload), matching layers by name.
+
+    Layers are listed in order of first appearance; each layer's matrix only
+    covers the variants that have a layer of that name.
+    """
+    table = BindingTable()
+    # layer name -> (variants, encoded layers)
+    by_layer: dict[str, tuple[list[str], list[array[int]]]] = {}
+    for variant, payload in layouts.items():
+        for name, layer in zip(payload.get("layer_names") or (), payload.get("layers") or ()):
+            variants, encoded = by_layer.setdefault(str(name), ([], []))
+            variants.append(variant)
+            encoded.append(table.encode(layer))
+    return VariantMatrix(
+        variants=tuple(layouts),
+        layers=tuple(_layer_matrix(name, variants, encoded) for name, (variants, encoded) in by_layer.items()),
+        bindings=len(table),
+    )
+
+
+def family_matrix(family: str, variants: Iterable[str] | None = None) -> VariantMatrix:
+    """Build each variant of a registered *family* once and compare them."""
+    layout_family = REGISTRY.get(family)
+    known = list(layout_family.variants())
+    names = known if variants is None else list(variants)
+    unknown = [variant for variant in names if variant not in known]
+    if unknown:
+        msg = f"Unknown {family} variants {unknown}; expected some of {known}"
+        raise ValueError(msg)
+    return variant_matrix({variant: layout_family.build(variant) for variant in names})
+
+
+__all__ = ["BindingTable", "LayerMatrix", "VariantMatrix", "family_matrix", "variant_matrix"]
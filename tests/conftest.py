@@ -1,11 +1,19 @@
 import importlib
 import json
+import os
+import shutil
+import tempfile
 from collections.abc import Callable
 from pathlib import Path
 
 import pytest
 
-from glove80.metadata import MetadataByVariant, get_variant_metadata, load_metadata
+# Importing glove80 already loads (and stores) the key index, so the session
+# cache has to be in place before the first glove80 import below.
+_SESSION_CACHE_DIR = tempfile.mkdtemp(prefix="glove80-cache-")
+os.environ["GLOVE80_CACHE_DIR"] = _SESSION_CACHE_DIR
+
+from glove80.metadata import MetadataByVariant, get_variant_metadata, load_metadata  # noqa: E402
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 FAMILY_MODULES = (
@@ -21,6 +29,16 @@ def repo_root() -> Path:
     return REPO_ROOT
 
 
+def pytest_unconfigure(config: pytest.Config) -> None:
+    shutil.rmtree(_SESSION_CACHE_DIR, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_validation_cache(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Give every test its own cache so `glove80 validate` results never leak between tests.
+    monkeypatch.setenv("GLOVE80_CACHE_DIR", str(tmp_path_factory.mktemp("glove80-cache")))
+
+
 @pytest.fixture(scope="session", autouse=True)
 def _ensure_family_registry() -> None:
     for module in FAMILY_MODULES:
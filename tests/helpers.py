@@ -0,0 +1,14 @@
+"""Builders for the small binding trees the unit tests feed to the analysers."""
+
+from __future__ import annotations
+
+__all__ = ["binding", "kp"]
+
+
+def binding(value: object, *params: object) -> dict[str, object]:
+    """Build a binding tree; parameters that are not already dicts become leaf bindings."""
+    return {"value": value, "params": [p if isinstance(p, dict) else {"value": p, "params": []} for p in params]}
+
+
+def kp(key: str) -> dict[str, object]:
+    return binding("&kp", key)
@@ -0,0 +1,79 @@
+import pytest
+
+from glove80.families.tailorkey.alpha_layouts import base_variant_for, layout_for_variant
+from glove80.families.tailorkey.layers import LAYER_PROVIDERS, PROVIDER_CACHE, build_all_layers
+from glove80.families.tailorkey.specs import LAYER_NAME_MAP
+from glove80.layers.providers import LayerProvider, ProviderCache, build_layers
+
+
+@pytest.mark.parametrize("variant", sorted(LAYER_NAME_MAP))
+def test_build_all_layers_returns_variant_layers_in_order(variant) -> None:
+    assert list(build_all_layers(variant)) == LAYER_NAME_MAP[variant]
+
+
+def test_only_providers_for_requested_layers_run() -> None:
+    calls: list[str] = []
+
+    def tracked(provider: LayerProvider) -> LayerProvider:
+        def build(variant: str):
+            calls.append(sorted(provider.names)[0])
+            return provider(variant)
+
+        return LayerProvider(provider.names, build)
+
+    providers = [tracked(provider) for provider in LAYER_PROVIDERS]
+    layers = build_layers(providers, "windows", LAYER_NAME_MAP["windows"])
+
+    assert list(layers) == LAYER_NAME_MAP["windows"]
+    assert "LeftIndex" not in calls
+
+    calls.clear()
+    assert list(build_layers(providers, "bilateral_mac", ["Typing", "LeftPinky"])) == ["Typing", "LeftPinky"]
+    assert calls == ["Typing", "LeftIndex"]
+
+
+def test_build_layers_rejects_unknown_missing_and_undeclared_layers() -> None:
+    with pytest.raises(ValueError, match="No layer provider produces \\['Nope'\\]"):
+        build_all_layers("windows", ["Typing", "Nope"])
+    # Declared, but the cursor provider only builds Cursor_macOS for dual variants.
+    with pytest.raises(ValueError, match="Cursor_macOS"):
+        build_all_layers("windows", ["Cursor_macOS"])
+
+    sneaky = LayerProvider(frozenset({"A"}), lambda _variant: {"A": [], "B": []})
+    with pytest.raises(ValueError, match="undeclared layers \\['B'\\]"):
+        build_layers([sneaky], "windows", ["A"])
+
+
+def test_provider_cache_builds_each_distinct_layer_once() -> None:
+    cache = ProviderCache({"base_variant": base_variant_for, "alpha_layout": layout_for_variant})
+    expected = {
+        (sorted(provider.names)[0], tuple(cache._key(provider, variant)))
+        for variant, names in LAYER_NAME_MAP.items()
+        for provider in LAYER_PROVIDERS
+        if not provider.names.isdisjoint(names)
+    }
+    for variant, names in LAYER_NAME_MAP.items():
+        assert build_layers(LAYER_PROVIDERS, variant, names, cache=cache) == build_layers(
+            LAYER_PROVIDERS, variant, names
+        )
+
+    assert cache.builds == len(cache) == len(expected)
+    # Gaming is the same everywhere; Typing only varies with the alpha layout.
+    assert sum(key[0] == "Gaming" for key in expected) == 1
+    assert sum(key[0] == "Typing" for key in expected) == 4
+
+
+def test_provider_cache_hands_out_copies() -> None:
+    first = build_all_layers("windows", ["Gaming"])
+    first["Gaming"][0]["value"] = "&changed"
+
+    second = build_all_layers("colemak", ["Gaming"])
+    assert second["Gaming"][0]["value"] != "&changed"
+    assert second["Gaming"] is not first["Gaming"]
+    assert PROVIDER_CACHE.hits
+
+
+def test_provider_cache_rejects_unknown_attributes() -> None:
+    provider = LayerProvider.single("A", lambda _variant: [], depends_on=("os",))
+    with pytest.raises(ValueError, match="Unknown variant attribute 'os'"):
+        ProviderCache({})(provider, "windows")
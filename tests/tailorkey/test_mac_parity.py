@@ -1,60 +1,24 @@
-from glove80 import build_layout
+from glove80.layouts.variant_matrix import family_matrix, variant_matrix
 
+# (Windows/Linux, macOS) variant pairs for each alpha layout.
+OS_PAIRS = (
+    ("windows", "mac"),
+    ("colemak", "colemak_mac"),
+    ("colemak_dh", "colemak_dh_mac"),
+    ("dvorak", "dvorak_mac"),
+)
 
-LAYER_DIFFS = {
-    "Mouse": {30, 32, 55, 56, 57},
-    "Symbol": {30, 32},
-    "Cursor": {
-        27,
-        28,
-        30,
-        31,
-        35,
-        37,
-        39,
-        40,
-        46,
-        47,
-        48,
-        49,
-        50,
-        51,
-        52,
-        53,
-        56,
-        57,
-        58,
-        63,
-        64,
-        65,
-        66,
-        67,
-        68,
-        71,
-        72,
-        73,
-        74,
-        75,
-        76,
-        77,
-        79,
-    },
-}
 
+def _divergence(matrix, windows: str, mac: str) -> dict[str, tuple[int, ...]]:
+    return {layer: matrix.positions(layer, windows, mac) for layer in matrix.diverging_layers(windows, mac)}
 
-def _layer(layout: dict, name: str) -> list[dict]:
-    idx = layout["layer_names"].index(name)
-    return layout["layers"][idx]
 
+def test_tailorkey_mac_windows_parity(load_tailorkey_variant) -> None:
+    built = family_matrix("tailorkey")
+    released = variant_matrix({variant: load_tailorkey_variant(variant) for variant in ("windows", "mac")})
 
-def _diffs(left: list[dict], right: list[dict]) -> set[int]:
-    return {idx for idx, (lhs, rhs) in enumerate(zip(left, right, strict=False)) if lhs != rhs}
-
-
-def test_tailorkey_mac_windows_parity() -> None:
-    windows = build_layout("tailorkey", "windows")
-    mac = build_layout("tailorkey", "mac")
-
-    for layer_name, expected in LAYER_DIFFS.items():
-        diff = _diffs(_layer(windows, layer_name), _layer(mac, layer_name))
-        assert diff == expected, f"Unexpected diffs for {layer_name}: {sorted(diff)}"
+    # Shared layers only differ in OS shortcuts, at the keys the releases differ at.
+    expected = _divergence(released, "windows", "mac")
+    assert set(expected) == {"Cursor", "Symbol", "Mouse"}
+    for windows, mac in OS_PAIRS:
+        assert _divergence(built, windows, mac) == expected, f"Unexpected diffs for {windows}/{mac}"
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import json
+
+import pytest
+
+from glove80 import list_families
 from glove80.layouts.builder import LayoutBuilder
-from glove80.layouts.common import BASE_COMMON_FIELDS, compose_layout
+from glove80.layouts.common import BASE_COMMON_FIELDS, STRICT_BUILD_ENV, compose_layout
 from glove80.layouts.components import LayoutFeatureComponents
+from glove80.layouts.family import get_family
 from glove80.layouts.schema import Combo, Macro
 
 
@@ -124,3 +130,157 @@ def test_high_level_feature_methods_use_providers() -> None:
     assert layout["layer_names"][2] == "Cursor"
     assert layout["layer_names"][3] == "&hrm_macro_layer"
     assert any(macro["name"] == "&hrm_macro" for macro in layout["macros"])
+
+
+def test_trusted_build_matches_validated_build(monkeypatch) -> None:
+    for family_name in list_families():
+        family = get_family(family_name)
+        for variant in family.variants():
+            monkeypatch.delenv(STRICT_BUILD_ENV, raising=False)
+            trusted = family.build(variant)
+            monkeypatch.setenv(STRICT_BUILD_ENV, "1")
+            validated = family.build(variant)
+            assert json.dumps(trusted) == json.dumps(validated), f"{family_name}:{variant}"
+
+
+def test_trusted_build_layers_are_fresh_lists(monkeypatch) -> None:
+    monkeypatch.delenv(STRICT_BUILD_ENV, raising=False)
+    builder = LayoutBuilder(
+        metadata_key="default",
+        variant="factory_default",
+        common_fields=BASE_COMMON_FIELDS,
+        layer_names=["Typing"],
+    )
+    builder.add_layers({"Typing": _mock_layer("&kp_A")})
+
+    layout = builder.build(trusted=True)
+    layout["layers"][0][0] = {"value": "&kp_B", "params": []}
+    layout["layers"][0].append({"value": "&none", "params": []})
+
+    assert builder.build(trusted=True)["layers"][0] == _mock_layer("&kp_A")
+
+
+def test_layer_order_moves_and_anchors_layers() -> None:
+    names = ["Typing", "Lower", "Symbol", "Magic"]
+    builder = LayoutBuilder(
+        metadata_key="default",
+        variant="factory_default",
+        common_fields=BASE_COMMON_FIELDS,
+        layer_names=["Typing", "Lower", "Typing"],
+    )
+    builder.add_layers({name: _mock_layer(name) for name in names})
+    builder.add_layers({"Magic": _mock_layer("Magic"), "Symbol": _mock_layer("Symbol")}, insert_before="Lower")
+    builder.add_layers({"Mouse": _mock_layer("Mouse")}, insert_after="Magic")
+    builder.update_layer("Typing", _mock_layer("Typing2"))
+    builder.update_layer("Extra", _mock_layer("Extra"))
+
+    assert builder.build()["layer_names"] == ["Typing", "Magic", "Mouse", "Symbol", "Lower", "Extra"]
+
+    with pytest.raises(ValueError, match="'Ghost' is not present"):
+        builder.add_layers({"Mouse": _mock_layer("Mouse")}, insert_after="Ghost")
+    # An anchor that is itself being moved is not a valid position.
+    with pytest.raises(ValueError, match="'Mouse' is not present"):
+        builder.add_layers({"Mouse": _mock_layer("Mouse")}, insert_before="Mouse")
+    assert builder.build()["layer_names"] == ["Typing", "Magic", "Mouse", "Symbol", "Lower", "Extra"]
+
+
+def test_build_can_prune_unused_behaviors() -> None:
+    unused = Macro(
+        name="&unused", description=None, bindings=[{"value": "&kp", "params": [{"value": "B", "params": []}]}]
+    )
+    for trusted in (False, True):
+        builder = LayoutBuilder(
+            metadata_key="default",
+            variant="factory_default",
+            common_fields=BASE_COMMON_FIELDS,
+            layer_names=["Typing"],
+            home_row_provider=lambda _: _mock_feature_components("&hrm_macro"),
+        )
+        builder.add_layers({"Typing": [{"value": "&hrm_macro", "params": []}]})
+        builder.add_macros([unused])
+        builder.add_home_row_mods(target_layer="Typing")
+
+        assert [macro["name"] for macro in builder.build(trusted=trusted)["macros"]] == ["&unused", "&hrm_macro"]
+        assert [macro["name"] for macro in builder.build(trusted=trusted, prune_unused=True)["macros"]] == [
+            "&hrm_macro"
+        ]
+
+
+def test_builder_behavior_graph_indexes_model_sections() -> None:
+    builder = LayoutBuilder(
+        metadata_key="default",
+        variant="factory_default",
+        common_fields=BASE_COMMON_FIELDS,
+        layer_names=["Typing"],
+    )
+    builder.add_layers({"Typing": [{"value": "&outer", "params": []}]})
+    builder.add_macros(
+        [
+            Macro(name="&outer", description=None, bindings=[{"value": "&inner", "params": []}]),
+            Macro(
+                name="&inner", description=None, bindings=[{"value": "&kp", "params": [{"value": "A", "params": []}]}]
+            ),
+        ]
+    )
+
+    graph = builder.behavior_graph()
+    assert graph.sites == {"&outer": ("/layers/0/0",)}
+    assert graph.dependents("&inner") == {"&outer"}
+    assert graph.unused() == ()
+
+
+def test_fork_is_independent_copy_on_write() -> None:
+    base = LayoutBuilder(
+        metadata_key="default",
+        variant="factory_default",
+        common_fields=BASE_COMMON_FIELDS,
+        layer_names=["Typing", "Symbol"],
+    )
+    base.add_layers({"Typing": _mock_layer("&kp_A"), "Symbol": _mock_layer("&kp_HASH")})
+    base.add_macros([_mock_feature_components("&base_macro").macros[0]])
+
+    fork = base.fork(variant="factory_default_macos")
+    fork.update_layer("Symbol", _mock_layer("&kp_DLLR"))
+    fork.add_layers({"Mouse": _mock_layer("&mouse")}, insert_after="Typing")
+    fork.add_macros([_mock_feature_components("&fork_macro").macros[0]])
+    base.add_combos(
+        [
+            Combo(
+                name="combo_base",
+                binding={"value": "&kp", "params": [{"value": "A", "params": []}]},
+                keyPositions=[0, 1],
+                layers=[0],
+            )
+        ]
+    )
+
+    original, derived = base.build(), fork.build()
+    assert original["layer_names"] == ["Typing", "Symbol"]
+    assert original["layers"][1][0]["value"] == "&kp_HASH"
+    assert [macro["name"] for macro in original["macros"]] == ["&base_macro"]
+    assert derived["layer_names"] == ["Typing", "Mouse", "Symbol"]
+    assert derived["layers"][2][0]["value"] == "&kp_DLLR"
+    assert [macro["name"] for macro in derived["macros"]] == ["&base_macro", "&fork_macro"]
+    assert derived["combos"] == []
+    assert len(original["combos"]) == 1
+    # Untouched layers stay shared between the two builders.
+    assert base.build(trusted=True)["layers"][0][0] is fork.build(trusted=True)["layers"][0][0]
+
+
+def test_editing_a_fork_payload_leaves_the_parent_alone(monkeypatch) -> None:
+    monkeypatch.delenv(STRICT_BUILD_ENV, raising=False)
+    base = LayoutBuilder(
+        metadata_key="default",
+        variant="factory_default",
+        common_fields=BASE_COMMON_FIELDS,
+        layer_names=["Typing", "Symbol"],
+    )
+    base.add_layers({"Typing": _mock_layer("&kp_A"), "Symbol": _mock_layer("&kp_HASH")})
+    before = json.dumps(base.build(trusted=True))
+
+    derived = base.fork(variant="factory_default_macos").build(trusted=True)
+    derived["layers"][0][0] = {"value": "&kp_B", "params": []}
+    derived["layers"][1].clear()
+    derived["layer_names"].append("Extra")
+
+    assert json.dumps(base.build(trusted=True)) == before
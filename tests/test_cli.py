@@ -195,3 +195,218 @@ def test_cli_scaffold_respects_force(tmp_path: Path) -> None:
     result = RUNNER.invoke(app, ["scaffold", str(dest), "--force"])
     assert result.exit_code == 0
     assert "Starter spec" in dest.read_text()
+
+
+def _write_invalid_layout(path: Path) -> None:
+    sample = next((REPO_ROOT / "layouts/default/releases").glob("*.json"))
+    data = json.loads(sample.read_text())
+    data["layers"][0] = data["layers"][0][:79]
+    path.write_text(json.dumps(data))
+
+
+def test_cli_validate_directory_in_parallel_with_json_output(tmp_path: Path) -> None:
+    release_dir = REPO_ROOT / "layouts/default/releases"
+    result = RUNNER.invoke(app, ["validate", str(release_dir), "--jobs", "2", "--json"])
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    expected = sorted(str(path) for path in release_dir.glob("*.json"))
+    assert [record["path"] for record in records] == expected
+    assert all(record["ok"] for record in records)
+    assert records[0]["counts"]["layer_names"] > 0
+
+
+def test_cli_validate_glob_aggregates_failures(tmp_path: Path) -> None:
+    good = tmp_path / "good.json"
+    good.write_text(next((REPO_ROOT / "layouts/default/releases").glob("*.json")).read_text())
+    _write_invalid_layout(tmp_path / "short-layer.json")
+    (tmp_path / "broken.json").write_text("{not json")
+
+    result = RUNNER.invoke(app, ["validate", str(tmp_path / "*.json")])
+    assert result.exit_code == 1
+    output = _strip_ansi(result.stdout)
+    assert "exactly 80 key entries" in output
+    assert "invalid JSON" in output
+    assert "3 file(s): 1 passed, 2 failed" in output
+
+
+def test_cli_validate_reports_unmatched_targets(tmp_path: Path) -> None:
+    result = RUNNER.invoke(app, ["validate", str(tmp_path / "*.json")])
+    assert result.exit_code != 0
+    assert "No layout JSON files matched" in _strip_ansi(result.output)
+
+
+def test_cli_validate_stream_reports_locations(tmp_path: Path) -> None:
+    _write_invalid_layout(tmp_path / "short-layer.json")
+    result = RUNNER.invoke(app, ["validate", str(tmp_path), "--stream", "--json"])
+    assert result.exit_code == 1
+    record = json.loads(result.stdout)
+    assert record["errors"] == [
+        {"pointer": "/layers/0", "message": "each layer must have exactly 80 key entries", "code": "value_error"}
+    ]
+
+
+def test_cli_validate_no_cache_leaves_store_untouched(tmp_path: Path, monkeypatch) -> None:
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("GLOVE80_CACHE_DIR", str(cache_dir))
+    sample = next((REPO_ROOT / "layouts/default/releases").glob("*.json"))
+
+    result = RUNNER.invoke(app, ["validate", str(sample), "--no-cache"])
+    assert result.exit_code == 0
+    assert not cache_dir.exists()
+
+    result = RUNNER.invoke(app, ["validate", str(sample)])
+    assert result.exit_code == 0
+    assert (cache_dir / "validation.sqlite3").exists()
+
+
+def test_cli_validate_runs_without_a_usable_cache(tmp_path: Path, monkeypatch) -> None:
+    not_a_directory = tmp_path / "cache"
+    not_a_directory.write_text("")
+    monkeypatch.setenv("GLOVE80_CACHE_DIR", str(not_a_directory))
+    sample = next((REPO_ROOT / "layouts/default/releases").glob("*.json"))
+
+    result = RUNNER.invoke(app, ["validate", str(sample), "--json"])
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout)["ok"] is True
+    assert "validation cache disabled" in result.stderr
+
+
+def test_cli_check_refs_reports_dangling_references(tmp_path: Path) -> None:
+    sample = next((REPO_ROOT / "layouts/default/releases").glob("*.json"))
+    data = json.loads(sample.read_text())
+    data["layers"][0][0] = {"value": "&ghost_macro", "params": []}
+    data["macros"].append(
+        {"name": "&leftover", "bindings": [{"value": "&kp", "params": [{"value": "A", "params": []}]}]}
+    )
+    path = tmp_path / "dangling.json"
+    path.write_text(json.dumps(data))
+
+    result = RUNNER.invoke(app, ["check-refs", str(sample), str(path)])
+    assert result.exit_code == 1
+    output = _strip_ansi(result.stdout)
+    assert "/layers/0/0: behavior &ghost_macro is not built in or defined by this layout" in output
+    assert "unused: &leftover" in output
+
+    result = RUNNER.invoke(app, ["check-refs", str(sample), "--json"])
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["ok"] is True
+
+
+def test_cli_keys_search_outputs_json_matches() -> None:
+    result = RUNNER.invoke(app, ["keys", "search", "lctrl", "--json", "--limit", "3"])
+    assert result.exit_code == 0
+    matches = json.loads(result.stdout)
+    assert matches[0]["name"] == "LEFT_CONTROL"
+    assert len(matches) <= 3
+
+    result = RUNNER.invoke(app, ["keys", "search", "zzzzqqq"])
+    assert result.exit_code == 1
+    assert "No keys match" in _strip_ansi(result.stdout)
+
+    result = RUNNER.invoke(app, ["keys", "search", "lctrl", "--os", "mac"])
+    assert result.exit_code == 2
+    assert "Unknown operating system 'mac'" in _strip_ansi(result.stderr)
+
+
+def test_cli_layers_dedup_reports_shared_layers() -> None:
+    releases = str(REPO_ROOT / "layouts/default/releases")
+    result = RUNNER.invoke(app, ["layers", "dedup", releases, "--json"])
+    assert result.exit_code == 0
+    report = json.loads(result.stdout)
+    assert report["unique"] < report["total"]
+    assert any(group["across_layouts"] for group in report["duplicates"])
+
+
+def test_cli_layers_graph_json_and_dot() -> None:
+    layout = str(REPO_ROOT / "layouts/tailorkey/releases/TailorKey v4.2h - Dvorak.json")
+    result = RUNNER.invoke(app, ["layers", "graph", layout, "--format", "json"])
+    assert result.exit_code == 0
+    report = json.loads(result.stdout)
+    assert report["base"] == "HRM_WinLinx"
+    assert report["unreachable"] == []
+
+    result = RUNNER.invoke(app, ["layers", "graph", layout, "--format", "dot"])
+    assert result.exit_code == 0
+    assert result.stdout.startswith('digraph "TailorKey v4.2h - Dvorak" {')
+
+    result = RUNNER.invoke(app, ["layers", "graph", layout, "--format", "svg"])
+    assert result.exit_code != 0
+
+
+def test_cli_combos_check_reports_conflicts(tmp_path: Path) -> None:
+    layout = REPO_ROOT / "layouts/tailorkey/releases/TailorKey v4.2h - Dvorak.json"
+    result = RUNNER.invoke(app, ["combos", "check", str(layout), "--json"])
+    assert result.exit_code == 0
+    report = json.loads(result.stdout)
+    assert report["count"] == 6
+    assert {conflict["kind"] for conflict in report["conflicts"]} == {"overlap"}
+
+    result = RUNNER.invoke(app, ["combos", "check", str(layout), "--strict"])
+    assert result.exit_code == 1
+
+    data = json.loads(layout.read_text())
+    data["combos"].append(data["combos"][0])
+    duplicated = tmp_path / "duplicated.json"
+    duplicated.write_text(json.dumps(data))
+    result = RUNNER.invoke(app, ["combos", "check", str(duplicated)])
+    assert result.exit_code == 1
+    assert "duplicate:" in _strip_ansi(result.stdout)
+
+
+def test_cli_diff_exit_code_and_json() -> None:
+    releases = REPO_ROOT / "layouts/tailorkey/releases"
+    windows = str(releases / "TailorKey v4.2h - Dvorak.json")
+    macos = str(releases / "TailorKey v4.2h - Dvorak macOS.json")
+
+    result = RUNNER.invoke(app, ["diff", windows, windows])
+    assert result.exit_code == 0
+    assert "No semantic differences" in _strip_ansi(result.stdout)
+
+    result = RUNNER.invoke(app, ["diff", windows, macos, "--json"])
+    assert result.exit_code == 1
+    report = json.loads(result.stdout)
+    assert report["changed"]
+    assert {"section": "layers", "name": "HRM_macOS", "change": "added", "old": None, "new": None} in report["sections"]
+
+    result = RUNNER.invoke(app, ["diff", windows, macos])
+    assert "Layer Cursor" in _strip_ansi(result.stdout)
+
+
+def test_cli_layers_matrix_json_and_layer_view() -> None:
+    result = RUNNER.invoke(app, ["layers", "matrix", "tailorkey", "-v", "windows", "-v", "mac", "--json"])
+    assert result.exit_code == 0
+    report = json.loads(result.stdout)
+    assert report["variants"] == ["windows", "mac"]
+    symbol = next(layer for layer in report["layers"] if layer["layer"] == "Symbol")
+    assert symbol["varying"] == [30, 32]
+    assert symbol["counts"] == [[0, 2], [2, 0]]
+
+    result = RUNNER.invoke(app, ["layers", "matrix", "tailorkey", "-v", "windows", "-v", "mac", "--layer", "Cursor"])
+    assert result.exit_code == 0
+    assert "Differing positions: 27, 28" in _strip_ansi(result.stdout)
+
+    result = RUNNER.invoke(app, ["layers", "matrix", "nope"])
+    assert result.exit_code != 0
+
+
+def test_cli_rejects_layouts_that_are_not_json_objects(tmp_path: Path) -> None:
+    not_an_object = tmp_path / "list.json"
+    not_an_object.write_text("[1, 2]")
+    broken = tmp_path / "broken.json"
+    broken.write_text("{")
+    release = next((REPO_ROOT / "layouts/default/releases").glob("*.json"))
+    commands = (
+        ["typed-parse"],
+        ["check-refs"],
+        ["diff", str(release)],
+        ["layers", "dedup"],
+        ["layers", "graph"],
+        ["combos", "check"],
+    )
+    for command in commands:
+        result = RUNNER.invoke(app, [*command, str(not_an_object)])
+        assert result.exit_code == 2, command
+        assert "expected a JSON object at the top level, got list" in _strip_ansi(result.output), command
+        result = RUNNER.invoke(app, [*command, str(broken)])
+        assert result.exit_code == 2, command
+        assert "invalid JSON" in _strip_ansi(result.output), command
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import random
+
+from glove80.layouts.combo_check import check_combos, iter_bits, position_mask
+from tests.helpers import binding
+
+
+def _combo(name: str, positions: list[int], layers: list[int], timeout: int | None = None) -> dict:
+    combo = {"name": name, "binding": binding("&kp", "A"), "keyPositions": positions, "layers": layers}
+    if timeout is not None:
+        combo["timeoutMs"] = timeout
+    return combo
+
+
+def _layout(combos: list[dict]) -> dict:
+    layers = [[binding("&kp", "A") for _ in range(80)] for _ in range(3)]
+    layers[0][10] = binding("&hrm", "LSHFT", "A")
+    layers[1][11] = binding("&mt", "LCTRL", "B")
+    layers[2] = [binding("&trans") for _ in range(80)]
+    return {
+        "layer_names": ["Base", "Nav", "Empty"],
+        "layers": layers,
+        "holdTaps": [{"name": "&hrm", "bindings": ["&kp", "&kp"], "tappingTermMs": 40}],
+        "combos": combos,
+    }
+
+
+def test_position_mask_round_trips() -> None:
+    mask = position_mask([79, 0, 41, 80, -1, "3"])
+    assert mask.bit_length() == 80
+    assert list(iter_bits(mask)) == [0, 41, 79]
+
+
+def test_check_combos_classifies_pairs_on_shared_layers() -> None:
+    report = check_combos(
+        _layout(
+            [
+                _combo("ab", [1, 2], [0]),
+                _combo("ba", [2, 1], [-1]),  # same chord, every layer
+                _combo("abc", [1, 2, 3], [0, 1]),
+                _combo("cd", [3, 4], []),  # empty layers: every layer
+                _combo("ab_nav", [1, 2], [1]),  # same chord as "ab", but on another layer
+                _combo("far", [60, 61], [0]),
+            ]
+        )
+    )
+    pairs = {(conflict.kind, conflict.names) for conflict in report.conflicts}
+    assert pairs == {
+        ("duplicate", ("ab", "ba")),
+        ("duplicate", ("ba", "ab_nav")),
+        ("subset", ("ab", "abc")),
+        ("subset", ("ba", "abc")),
+        ("subset", ("ab_nav", "abc")),
+        ("overlap", ("abc", "cd")),
+    }
+    overlap = next(conflict for conflict in report.conflicts if conflict.kind == "overlap")
+    assert overlap.positions == (3,)
+    assert overlap.layers == (0, 1)
+    assert not report.ok
+    assert len(report.duplicates) == 2
+
+
+def test_check_combos_reports_hold_tap_and_transparent_keys() -> None:
+    report = check_combos(
+        _layout(
+            [
+                _combo("home", [10, 11], [-1]),
+                _combo("slow", [10, 20], [0], timeout=60),
+                _combo("empty", [30, 31], [2]),
+            ]
+        )
+    )
+    overlaps = [(o.name, o.behavior, o.positions, o.layers, o.swallows_tapping_term) for o in report.hold_taps]
+    assert overlaps == [
+        ("home", "&hrm", (10,), (0,), True),  # default 50ms timeout vs 40ms tapping term
+        ("home", "&mt", (11,), (1,), False),
+        ("slow", "&hrm", (10,), (0,), True),
+    ]
+    assert report.transparent == ((2, "empty"),)
+    assert report.ok
+    assert report.to_dict()["holdTaps"][1]["tappingTermMs"] == 200
+
+
+def test_check_combos_matches_pairwise_scan() -> None:
+    rng = random.Random(80)
+    combos = [
+        _combo(f"c{index}", rng.sample(range(80), rng.choice((2, 3))), [rng.randrange(3)]) for index in range(400)
+    ]
+    report = check_combos(_layout(combos))
+
+    expected = set()
+    for first, a in enumerate(combos):
+        for second in range(first + 1, len(combos)):
+            b = combos[second]
+            if set(a["keyPositions"]) & set(b["keyPositions"]) and a["layers"] == b["layers"]:
+                expected.add((first, second))
+    assert {tuple(sorted((conflict.first, conflict.second))) for conflict in report.conflicts} == expected
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from glove80.features import apply_feature
 from glove80.layouts.components import LayoutFeatureComponents
+from glove80.layouts.merge import LayoutMerger
+from glove80.layouts.schema import Macro
 
 
 def test_macros_by_name_overrides_and_preserves_order() -> None:
@@ -28,3 +30,50 @@ def test_macros_by_name_overrides_and_preserves_order() -> None:
     by_name = {m["name"]: m for m in layout["macros"]}
     assert by_name["foo"]["a"] == 2
     assert by_name["bar"]["b"] == 3
+
+
+def test_layout_merger_keeps_indexes_across_merges() -> None:
+    layout = {
+        "macros": [{"name": "foo", "a": 1}],
+        "holdTaps": [],
+        "combos": [],
+        "inputListeners": [],
+        "layer_names": ["Base"],
+        "layers": [["base"]],
+    }
+    merger = LayoutMerger(layout)
+    merger.merge(LayoutFeatureComponents(macros_by_name={"bar": {"b": 1}}, layers={"Mouse": ["mouse"]}))
+    merger.merge(
+        LayoutFeatureComponents(
+            macros_by_name={"foo": {"name": "foo", "a": 2}, "bar": {"b": 2}},
+            layers={"Base": ["base2"], "Cursor": ["cursor"]},
+        )
+    )
+
+    assert layout["macros"] == [{"name": "foo", "a": 2}, {"name": "bar", "b": 2}]
+    assert layout["layer_names"] == ["Base", "Mouse", "Cursor"]
+    assert layout["layers"] == [["base2"], ["mouse"], ["cursor"]]
+
+
+def test_merging_normalizes_existing_sections_into_fresh_lists() -> None:
+    existing = Macro(
+        name="&foo", description=None, bindings=[{"value": "&kp", "params": [{"value": "A", "params": []}]}]
+    )
+    macros = [existing, {"bindings": []}]
+    layers = [["base"]]
+    layout = {
+        "macros": macros,
+        "holdTaps": [],
+        "combos": [],
+        "inputListeners": [],
+        "layer_names": ["Base"],
+        "layers": layers,
+    }
+
+    apply_feature(layout, LayoutFeatureComponents(macros_by_name={"bar": {"b": 1}}, layers={"Base": ["base2"]}))
+
+    # Existing macros are dumped to dicts (unnamed ones dropped); the caller's lists are untouched.
+    assert layout["macros"] == [existing.model_dump(by_alias=True, exclude_none=True), {"name": "bar", "b": 1}]
+    assert layout["layers"] == [["base2"]]
+    assert macros == [existing, {"bindings": []}]
+    assert layers == [["base"]]
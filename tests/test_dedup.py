@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+
+from glove80.families.tailorkey.layouts import Family as TailorKeyFamily
+from glove80.layouts.builder import LayoutBuilder
+from glove80.layouts.common import BASE_COMMON_FIELDS
+from glove80.layouts.dedup import LayerStore, find_duplicate_layers, layer_digest, pack_layouts, unpack_layouts
+
+
+def _layer(token: str) -> list[dict[str, object]]:
+    return [{"value": token, "params": []} for _ in range(4)]
+
+
+def test_duplicate_report_groups_layers_within_and_across_layouts() -> None:
+    family = TailorKeyFamily()
+    layouts = {variant: family.build(variant) for variant in ("windows", "mac")}
+    layouts["windows"]["layers"].append(layouts["windows"]["layers"][1])
+    layouts["windows"]["layer_names"].append("TypingCopy")
+
+    report = find_duplicate_layers(layouts)
+    assert report.unique < report.total
+    typing = next(group for group in report.duplicates if group.digest == layer_digest(layouts["mac"]["layers"][1]))
+    assert [(o.layout, o.name) for o in typing.occurrences] == [
+        ("windows", "Typing"),
+        ("windows", "TypingCopy"),
+        ("mac", "Typing"),
+    ]
+    assert typing in report.within_layout
+    assert typing in report.across_layouts
+
+
+def test_builders_sharing_a_store_keep_one_copy_per_layer() -> None:
+    store = LayerStore()
+    payloads = []
+    for variant in ("factory_default", "factory_default_macos"):
+        builder = LayoutBuilder(
+            metadata_key="default",
+            variant=variant,
+            common_fields=BASE_COMMON_FIELDS,
+            layer_names=["Base", "Mouse"],
+            layer_store=store,
+        )
+        builder.add_layers({"Base": _layer(f"&base_{variant}"), "Mouse": _layer("&mouse")})
+        payloads.append(builder.build(trusted=True))
+
+    assert len(store) == 3
+    assert store.hits == 1
+    # Payload layer lists are fresh copies; the bindings inside stay shared.
+    assert payloads[0]["layers"][1] == payloads[1]["layers"][1]
+    assert payloads[0]["layers"][1][0] is payloads[1]["layers"][1][0]
+
+
+def test_packed_layouts_store_each_layer_once() -> None:
+    layouts = {variant: TailorKeyFamily().build(variant) for variant in ("windows", "dual")}
+    bundle = json.loads(json.dumps(pack_layouts(layouts)))
+
+    assert len(bundle["layers"]) == find_duplicate_layers(layouts).unique
+    assert unpack_layouts(bundle) == layouts
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from glove80.layouts.dependencies import behavior_graph, prune_unused
+from glove80.layouts.references import check_references
+from tests.helpers import kp
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TAILORKEY_MAC = REPO_ROOT / "layouts/tailorkey/releases/TailorKey v4.2h - Dvorak macOS.json"
+
+
+def _layout() -> dict:
+    return {
+        "layer_names": ["Base"],
+        "layers": [[{"value": "&outer", "params": []}, {"value": "&ht_root 1", "params": []}]],
+        "macros": [
+            {"name": "&outer", "bindings": [{"value": "&ht_inner", "params": []}]},
+            {"name": "&leaf", "bindings": [kp("A")]},
+            {"name": "&orphan", "bindings": [{"value": "&orphan_ht", "params": []}]},
+            {"name": "&from_devicetree", "bindings": [kp("B")]},
+            {"name": "&from_combo", "bindings": [kp("C")]},
+        ],
+        "holdTaps": [
+            {"name": "&ht_inner", "bindings": ["&kp", "&leaf"]},
+            {"name": "&ht_root", "bindings": ["&kp", "&kp"]},
+            {"name": "&orphan_ht", "bindings": ["&kp", "&orphan"]},
+        ],
+        "combos": [{"name": "c", "binding": {"value": "&from_combo", "params": []}, "keyPositions": [1, 2]}],
+        "inputListeners": [],
+        "custom_devicetree": "/ { x { bindings = <&from_devicetree>; }; };",
+    }
+
+
+def test_behavior_graph_follows_macros_through_hold_taps() -> None:
+    graph = behavior_graph(_layout())
+    assert graph.edges["&ht_inner"] == {"&leaf"}
+    assert graph.roots == {"&outer", "&ht_root", "&from_devicetree", "&from_combo"}
+    assert graph.closure(["&outer"]) == {"&outer", "&ht_inner", "&leaf"}
+    # The cycle &orphan -> &orphan_ht -> &orphan is unreachable from any key.
+    assert graph.unused() == ("&orphan", "&orphan_ht")
+
+
+def test_prune_unused_drops_unreachable_behaviors_in_place() -> None:
+    layout = _layout()
+    assert prune_unused(layout) == ("&orphan", "&orphan_ht")
+    assert [macro["name"] for macro in layout["macros"]] == ["&outer", "&leaf", "&from_devicetree", "&from_combo"]
+    assert [hold_tap["name"] for hold_tap in layout["holdTaps"]] == ["&ht_inner", "&ht_root"]
+    assert prune_unused(layout) == ()
+
+
+def test_pruned_release_keeps_every_reference_intact() -> None:
+    layout = json.loads(TAILORKEY_MAC.read_text(encoding="utf-8"))
+    removed = prune_unused(layout)
+    assert "&mod_tab_chord_v2_TKZ" in removed
+    report = check_references(layout)
+    assert report.ok
+    assert report.unused == ()
+
+
+def test_behavior_graph_answers_reverse_lookups_and_cycles() -> None:
+    layout = _layout()
+    layout["macros"].append({"name": "&self_loop", "bindings": [{"value": "&self_loop", "params": []}]})
+    graph = behavior_graph(layout)
+
+    assert graph.dependents("&leaf") == {"&ht_inner"}
+    assert graph.reverse_closure(["&leaf"]) == {"&leaf", "&ht_inner", "&outer"}
+    assert graph.dependencies("&outer") == {"&ht_inner"}
+    assert graph.sites["&ht_root"] == ("/layers/0/1",)
+    assert graph.sites["&from_combo"] == ("/combos/0/binding",)
+    assert graph.sites["&from_devicetree"] == ("/custom_devicetree",)
+    assert graph.cycles() == (("&orphan", "&orphan_ht"), ("&self_loop",))
+
+
+def test_release_graph_models_the_autoshift_chain() -> None:
+    graph = behavior_graph(json.loads(TAILORKEY_MAC.read_text(encoding="utf-8")))
+    assert graph.closure(["&AS_v1_TKZ"]) == {"&AS_v1_TKZ", "&AS_HT_v2_TKZ", "&AS_Shifted_v1_TKZ"}
+    assert graph.dependents("&AS_Shifted_v1_TKZ") == {"&AS_HT_v2_TKZ"}
+    assert graph.cycles() == ()
@@ -1,5 +1,7 @@
 from glove80.families.tailorkey.layouts import Family as TailorKeyFamily
-from glove80.features import apply_feature, bilateral_home_row_components
+from glove80.features import apply_feature, apply_features, bilateral_home_row_components
+from glove80.layouts.components import LayoutFeatureComponents
+from tests.helpers import kp
 
 
 def test_bilateral_feature_adds_macros_and_layers() -> None:
@@ -13,3 +15,77 @@ def test_bilateral_feature_adds_macros_and_layers() -> None:
     assert len(layout["macros"]) == base_macro_count + len(components.macros)
     for layer_name in components.layers:
         assert layer_name in layout["layer_names"]
+
+
+def test_apply_features_matches_sequential_merges_and_reports_conflicts() -> None:
+    family = TailorKeyFamily()
+    components = bilateral_home_row_components("windows")
+    combo = {
+        "name": "combo_extra",
+        "binding": {"value": "&kp", "params": [{"value": "A", "params": []}]},
+        "keyPositions": [2, 1],
+        "layers": [-1],
+    }
+    extra = LayoutFeatureComponents(
+        macros_by_name={components.macros[0].name: {"bindings": []}},
+        hold_taps=[{"name": "&extra_ht", "bindings": ["&kp", "&kp"]}],
+        combos=[
+            combo,
+            {**combo, "name": "combo_layer_0", "keyPositions": [3, 4], "layers": [0]},
+            {**combo, "name": "combo_layer_1", "keyPositions": [4, 3], "layers": [1]},
+        ],
+    )
+
+    sequential = family.build("windows")
+    for bundle in (components, extra, extra):
+        apply_feature(sequential, bundle)
+    batched = family.build("windows")
+    report = apply_features(batched, [components, extra, extra])
+
+    assert batched == sequential
+    assert not report.ok
+    first_macro = components.macros[0].name
+    assert (first_macro, 1, 0) in {(c.name, c.feature, c.previous) for c in report.overridden_macros}
+    assert {(c.name, c.feature, c.previous) for c in report.duplicate_hold_taps} == {("&extra_ht", 2, 1)}
+    overlaps = {(c.name, c.other, c.feature, c.previous, c.key_positions) for c in report.overlapping_combos}
+    # combo_layer_0 and combo_layer_1 share a chord but no layer.
+    assert overlaps == {
+        ("combo_extra", "combo_extra", 2, 1, (1, 2)),
+        ("combo_layer_1", "combo_layer_1", 2, 1, (3, 4)),
+        ("combo_layer_0", "combo_layer_0", 2, 1, (3, 4)),
+    }
+    assert report.to_dict()["duplicate_hold_taps"][0]["kind"] == "hold_tap"
+
+
+def test_apply_features_without_collisions_is_ok() -> None:
+    layout = TailorKeyFamily().build("windows")
+    report = apply_features(layout, [bilateral_home_row_components("windows")])
+    assert report.ok
+
+
+def test_apply_features_reports_partial_overlaps_and_empty_layers_as_every_layer() -> None:
+    def combo(name: str, positions: list[int], layers: list[int]) -> dict:
+        return {"name": name, "binding": kp("A"), "keyPositions": positions, "layers": layers}
+
+    layout = {
+        "macros": [],
+        "holdTaps": [],
+        "combos": [combo("base", [10, 11], [])],
+        "inputListeners": [],
+        "layer_names": ["Base", "Lower"],
+        "layers": [[], []],
+    }
+    report = apply_features(
+        layout,
+        [
+            LayoutFeatureComponents(combos=[combo("lower_only", [11, 12], [1])]),
+            LayoutFeatureComponents(combos=[combo("wide", [12, 11, 13], [0]), combo("apart", [14, 15], [1])]),
+        ],
+    )
+
+    overlaps = [(c.name, c.other, c.feature, c.previous, c.key_positions) for c in report.overlapping_combos]
+    # "base" has no layers, so it is active on "Lower" too; "wide" and "lower_only" share keys but no layer.
+    assert overlaps == [
+        ("lower_only", "base", 0, None, (11,)),
+        ("wide", "base", 1, None, (11,)),
+    ]
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from glove80 import geometry
+from glove80.families.shared_finger_specs import LEFT_CANONICAL_HOLD_POSITIONS, RIGHT_CANONICAL_HOLD_POSITIONS
+from glove80.families.tailorkey.layers.bilateral import _LEFT_TAP_KEYS, _RIGHT_TAP_KEYS
+
+GE_BEHAVIORS = "src/glove80/families/glorious_engrammer/custom_behaviors.txt"
+
+
+def test_names_match_glorious_engrammer_defines(repo_root) -> None:
+    text = (repo_root / GE_BEHAVIORS).read_text(encoding="utf-8")
+    defines = re.findall(r"#define KEY_(\w+) ", text)[: geometry.KEY_COUNT]
+    assert list(geometry.NAMES) == defines
+
+
+def test_lookups_round_trip() -> None:
+    for position in range(geometry.KEY_COUNT):
+        name = geometry.name_for(position)
+        assert geometry.position_for(name) == position
+        assert geometry.position_for(f"KEY_{name}") == position
+
+
+def test_key_info_for_home_row_and_thumbs() -> None:
+    left_pinky_home = geometry.key_info(35)
+    assert left_pinky_home.name == "LH_C5R4"
+    assert (left_pinky_home.row, left_pinky_home.column) == (4, 5)
+    assert (left_pinky_home.hand, left_pinky_home.finger, left_pinky_home.thumb) == ("left", "pinky", False)
+
+    assert geometry.key_info(40).name == "RH_C1R4"
+    assert geometry.finger_for(41) == "index"
+    assert geometry.positions_where(hand="left", finger="thumb") == (52, 53, 54, 69, 70, 71)
+    assert geometry.positions_where(hand="right", finger="thumb") == (55, 56, 57, 72, 73, 74)
+
+
+def test_hold_trigger_positions_cover_opposite_hand_and_thumbs() -> None:
+    for position in LEFT_CANONICAL_HOLD_POSITIONS:
+        assert geometry.hand_for(position) == "right" or geometry.is_thumb(position)
+    for position in RIGHT_CANONICAL_HOLD_POSITIONS:
+        assert geometry.hand_for(position) == "left" or geometry.is_thumb(position)
+
+
+def test_bilateral_tap_keys_stay_on_their_hand() -> None:
+    assert {geometry.hand_for(pos) for pos in _LEFT_TAP_KEYS} == {"left"}
+    assert {geometry.hand_for(pos) for pos in _RIGHT_TAP_KEYS} == {"right"}
+
+
+def test_distance_matrix_is_symmetric_and_mirrored() -> None:
+    matrix = geometry.distance_matrix()
+    assert len(matrix) == geometry.KEY_COUNT
+    for a in range(geometry.KEY_COUNT):
+        assert matrix[a][a] == 0.0
+        for b in range(geometry.KEY_COUNT):
+            assert matrix[a][b] == matrix[b][a]
+    # Mirrored home-row keys are equally far apart on both hands.
+    assert geometry.distance(35, 38) == pytest.approx(geometry.distance(44, 41))
+    assert geometry.distance_matrix([35, 38]) == [[0.0, matrix[35][38]], [matrix[38][35], 0.0]]
+
+
+def test_invalid_positions_rejected() -> None:
+    assert not geometry.is_valid_position(80)
+    assert not geometry.is_valid_position(True)
+    with pytest.raises(IndexError):
+        geometry.name_for(80)
+    with pytest.raises(KeyError):
+        geometry.position_for("LH_C9R9")
@@ -1,9 +1,25 @@
 from __future__ import annotations
 
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 
 from glove80.base import KeySpec
-from glove80.keycodes import key_options_by_name
+from glove80.keycodes import (
+    KEY_NAME_VALUES,
+    behavior_catalog,
+    behavior_spec,
+    complete_key_names,
+    core,
+    key_options_by_name,
+    keystroke_for,
+    keystrokes_for_text,
+    reverse_key_index,
+    search_keys,
+)
 
 
 def test_alias_is_accepted_without_conversion() -> None:
@@ -35,3 +51,133 @@ def test_registry_contains_aliases() -> None:
     registry = key_options_by_name()
     assert "A" in registry
     assert "N1" in registry
+
+
+def test_behavior_catalog_indexes_arity_and_param_kinds() -> None:
+    catalog = behavior_catalog()
+    assert [param.kind for param in catalog["&lt"].params] == ["layer", "code"]
+    assert catalog["&mt"].arity == 2
+    assert catalog["&trans"].arity == 0
+    assert "BT_CLR" in catalog["&bt"].commands
+    assert catalog["&mmv"].commands["MOVE_X"] == 1
+    timing = behavior_spec("&macro_wait_time")
+    assert timing is not None and timing.macro_control
+    assert timing.params[0].kind == "integer" and timing.params[0].minimum == 0
+    assert behavior_spec("&my_macro") is None
+
+
+def test_key_index_is_stored_once_and_reused(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    outdated = tmp_path / "keycodes-v1-m4-0123456789abcdef.marshal"
+    outdated.write_bytes(b"old index")
+    index = core._load_index(tmp_path)
+    assert index["key_names"] == KEY_NAME_VALUES
+    # Writing the current blob removes the ones it supersedes.
+    (blob,) = tmp_path.glob("keycodes-v*.marshal")
+    assert blob != outdated
+
+    def _fail(_sources: object) -> None:
+        raise AssertionError("a stored index should not be rebuilt")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(core, "_build_index", _fail)
+        assert core._load_index(tmp_path) == index
+
+    # Corrupt or outdated blobs are rebuilt in place.
+    blob.write_bytes(b"not marshal data")
+    assert core._load_index(tmp_path) == index
+    assert blob.read_bytes() != b"not marshal data"
+
+
+def test_key_index_falls_back_to_memory_without_a_usable_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    not_a_directory = tmp_path / "cache"
+    not_a_directory.write_text("")
+    assert core._load_index(not_a_directory)["key_names"] == KEY_NAME_VALUES
+    assert list(tmp_path.iterdir()) == [not_a_directory]
+
+    def _homeless() -> Path:
+        raise RuntimeError("Could not determine home directory.")
+
+    monkeypatch.setattr(core, "default_cache_dir", _homeless)
+    assert core._load_index()["key_names"] == KEY_NAME_VALUES
+
+    code = "import glove80.keycodes as keycodes; assert keycodes.is_known_key_name('LCTRL'); keycodes.KEY_NAME_VALUES"
+    source_root = str(Path(core.__file__).parents[2])
+    env = {**os.environ, "GLOVE80_CACHE_DIR": str(not_a_directory), "PYTHONPATH": source_root}
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stderr == ""
+
+
+def test_import_does_not_load_key_options(tmp_path: Path) -> None:
+    code = (
+        "import glove80.keycodes.core as core; "
+        "assert core.is_known_key_name('LCTRL'); "
+        "assert core._raw_key_options.cache_info().currsize == 0; "
+        "assert not core.KeyOption.__pydantic_complete__"
+    )
+    source_root = str(Path(core.__file__).parents[2])
+    env = {**os.environ, "GLOVE80_CACHE_DIR": str(tmp_path), "PYTHONPATH": source_root}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+
+def test_search_ranks_exact_aliases_then_prefixes_then_fuzzy_matches() -> None:
+    assert search_keys("lctrl")[0].name == "LEFT_CONTROL"
+    assert [match.name for match in search_keys("volume up", limit=2)] == ["C_VOLUME_UP", "K_VOLUME_UP"]
+    assert search_keys("backspce")[0].name == "BACKSPACE"  # typo
+    assert search_keys("!")[0].field == "symbol"
+    assert search_keys("zzzzqqq") == []
+
+    completions = complete_key_names("pg_")
+    assert {match.name for match in completions} == {"PAGE_UP", "PAGE_DOWN"}
+    assert all(match.field != "description" for match in complete_key_names("vol"))
+
+
+def test_search_filters_by_os_availability() -> None:
+    unavailable = next(
+        (option for option in key_options_by_name().values() if option.os.get("macos") is False),
+        None,
+    )
+    assert unavailable is not None
+    name = unavailable.canonical_name
+    assert name in {match.name for match in search_keys(name)}
+    assert name not in {match.name for match in search_keys(name, os="macos")}
+    with pytest.raises(ValueError, match="Unknown operating system 'mac'"):
+        search_keys(name, os="mac")
+    with pytest.raises(ValueError, match="Unknown operating system"):
+        complete_key_names("", os="MacOS")
+
+
+def test_reverse_index_resolves_characters_to_keystrokes() -> None:
+    assert keystroke_for("a").binding_value == "A"
+    assert keystroke_for("A").binding_value == "LS(A)"
+    assert keystroke_for("!").binding_value == "LS(NUMBER_1)"
+    # Duplicated symbols resolve to the US key, not the non-US one.
+    assert keystroke_for("|").binding_value == "LS(BACKSLASH)"
+    assert keystroke_for("~").binding_value == "LS(GRAVE)"
+    assert keystroke_for('"').binding_value == "LS(SINGLE_QUOTE)"
+    assert keystroke_for("\n").key == "RETURN"
+    assert keystroke_for("€") is None
+    assert [stroke.binding_value for stroke in keystrokes_for_text("Hi!")] == ["LS(H)", "I", "LS(NUMBER_1)"]
+    assert keystroke_for("?").to_binding() == {
+        "value": "&kp",
+        "params": [{"value": "LS", "params": [{"value": "SLASH", "params": []}]}],
+    }
+    with pytest.raises(ValueError, match="position 2"):
+        keystrokes_for_text("ab€")
+
+
+def test_reverse_index_shifted_pairs_and_os_support() -> None:
+    index = reverse_key_index()
+    assert index.shifted_pairs["EXCLAMATION"] == "NUMBER_1"
+    assert index.unshifted("EXCL") == "NUMBER_1"
+    assert index.shifted("N1") == ("EXCLAMATION",)
+    assert index.shifted("A") == ()
+
+    options = key_options_by_name()
+    unavailable = {option.canonical_name for option in options.values() if option.os.get("macos") is False}
+    assert index.unavailable_on("macos") == unavailable
+    assert index.os_support("K_EJECT")["macos"] is False
+    assert "A" in index.available_on("macos", partial=False)
+    assert index.available_on("macos").isdisjoint(unavailable)
+    with pytest.raises(ValueError, match="operating system"):
+        index.unavailable_on("beos")
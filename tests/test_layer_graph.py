@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from glove80.layouts.layer_graph import layer_graph
+from tests.helpers import binding
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TAILORKEY_DUAL = REPO_ROOT / "layouts/tailorkey/releases/TailorKey v4.2h - Dvorak Dual OS version.json"
+
+
+def _trans() -> dict:
+    return binding("&trans")
+
+
+def _layout() -> dict:
+    names = ["Base", "Nav", "Num", "Fn", "Game", "Custom", "Dead", "Opaque", "Lower"]
+    layers = [[_trans() for _ in range(4)] for _ in names]
+    layers[0][0] = binding("&thumb", 1, "SPACE")  # hold-tap: hold is &mo
+    layers[0][1] = binding("&to_param", "A", 2)  # macro: second parameter is the layer
+    layers[0][2] = {"value": "Custom", "params": [{"value": "&space LAYER_Custom R", "params": []}]}
+    layers[0][3] = binding("&lower")
+    layers[2][0] = binding("&sl", 3)
+    return {
+        "layer_names": names,
+        "layers": layers,
+        "macros": [
+            {
+                "name": "&to_param",
+                "bindings": [
+                    binding("&macro_param_2to1"),
+                    binding("&to", "MACRO_PLACEHOLDER"),
+                    binding("&macro_param_1to1"),
+                    binding("&kp", "MACRO_PLACEHOLDER"),
+                ],
+            }
+        ],
+        "holdTaps": [{"name": "&thumb", "bindings": ["&mo", "&kp"]}],
+        "combos": [
+            {"name": "game", "binding": binding("&tog", 4), "keyPositions": [1, 2], "layers": [-1]},
+            {"name": "unused_layer_only", "binding": binding("&mo", 6), "keyPositions": [3, 4], "layers": [6]},
+        ],
+        "custom_devicetree": "#define LAYER_Opaque 7",
+    }
+
+
+def test_layer_graph_follows_hold_taps_macros_and_raw_bindings() -> None:
+    graph = layer_graph(_layout())
+    paths = graph.paths()
+
+    assert [(switch.behavior, switch.via) for switch in paths["Nav"]] == [("&mo", ("&thumb",))]
+    assert [(switch.behavior, switch.via) for switch in paths["Num"]] == [("&to", ("&to_param",))]
+    assert [switch.target for switch in paths["Fn"]] == ["Num", "Fn"]
+    assert paths["Custom"][0].behavior == "&space"
+    assert paths["Lower"][0].pointer == "/layers/0/3"
+
+    assert paths["Game"][0].source is None
+    assert graph.combo_only() == ("Game",)
+    assert graph.unreachable() == ("Dead", "Opaque")
+    assert graph.dead() == ("Dead",)
+    assert graph.opaque() == ("Opaque",)
+
+
+def test_layer_graph_exports_json_and_dot() -> None:
+    graph = layer_graph(_layout())
+    data = graph.to_dict()
+    assert data["base"] == "Base"
+    assert data["dead"] == ["Dead"]
+    assert data["layers"][3]["presses"] == 2
+    assert data["layers"][6]["path"] == []
+
+    dot = graph.to_dot(title="test")
+    assert dot.startswith('digraph "test" {')
+    assert '"*" -> "Game" [label="&tog (combo)", style=dashed];' in dot
+    assert '"Dead" [label="6: Dead", color=red, fontcolor=red];' in dot
+
+
+def test_layer_graph_reaches_every_tailorkey_dual_layer() -> None:
+    graph = layer_graph(json.loads(TAILORKEY_DUAL.read_text()))
+    assert graph.unreachable() == ()
+    assert graph.combo_only() == ("Gaming",)
+    # Typing is only reachable through the Magic layer.
+    assert [switch.target for switch in graph.paths()["Typing"]] == ["Magic", "Typing"]
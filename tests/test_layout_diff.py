@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+
+from glove80.layouts.diff import binding_text, diff_layouts
+from tests.helpers import binding
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RELEASES = REPO_ROOT / "layouts/tailorkey/releases"
+
+
+def _layout() -> dict:
+    base = [binding("&kp", chr(ord("A") + index % 26)) for index in range(80)]
+    base[0] = binding("&mo", 1)
+    base[1] = binding("&thumb", 2, "SPACE")
+    return {
+        "title": "Example",
+        "layer_names": ["Base", "Nav", "Num"],
+        "layers": [base, [binding("&trans") for _ in range(80)], [binding("&kp", "N1") for _ in range(80)]],
+        "macros": [{"name": "&hello", "bindings": [binding("&kp", "H")]}],
+        "holdTaps": [{"name": "&thumb", "bindings": ["&mo", "&kp"], "tappingTermMs": 200}],
+        "combos": [{"name": "esc", "binding": binding("&kp", "ESC"), "keyPositions": [2, 3], "layers": [0, 2]}],
+        "inputListeners": [],
+    }
+
+
+def test_diff_identical_layouts_is_empty() -> None:
+    layout = _layout()
+    result = diff_layouts(layout, copy.deepcopy(layout))
+    assert not result.changed
+    assert result.to_dict() == {"changed": False, "keys": [], "sections": [], "fields": []}
+
+
+def test_diff_resolves_layer_indices_after_an_inserted_layer() -> None:
+    old = _layout()
+    new = copy.deepcopy(old)
+    new["layer_names"].insert(1, "Fn")
+    new["layers"].insert(1, [binding("&none") for _ in range(80)])
+    # Re-point every index at the same layer it named before.
+    new["layers"][0][0] = binding("&mo", 2)
+    new["layers"][0][1] = binding("&thumb", 3, "SPACE")
+    new["combos"][0]["layers"] = [0, 3]
+    new["layers"][0][5] = binding("&kp", "LS", {"value": "Z", "params": []})
+
+    result = diff_layouts(old, new)
+    assert [(change.section, change.name, change.change) for change in result.sections] == [("layers", "Fn", "added")]
+    assert [(change.layer, change.position) for change in result.keys] == [("Base", 5)]
+    assert binding_text(result.keys[0].new) == "&kp LS Z"
+    assert result.keys[0].to_dict()["key"] == "RH_C2R1"
+    assert result.fields == ()
+
+
+def test_diff_reports_key_section_and_field_changes() -> None:
+    old = _layout()
+    new = copy.deepcopy(old)
+    new["title"] = "Example 2"
+    new["layer_names"][2] = "Numbers"  # same bindings: a rename
+    new["layers"][0][0] = binding("&mo", 2)
+    new["macros"].append({"name": "&bye", "bindings": []})
+    new["holdTaps"][0]["tappingTermMs"] = 180
+    del new["combos"][0]
+
+    result = diff_layouts(old, new)
+    assert [(change.layer, change.position) for change in result.keys] == [("Base", 0)]
+    # Layer parameters are compared (and reported) by name; "&thumb 2" still
+    # points at the renamed layer, so it is not a change.
+    assert result.keys[0].old["params"][0]["value"] == "Nav"
+    assert result.keys[0].new["params"][0]["value"] == "Numbers"
+    changes = {(change.section, change.name): change for change in result.sections}
+    assert changes["layers", "Numbers"].change == "renamed"
+    assert changes["layers", "Numbers"].old == "Num"
+    assert changes["macros", "&bye"].change == "added"
+    assert changes["holdTaps", "&thumb"].change == "changed"
+    assert changes["combos", "esc"].change == "removed"
+    assert changes["combos", "esc"].old["layers"] == ["Base", "Numbers"]
+    assert [(change.field, change.new) for change in result.fields] == [("title", "Example 2")]
+
+
+def test_diff_reports_layer_reorder() -> None:
+    old = _layout()
+    new = copy.deepcopy(old)
+    new["layer_names"][1:] = reversed(new["layer_names"][1:])
+    new["layers"][1:] = reversed(new["layers"][1:])
+    new["layers"][0][0] = binding("&mo", 2)
+    new["layers"][0][1] = binding("&thumb", 1, "SPACE")
+    new["combos"][0]["layers"] = [0, 1]
+
+    result = diff_layouts(old, new)
+    assert result.keys == ()
+    assert result.sections == ()
+    assert [change.field for change in result.fields] == ["layer_names"]
+
+
+def test_diff_tailorkey_windows_and_macos_releases() -> None:
+    old = json.loads((RELEASES / "TailorKey v4.2h - Dvorak.json").read_text())
+    new = json.loads((RELEASES / "TailorKey v4.2h - Dvorak macOS.json").read_text())
+    result = diff_layouts(old, new)
+
+    layers = {(change.name, change.change) for change in result.sections if change.section == "layers"}
+    assert layers == {("HRM_macOS", "added"), ("HRM_WinLinx", "removed")}
+    assert {change.layer for change in result.keys} >= {"Cursor"}
+    assert all(change.layer in new["layer_names"] for change in result.keys)
+
+
+def test_diff_tolerates_malformed_hold_taps_and_extra_keys() -> None:
+    old = _layout()
+    old["holdTaps"].append({"name": "&odd", "bindings": [{"a": 1}, "&kp"]})
+    old["holdTaps"].append({"name": "&flat", "bindings": 3})
+    old["layers"][1].append(binding("&none"))
+    new = copy.deepcopy(old)
+    new["layers"][1][80] = binding("&kp", "A")
+
+    result = diff_layouts(old, new)
+    assert [change.to_dict()["key"] for change in result.keys] == [None]
+    assert result.keys[0].position == 80
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from glove80.geometry import name_for
+from glove80.layouts.references import check_references
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RELEASES = sorted((REPO_ROOT / "layouts").rglob("*.json"))
+TAILORKEY_RELEASE = next(path for path in RELEASES if path.parent.parent.name == "tailorkey")
+
+
+def _load(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("path", RELEASES, ids=lambda path: path.stem)
+def test_releases_have_no_dangling_references(path: Path) -> None:
+    assert check_references(_load(path)).errors == ()
+
+
+def test_check_references_reports_each_kind_of_dangling_reference() -> None:
+    data = _load(TAILORKEY_RELEASE)
+    layer_count = len(data["layer_names"])
+    hold_tap = next(index for index, item in enumerate(data["holdTaps"]) if item.get("holdTriggerKeyPositions"))
+    hold_tap_name = data["holdTaps"][hold_tap]["name"]
+    bound_at = next(pos for pos, binding in enumerate(data["layers"][0]) if binding["value"] == hold_tap_name)
+
+    data["layers"][1][0] = {"value": "&ghost", "params": []}
+    data["layers"][1][1] = {"value": "&ghost", "params": []}
+    data["layers"][1][2] = {"value": "&mo", "params": [{"value": layer_count, "params": []}]}
+    data["macros"][0]["bindings"].append({"value": "&phantom 1", "params": []})
+    data["holdTaps"][0]["bindings"][0] = "&vanished"
+    data["combos"][0]["layers"] = [layer_count + 4]
+    data["inputListeners"][0]["nodes"][0]["layers"] = [-1, 99]
+    data["holdTaps"][hold_tap]["holdTriggerKeyPositions"] += [80, bound_at, bound_at]
+    data["macros"].append({"name": data["holdTaps"][1]["name"], "bindings": []})
+
+    errors = {error.pointer: error.message for error in check_references(data).errors}
+    triggers = f"/holdTaps/{hold_tap}/holdTriggerKeyPositions"
+    last = len(data["holdTaps"][hold_tap]["holdTriggerKeyPositions"]) - 1
+    assert errors == {
+        "/layers/1/0": "behavior &ghost is not built in or defined by this layout (2 uses)",
+        "/layers/1/2/params/0": f"layer index {layer_count} is out of range ({layer_count} layers)",
+        f"/macros/0/bindings/{len(data['macros'][0]['bindings']) - 1}": (
+            "behavior &phantom is not built in or defined by this layout"
+        ),
+        "/holdTaps/0/bindings/0": "behavior &vanished is not built in or defined by this layout",
+        "/combos/0/layers/0": f"layer index {layer_count + 4} is out of range ({layer_count} layers)",
+        "/inputListeners/0/nodes/0/layers/1": f"layer index 99 is out of range ({layer_count} layers)",
+        f"{triggers}/{last - 2}": "80 is not a Glove80 key position",
+        f"{triggers}/{last - 1}": f"hold-tap {hold_tap_name} is itself bound to key {bound_at} ({name_for(bound_at)})",
+        f"{triggers}/{last}": f"key position {bound_at} is listed more than once",
+        "/holdTaps/1/name": (
+            f"behavior {data['holdTaps'][1]['name']} is already defined at /macros/{len(data['macros']) - 1}/name"
+        ),
+    }
+
+
+def test_check_references_lists_unused_behaviors() -> None:
+    data = _load(TAILORKEY_RELEASE)
+    data["holdTaps"].append({"name": "&never_bound", "bindings": ["&kp", "&kp"]})
+    data["macros"].append({"name": "&only_in_devicetree", "bindings": []})
+    data["custom_devicetree"] += "\n/* &only_in_devicetree */"
+
+    report = check_references(data)
+    assert report.ok
+    assert "&never_bound" in report.unused
+    assert "&only_in_devicetree" not in report.unused
@@ -3,7 +3,8 @@ from __future__ import annotations
 import pytest
 
 from glove80 import build_layout
-from glove80.layouts.parse import parse_typed_sections
+from glove80.layouts.parse import decode_binding, encode_binding, parse_compact_layers, parse_typed_sections
+from glove80.layouts.schema import Binding
 
 FAMILY_FIXTURES = (
     ("default", "default_variants"),
@@ -29,3 +30,36 @@ def test_roundtrip_parse_matches_payload(request, family: str, variant_fixture:
         assert _dump(hold_taps) == layout["holdTaps"]
         assert _dump(combos) == layout["combos"]
         assert _dump(listeners) == layout["inputListeners"]
+
+
+def test_layers_parse_into_binding_models_and_compact_tuples(tailorkey_variants) -> None:
+    layout = build_layout("tailorkey", tailorkey_variants[0])
+    payload, *_ = parse_typed_sections(layout)
+    compact = parse_compact_layers(layout)
+
+    assert isinstance(payload.layers[0][0], Binding)
+    assert len(compact) == len(layout["layer_names"])
+    for typed_layer, compact_layer, raw_layer in zip(payload.layers, compact, layout["layers"]):
+        assert [encode_binding(binding) for binding in compact_layer] == raw_layer
+        assert [binding.model_dump() for binding in typed_layer] == raw_layer
+    assert decode_binding({"value": "&kp", "params": [{"value": "LC", "params": [{"value": "A"}]}]}) == (
+        "&kp",
+        (("LC", (("A", ()),)),),
+    )
+
+
+@pytest.mark.parametrize(
+    "binding",
+    [
+        {"value": True, "params": []},
+        {"value": "&kp", "params": [], "extra": 1},
+        {"value": "&kp", "params": {}},
+        {"params": []},
+        "&kp A",
+    ],
+)
+def test_binding_model_and_compact_decoder_reject_the_same_shapes(binding) -> None:
+    with pytest.raises(ValueError):
+        Binding.model_validate(binding)
+    with pytest.raises(ValueError):
+        decode_binding(binding)
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import io
+import json
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from glove80 import geometry
+from glove80.keycodes import behaviors
+from glove80.keycodes import core as keycodes_core
+from glove80.layouts import bindings, validation, validation_cache
+from glove80.layouts.streaming import StreamingJSONError, iter_top_level
+from glove80.layouts.schema import LayoutPayload
+from glove80.layouts.validation import (
+    collect_layout_errors,
+    errors_to_json,
+    json_pointer,
+    validate_file,
+    validate_file_streaming,
+    validate_files,
+)
+from glove80.layouts.validation_cache import ValidationCache
+from tests.helpers import binding
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RELEASES = sorted((REPO_ROOT / "layouts").rglob("*.json"))
+TAILORKEY_RELEASE = next(path for path in RELEASES if path.parent.parent.name == "tailorkey")
+DEFAULT_RELEASE = next(path for path in RELEASES if path.parent.parent.name == "default")
+
+
+def _load(path: Path) -> dict[str, object]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("path", RELEASES[::7], ids=lambda path: path.stem)
+def test_iter_top_level_reassembles_document(path: Path) -> None:
+    rebuilt: dict[str, object] = {}
+    for key, index, value in iter_top_level(io.StringIO(path.read_text(encoding="utf-8")), chunk_size=13):
+        if index is None:
+            rebuilt[key] = value
+        else:
+            rebuilt[key].append(value)  # type: ignore[attr-defined]
+    assert rebuilt == _load(path)
+
+
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [
+        ("[]", "Expected '{'"),
+        ('{"a": 1', "Expected '}'"),
+        ('{"layers": [1, 2', "Expected ']'"),
+        ('{"a": tru}', "Expecting value"),
+        ('{"a": 1} {}', "Extra data"),
+    ],
+)
+def test_iter_top_level_rejects_malformed_json(text: str, message: str) -> None:
+    with pytest.raises(StreamingJSONError, match=message):
+        list(iter_top_level(io.StringIO(text), chunk_size=4))
+
+
+def test_iter_top_level_fails_fast_on_malformed_value() -> None:
+    class CountingReader(io.StringIO):
+        consumed = 0
+
+        def read(self, size: int | None = -1) -> str:
+            chunk = super().read(size)
+            self.consumed += len(chunk)
+            return chunk
+
+    padding = ",".join(["[" + ",".join(['{"value": "&kp", "params": []}'] * 80) + "]"] * 500)
+    reader = CountingReader('{"layers": [[1, 2 3], ' + padding + "]}")
+    with pytest.raises(StreamingJSONError, match="Expecting ',' delimiter"):
+        list(iter_top_level(reader, chunk_size=64))
+    assert reader.consumed <= 64
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7])
+def test_iter_top_level_grows_window_for_cut_off_values(chunk_size: int) -> None:
+    text = '{"a": [true, false, null, -1.5e+10, "long \\u00e9 string", {"b": [Infinity]}]}'
+    assert list(iter_top_level(io.StringIO(text), chunk_size=chunk_size)) == [("a", None, json.loads(text)["a"])]
+
+
+def test_streaming_matches_full_validation_for_releases() -> None:
+    for path in RELEASES:
+        assert validate_file_streaming(path, chunk_size=512) == validate_file(path)
+
+
+def test_streaming_reports_every_bad_element_with_location(tmp_path: Path) -> None:
+    data = _load(TAILORKEY_RELEASE)
+    data["layers"][2] = data["layers"][2][:10]
+    data["combos"][0]["keyPositions"] = [99]
+    data["macros"][1]["name"] = "no-ampersand"
+    data["locale"] = 7
+    path = tmp_path / "broken.json"
+    path.write_text(json.dumps(data))
+
+    result = validate_file_streaming(path)
+    assert not result.ok
+    pointers = {error.pointer for error in result.errors}
+    assert {"/layers/2", "/combos/0/keyPositions", "/macros/1/name", "/locale"} <= pointers
+    assert "/layers/2: each layer must have exactly 80 key entries" in map(str, result.errors)
+
+
+def test_streaming_caps_error_messages(tmp_path: Path) -> None:
+    data = _load(DEFAULT_RELEASE)
+    data["layer_names"] = list(range(50))
+    path = tmp_path / "names.json"
+    path.write_text(json.dumps(data))
+
+    result = validate_file_streaming(path, max_errors=5)
+    assert len(result.errors) == 5
+    assert result.error_count == 51  # 50 bad names plus the layer count mismatch
+
+
+def test_streaming_memory_stays_flat_for_many_combos(tmp_path: Path) -> None:
+    data = _load(DEFAULT_RELEASE)
+    combo = {"name": "c", "binding": {"value": "&kp", "params": [{"value": "A", "params": []}]}, "layers": [0]}
+    data["combos"] = []
+    head, tail = json.dumps(data).split('"combos": []', 1)
+    path = tmp_path / "stress.json"
+    with path.open("w", encoding="utf-8") as fp:
+        fp.write(head + '"combos": [')
+        fp.write(",".join(json.dumps({**combo, "keyPositions": [n % 80, (n + 1) % 80]}) for n in range(20_000)))
+        fp.write("]" + tail)
+
+    tracemalloc.start()
+    result = validate_file_streaming(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert result.ok
+    assert result.counts["combos"] == 20_000
+    assert peak < path.stat().st_size / 4
+
+
+def test_cache_answers_unchanged_files_without_reading_them(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "layout.json"
+    path.write_bytes(DEFAULT_RELEASE.read_bytes())
+
+    with ValidationCache(tmp_path / "cache") as cache:
+        (first,) = validate_files([path], cache=cache)
+    assert first.ok
+
+    def _fail(*_args: object, **_kwargs: object) -> None:
+        raise AssertionError("cache hit should not re-hash or re-validate")
+
+    monkeypatch.setattr(validation_cache, "file_digest", _fail)
+    monkeypatch.setattr(validation, "validate_file", _fail)
+    with ValidationCache(tmp_path / "cache") as cache:
+        (second,) = validate_files([path], cache=cache)
+        assert (cache.hits, cache.misses) == (1, 0)
+    assert second == first
+
+
+def test_cache_keys_on_content_and_validator_namespace(tmp_path: Path) -> None:
+    good = tmp_path / "good.json"
+    good.write_bytes(DEFAULT_RELEASE.read_bytes())
+    copy = tmp_path / "copy.json"
+    copy.write_bytes(DEFAULT_RELEASE.read_bytes())
+
+    with ValidationCache(tmp_path / "cache") as cache:
+        list(validate_files([good], cache=cache))
+        # Same bytes under another name reuse the stored result.
+        (result,) = validate_files([copy], cache=cache)
+        assert result.path == copy
+        assert cache.hits == 1
+
+        data = _load(good)
+        data["layers"][0] = data["layers"][0][:79]
+        good.write_text(json.dumps(data))
+        (changed,) = validate_files([good], cache=cache)
+        assert not changed.ok
+
+    with ValidationCache(tmp_path / "cache", namespace="next-schema") as cache:
+        list(validate_files([copy], cache=cache))
+        assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_validator_fingerprint_covers_catalogs_and_geometry() -> None:
+    package = Path(validation_cache.__file__).parent.parent
+    sources = {package / name for name in validation_cache._VALIDATOR_SOURCES}
+
+    for module in (validation, bindings, behaviors, keycodes_core, geometry):
+        assert Path(module.__file__) in sources
+    assert {package / "keycodes" / "zmk.json", package / "keycodes" / "key_options.json"} <= sources
+    assert all(path.is_file() for path in sources)
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"{index}.json"
+        path.write_text(json.dumps({"index": index}))
+        paths.append(path)
+
+    with ValidationCache(tmp_path / "cache", max_entries=2) as cache:
+        for path in paths:
+            list(validate_files([path], cache=cache))
+    with ValidationCache(tmp_path / "cache", max_entries=2) as cache:
+        assert len(cache) == 2
+        list(validate_files(paths, cache=cache))
+        assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_collect_layout_errors_reports_every_failure_in_one_pass() -> None:
+    data = _load(TAILORKEY_RELEASE)
+    hold_tap = next(index for index, item in enumerate(data["holdTaps"]) if item.get("holdTriggerKeyPositions"))
+    data["holdTaps"][hold_tap]["holdTriggerKeyPositions"][1] = 80
+    data["holdTaps"][hold_tap]["tappingTermMs"] = -1
+    data["inputListeners"][0]["nodes"][0]["layers"] = []
+    data["layers"][3][41] = "&kp A"
+    data["layers"][5] = data["layers"][5][:79]
+    del data["locale"]
+
+    errors = collect_layout_errors(data)
+    assert {(error.pointer, error.code) for error in errors} == {
+        (f"/holdTaps/{hold_tap}/holdTriggerKeyPositions/1", "value_error"),
+        (f"/holdTaps/{hold_tap}/tappingTermMs", "value_error"),
+        ("/inputListeners/0/nodes/0/layers", "value_error"),
+        ("/layers/3/41", "dict_type"),
+        ("/layers/5", "value_error"),
+        ("/locale", "missing"),
+    }
+    # The raising API still stops at the first problem.
+    with pytest.raises(ValueError):
+        LayoutPayload.model_validate(data)
+
+    decoded = json.loads(errors_to_json(errors))
+    assert decoded[0] == errors[0].to_dict()
+
+
+def test_collect_layout_errors_accepts_releases() -> None:
+    for path in RELEASES[::5]:
+        assert collect_layout_errors(_load(path)) == []
+
+
+def test_json_pointer_escapes_reserved_characters() -> None:
+    assert json_pointer(["layers", 3, 41, "params", 0]) == "/layers/3/41/params/0"
+    assert json_pointer(["a/b", "m~n"]) == "/a~1b/m~0n"
+    assert json_pointer([]) == ""
+
+
+def test_collect_layout_errors_checks_binding_trees() -> None:
+    data = _load(TAILORKEY_RELEASE)
+    layer_count = len(data["layer_names"])
+    layer = data["layers"][1]
+    layer[0] = binding("&kp", "NOT_A_KEY")
+    layer[1] = binding("&kp", "A", "B")
+    layer[2] = binding("&lt", layer_count + 3, "RET")
+    layer[3] = binding("&bt", "BT_SPLODE")
+    layer[4] = binding("&kp", binding("LC", binding("LS", "NOPE")))
+    layer[5] = binding("&undefined_macro")
+    layer[6] = binding("&undefined_macro")
+    layer[7] = binding(data["macros"][0]["name"], *(["A"] * (len(data["macros"][0].get("params", [])) + 1)))
+    data["macros"][0]["bindings"][0] = binding("&macro_wait_time", -5)
+    data["holdTaps"][0]["bindings"][0] = "&missing_behavior"
+
+    errors = {error.pointer: error.message for error in collect_layout_errors(data)}
+    assert errors["/layers/1/0/params/0/value"] == "unknown key code 'NOT_A_KEY'"
+    assert errors["/layers/1/1/params"] == "&kp expects 1 parameter(s), got 2"
+    assert errors["/layers/1/2/params/0"].startswith(f"layer index {layer_count + 3} is out of range")
+    assert errors["/layers/1/3/params/0/value"] == "unknown &bt command 'BT_SPLODE'"
+    assert errors["/layers/1/4/params/0/params/0/params/0/value"] == "unknown key code 'NOPE'"
+    assert errors["/layers/1/5"].startswith("unknown behavior '&undefined_macro'")
+    assert errors["/layers/1/5"].endswith("(2 uses)")
+    assert errors["/layers/1/7"].startswith(f"macro {data['macros'][0]['name']} expects")
+    assert errors["/macros/0/bindings/0/params/0/value"] == "-5 is outside [0, inf]"
+    assert errors["/holdTaps/0/bindings/0"].startswith("unknown behavior '&missing_behavior'")
+    assert len(errors) == 9
+
+
+def test_binding_checks_accept_custom_behaviors_and_raw_devicetree() -> None:
+    data = _load(DEFAULT_RELEASE)
+    data["custom_defined_behaviors"] = "parang_left: parang_left { compatible = ...; };"
+    data["layers"][0][0] = binding("&parang_left")
+    data["layers"][0][1] = binding("&thumb LAYER_Function ESC")
+    data["layers"][0][2] = binding("Custom", "&LeftPinky (C, LAYER_Enthium)")
+    assert collect_layout_errors(data) == []
+
+
+def test_binding_checks_match_the_binding_model_shape() -> None:
+    data = _load(DEFAULT_RELEASE)
+    data["layers"][0][0] = {"value": "&kp", "params": [{"value": "A", "params": []}], "comment": "x"}
+    data["layers"][0][1] = binding("&kp", True)
+    errors = {error.pointer: error.message for error in collect_layout_errors(data)}
+    assert errors == {
+        "/layers/0/0/comment": "unexpected binding field",
+        "/layers/0/1/params/0/value": "binding value must be a string or integer, got True",
+    }
+    with pytest.raises(ValueError):
+        LayoutPayload.model_validate(data)
+
+
+def test_unhashable_binding_values_are_located_errors(tmp_path: Path) -> None:
+    data = _load(TAILORKEY_RELEASE)
+    data["layers"][0][0] = binding(["&kp"])
+    data["layers"][0][1] = binding("&kp", {"value": {"x": 1}, "params": []})
+    bad = tmp_path / "unhashable.json"
+    bad.write_text(json.dumps(data))
+
+    results = list(validate_files([bad, TAILORKEY_RELEASE], jobs=2))
+    assert [result.ok for result in results] == [False, True]
+    assert {str(error) for error in results[0].errors} == {
+        "/layers/0/0/value: binding value must be a string or integer, got ['&kp']",
+        "/layers/0/1/params/0/value: binding value must be a string or integer, got {'x': 1}",
+    }
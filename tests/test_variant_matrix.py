@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pytest
+
+from glove80.layouts.variant_matrix import BindingTable, family_matrix, variant_matrix
+from tests.helpers import kp
+
+
+def _layout(names: list[str], *layers: list[str]) -> dict:
+    return {"layer_names": names, "layers": [[kp(key) for key in layer] for layer in layers]}
+
+
+def test_binding_table_interns_equal_trees_once() -> None:
+    table = BindingTable()
+    encoded = table.encode([kp("A"), kp("B"), kp("A")])
+    assert list(encoded) == [1, 2, 1]
+    assert len(table) == 3  # "no binding" plus two distinct bindings
+    assert table.bindings[2] == kp("B")
+
+
+def test_variant_matrix_pairs_and_groups() -> None:
+    matrix = variant_matrix(
+        {
+            "a": _layout(["Base", "Nav"], ["Q", "W", "E"], ["X", "Y"]),
+            "b": _layout(["Base", "Nav"], ["Q", "W", "E"], ["X", "Z"]),
+            "c": _layout(["Base", "Extra"], ["A", "W", "F"], ["X"]),
+            "d": _layout(["Base"], ["Q", "W"]),
+        }
+    )
+    base = matrix.layer("Base")
+    assert base.groups == (("a", "b"), ("c",), ("d",))
+    assert base.positions("a", "c") == (0, 2)
+    assert base.positions("b", "d") == (2,)  # "d" has no third key
+    assert base.positions("a", "b") == ()
+    assert base.varying == (0, 2)
+    assert base.counts() == [[0, 0, 2, 1], [0, 0, 2, 1], [2, 2, 0, 2], [1, 1, 2, 0]]
+
+    assert matrix.layer("Nav").variants == ("a", "b")
+    assert matrix.diverging_layers("a", "b") == ("Nav",)
+    assert matrix.diverging_layers("a", "c") == ("Base",)
+    assert [layer["layer"] for layer in matrix.to_dict()["layers"]] == ["Base", "Nav", "Extra"]
+
+    with pytest.raises(ValueError, match="Variant 'c' has no layer 'Nav'"):
+        matrix.positions("Nav", "a", "c")
+    with pytest.raises(KeyError, match="Missing"):
+        matrix.layer("Missing")
+
+
+def test_family_matrix_rejects_unknown_variants() -> None:
+    with pytest.raises(ValueError, match="Unknown tailorkey variants \\['nope'\\]"):
+        family_matrix("tailorkey", ["windows", "nope"])